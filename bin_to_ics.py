@@ -25,6 +25,8 @@ except ImportError:
     print("Please install it with: pip install icalendar")
     sys.exit(1)
 
+from uk_bin_collection.uk_bin_collection.models import BinSchedule
+
 
 def parse_time_delta(time_str: str) -> datetime.timedelta:
     """
@@ -85,7 +87,7 @@ def parse_time_delta(time_str: str) -> datetime.timedelta:
 
 
 def create_bin_calendar(
-    bin_data: Dict,
+    bin_data: Union[Dict, BinSchedule],
     calendar_name: str = "Bin Collections",
     alarm_times: Optional[List[datetime.timedelta]] = None,
     all_day: bool = True
@@ -94,7 +96,7 @@ def create_bin_calendar(
     Create a calendar from bin collection data.
     
     Args:
-        bin_data: Dictionary containing bin collection data
+        bin_data: Dictionary containing bin collection data, or a BinSchedule
         calendar_name: Name of the calendar
         alarm_times: List of timedeltas for when reminders should trigger before the event
         all_day: Whether the events should be all-day events
@@ -109,33 +111,20 @@ def create_bin_calendar(
     cal.add('x-wr-calname', calendar_name)
     
     # Process bin collection data
-    if 'bins' not in bin_data:
+    if isinstance(bin_data, BinSchedule):
+        schedule = bin_data
+    elif 'bins' not in bin_data:
         print("Error: Invalid bin data format. 'bins' key not found.")
         sys.exit(1)
+    else:
+        # Entries without a type or with an unparseable date are skipped with a warning
+        schedule = BinSchedule.from_dict(bin_data, skip_invalid=True)
     
     # Group collections by date to combine bins collected on the same day
     collections_by_date = {}
     
-    for bin_info in bin_data['bins']:
-        if 'type' not in bin_info or 'collectionDate' not in bin_info:
-            continue
-        
-        bin_type = bin_info['type']
-        collection_date_str = bin_info['collectionDate']
-        
-        # Convert date string to datetime object
-        try:
-            # Expecting format DD/MM/YYYY
-            collection_date = datetime.datetime.strptime(collection_date_str, "%d/%m/%Y").date()
-        except ValueError:
-            print(f"Warning: Unable to parse date '{collection_date_str}'. Skipping.")
-            continue
-        
-        # Add to collections by date
-        if collection_date not in collections_by_date:
-            collections_by_date[collection_date] = []
-        
-        collections_by_date[collection_date].append(bin_type)
+    for collection in schedule:
+        collections_by_date.setdefault(collection.date, []).append(collection.type)
     
     # Create events for each collection date
     for collection_date, bin_types in collections_by_date.items():
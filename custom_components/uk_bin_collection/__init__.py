@@ -2,20 +2,29 @@
 
 import asyncio
 import logging
+import random
 from datetime import timedelta
 import json
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from datetime import datetime
-
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, LOG_PREFIX, PLATFORMS, EXCLUDED_ARG_KEYS
+from .const import (
+    DOMAIN,
+    LOG_PREFIX,
+    PLATFORMS,
+    EXCLUDED_ARG_KEYS,
+    MAX_REFRESH_INTERVAL,
+    MIN_REFRESH_INTERVAL,
+    REFRESH_JITTER,
+)
 from .uk_bin_collection.uk_bin_collection.collect_data import UKBinCollectionApp
+from .uk_bin_collection.uk_bin_collection.models import BinSchedule, BinScheduleIndex
 
 
 from homeassistant.helpers import config_validation as cv
@@ -327,8 +336,12 @@ class HouseholdBinCoordinator(DataUpdateCoordinator):
         self.ukbcd = ukbcd
         self.name = name
         self.timeout = timeout
+        self._base_update_interval = update_interval
 
         self._last_good_data = {}
+        self._supports_async = None
+        # Every collection the council returned, not just the next per bin type
+        self.schedule = BinScheduleIndex()
 
         _LOGGER.debug(
             f"{LOG_PREFIX} HouseholdBinCoordinator __init__: name={name}, timeout={timeout}, update_interval={update_interval}"
@@ -341,17 +354,18 @@ class HouseholdBinCoordinator(DataUpdateCoordinator):
             f"{LOG_PREFIX} Fetching latest bin collection data with timeout={self.timeout}"
         )
 
+        # Retry on the configured interval unless a successful update reschedules
+        self.update_interval = self._base_update_interval
+
         try:
-            data = await asyncio.wait_for(
-                self.hass.async_add_executor_job(self.ukbcd.run),
-                timeout=self.timeout,
-            )
+            data = await asyncio.wait_for(self._async_fetch(), timeout=self.timeout)
             _LOGGER.debug(f"{LOG_PREFIX} Raw data fetched from ukbcd.run(): {data}")
 
             parsed_data = json.loads(data)
             _LOGGER.debug(f"{LOG_PREFIX} JSON parsed data: {parsed_data}")
 
-            processed_data = self.process_bin_data(parsed_data)
+            schedule = self.build_schedule(parsed_data)
+            processed_data = schedule.next_collections(dt_util.now().date())
 
             if not processed_data:
                 _LOGGER.warning(
@@ -364,8 +378,15 @@ class HouseholdBinCoordinator(DataUpdateCoordinator):
                     return {}
 
             self._last_good_data = processed_data
+            self.schedule = schedule
             _LOGGER.debug(f"{LOG_PREFIX} Processed data: {processed_data}")
 
+            if self._base_update_interval is not None:
+                self.update_interval = self.next_refresh_interval(processed_data)
+                _LOGGER.debug(
+                    f"{LOG_PREFIX} Next refresh scheduled in {self.update_interval}"
+                )
+
             _LOGGER.info(f"{LOG_PREFIX} Bin collection data updated successfully.")
             return processed_data
 
@@ -379,45 +400,59 @@ class HouseholdBinCoordinator(DataUpdateCoordinator):
             _LOGGER.exception(f"{LOG_PREFIX} Unexpected error: {exc}")
             raise UpdateFailed(f"Unexpected error: {exc}") from exc
 
+    async def _async_fetch(self) -> str:
+        """Run the council on the event loop if it supports asyncio, else in an executor thread."""
+        if self._supports_async is None:
+            self._supports_async = await self.hass.async_add_executor_job(
+                self._council_supports_async
+            )
+            _LOGGER.debug(
+                f"{LOG_PREFIX} Council supports native async: {self._supports_async}"
+            )
+
+        if self._supports_async is True:
+            return await self.ukbcd.async_run(
+                http_session=async_get_clientsession(self.hass)
+            )
+        return await self.hass.async_add_executor_job(self.ukbcd.run)
+
+    def _council_supports_async(self) -> bool:
+        """Check (in an executor, as it imports the council) for async support."""
+        try:
+            return getattr(self.ukbcd, "supports_async", False) is True
+        except Exception as exc:
+            _LOGGER.debug(f"{LOG_PREFIX} Could not check async support: {exc}")
+            return False
+
+    @staticmethod
+    def next_refresh_interval(next_collection_dates: dict) -> timedelta:
+        """Return the delay until the day after the earliest upcoming collection, plus jitter,
+        capped at MAX_REFRESH_INTERVAL."""
+        earliest = min(next_collection_dates.values())
+        refresh_at = dt_util.start_of_local_day(earliest + timedelta(days=1))
+        refresh_at += timedelta(
+            seconds=random.uniform(0, REFRESH_JITTER.total_seconds())
+        )
+        return min(
+            max(refresh_at - dt_util.now(), MIN_REFRESH_INTERVAL), MAX_REFRESH_INTERVAL
+        )
+
+    @staticmethod
+    def build_schedule(data: dict) -> BinScheduleIndex:
+        """Index every collection in the raw data by bin type."""
+        # Entries with a missing type or a malformed date are logged and skipped
+        schedule = BinSchedule.from_dict(data, skip_invalid=True)
+        _LOGGER.debug(f"{LOG_PREFIX} Bins found: {schedule}")
+        return BinScheduleIndex(schedule)
+
     @staticmethod
     def process_bin_data(data: dict) -> dict:
         """Process raw data to determine the next collection dates."""
         _LOGGER.debug(f"{LOG_PREFIX} process_bin_data called with data={data}")
 
         current_date = dt_util.now().date()
-        next_collection_dates = {}
-
-        bins = data.get("bins", [])
-        _LOGGER.debug(f"{LOG_PREFIX} Bins found: {bins}")
-        for bin_data in bins:
-            bin_type = bin_data.get("type")
-            collection_date_str = bin_data.get("collectionDate")
-            _LOGGER.debug(f"{LOG_PREFIX} Processing bin_data={bin_data}")
-
-            if not bin_type or not collection_date_str:
-                _LOGGER.warning(
-                    f"{LOG_PREFIX} Missing 'type' or 'collectionDate' in bin data: {bin_data}"
-                )
-                continue
-
-            try:
-                collection_date = datetime.strptime(
-                    collection_date_str, "%d/%m/%Y"
-                ).date()
-            except (ValueError, TypeError) as exc:
-                _LOGGER.warning(
-                    f"{LOG_PREFIX} Invalid date format '{collection_date_str}' for bin type '{bin_type}'. Error: {exc}"
-                )
-                continue
-
-            existing_date = next_collection_dates.get(bin_type)
-            if collection_date >= current_date and (
-                not existing_date or collection_date < existing_date
-            ):
-                next_collection_dates[bin_type] = collection_date
-                _LOGGER.debug(
-                    f"{LOG_PREFIX} Updated next collection for '{bin_type}' to {collection_date}"
-                )
+        schedule = HouseholdBinCoordinator.build_schedule(data)
+        next_collection_dates = schedule.next_collections(current_date)
 
         _LOGGER.debug(
             f"{LOG_PREFIX} Final next_collection_dates={next_collection_dates}"
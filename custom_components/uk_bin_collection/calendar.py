@@ -2,8 +2,9 @@
 
 import logging
 import uuid
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
 from homeassistant.config_entries import ConfigEntry
@@ -35,6 +36,8 @@ class UKBinCollectionCalendar(CoordinatorEntity, CalendarEntity):
         self._unique_id = unique_id
         self._name = name
         self._attr_unique_id = unique_id
+        # (source, start ordinals, events) for the coordinator data last indexed
+        self._event_index: Optional[Tuple[Any, List[int], List[CalendarEvent]]] = None
 
         # Optionally, set device_info if you have device grouping
         self._attr_device_info = {
@@ -66,17 +69,44 @@ class UKBinCollectionCalendar(CoordinatorEntity, CalendarEntity):
         self, hass: HomeAssistant, start_date: datetime, end_date: datetime
     ) -> List[CalendarEvent]:
         """Return all events within a specific time frame."""
-        events: List[CalendarEvent] = []
-        collection_date = self.coordinator.data.get(self._bin_type)
+        starts, events = self._get_event_index()
+        first = bisect_left(starts, start_date.date().toordinal())
+        last = bisect_right(starts, end_date.date().toordinal())
+        return events[first:last]
 
-        if not collection_date:
-            return events
+    def _get_event_index(self) -> Tuple[List[int], List[CalendarEvent]]:
+        """Return this bin type's events and their start ordinals, both sorted.
 
-        # The test expects comparison between date parts.
-        if start_date.date() <= collection_date <= end_date.date():
-            events.append(self._create_calendar_event(collection_date))
+        Events are built once per coordinator schedule and reused for every
+        range the calendar card asks for. Each event is a single all-day
+        collection, so an event is in a range exactly when its start is.
+        """
+        schedule = getattr(self.coordinator, "schedule", None)
+        if schedule and self._bin_type in schedule:
+            # Serve the range from every collection the coordinator fetched
+            source = schedule
+        else:
+            schedule = None
+            source = self.coordinator.data.get(self._bin_type)
+
+        if self._event_index is None or self._event_index[0] != source:
+            if schedule is not None:
+                collection_dates = schedule.dates(self._bin_type)
+            else:
+                collection_dates = [source] if source else []
+            self._event_index = (
+                source,
+                [collection_date.toordinal() for collection_date in collection_dates],
+                [
+                    self._create_calendar_event(collection_date)
+                    for collection_date in collection_dates
+                ],
+            )
+            _LOGGER.debug(
+                f"{LOG_PREFIX} Indexed {len(collection_dates)} calendar events for '{self._bin_type}'."
+            )
 
-        return events
+        return self._event_index[1], self._event_index[2]
 
     def _create_calendar_event(self, collection_date: datetime.date) -> CalendarEvent:
         """Create a CalendarEvent for a given collection date."""
@@ -111,6 +141,7 @@ class UKBinCollectionCalendar(CoordinatorEntity, CalendarEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updates from the coordinator and refresh calendar state."""
+        self._event_index = None
         self.async_write_ha_state()
 
 
@@ -20,6 +20,13 @@ STATE_ATTR_DAYS = "days"
 
 DEVICE_CLASS = "bin_collection_schedule"
 
+# Refresh between midnight and this many hours into the day after the next collection
+REFRESH_JITTER = timedelta(hours=6)
+MIN_REFRESH_INTERVAL = timedelta(hours=1)
+# Refresh at least weekly, like the result cache TTL, so that collections moved by
+# the council (e.g. around bank holidays) are picked up even when the next is far off
+MAX_REFRESH_INTERVAL = timedelta(days=7)
+
 PLATFORMS = ["sensor", "calendar"]
 
 SELENIUM_SERVER_URLS = ["http://localhost:4444", "http://selenium:4444"]
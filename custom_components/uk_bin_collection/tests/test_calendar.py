@@ -17,6 +17,12 @@ from custom_components.uk_bin_collection.calendar import (
 )
 from homeassistant.components.calendar import CalendarEvent
 
+from custom_components.uk_bin_collection.uk_bin_collection.uk_bin_collection.models import (
+    BinCollection,
+    BinSchedule,
+    BinScheduleIndex,
+)
+
 from .common_utils import MockConfigEntry
 
 pytest_plugins = ["freezegun"]
@@ -175,6 +181,93 @@ async def test_async_get_events_no_events_in_range(hass_instance, mock_coordinat
     assert events == []
 
 
+@pytest.mark.asyncio
+async def test_async_get_events_full_schedule(hass_instance, mock_coordinator):
+    """Test that async_get_events returns every scheduled collection in the range."""
+    mock_coordinator.schedule = BinScheduleIndex(
+        BinSchedule(
+            [
+                BinCollection("Recycling", date(2024, 4, 11)),
+                BinCollection("Recycling", date(2024, 4, 25)),
+                BinCollection("Recycling", date(2024, 5, 9)),
+                BinCollection("General Waste", date(2024, 4, 18)),
+            ]
+        )
+    )
+
+    calendar = UKBinCollectionCalendar(
+        coordinator=mock_coordinator,
+        bin_type="Recycling",
+        unique_id="test_entry_id_Recycling_calendar",
+        name="Test Council Recycling Calendar",
+    )
+
+    start_date = datetime(2024, 4, 1)
+    end_date = datetime(2024, 4, 30)
+
+    events = await calendar.async_get_events(hass_instance, start_date, end_date)
+    assert [event.start for event in events] == [date(2024, 4, 11), date(2024, 4, 25)]
+    assert events[1] == CalendarEvent(
+        summary="Recycling Collection",
+        start=date(2024, 4, 25),
+        end=date(2024, 4, 26),
+        uid="test_entry_id_Recycling_calendar_2024-04-25",
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_get_events_reuses_indexed_events(hass_instance, mock_coordinator):
+    """Test that events are built once per schedule and rebuilt when it changes."""
+    mock_coordinator.schedule = BinScheduleIndex(
+        [
+            BinCollection("Recycling", date(2024, 4, 11) + timedelta(weeks=week))
+            for week in range(52)
+        ]
+    )
+
+    calendar = UKBinCollectionCalendar(
+        coordinator=mock_coordinator,
+        bin_type="Recycling",
+        unique_id="test_entry_id_Recycling_calendar",
+        name="Test Council Recycling Calendar",
+    )
+
+    with patch.object(
+        calendar,
+        "_create_calendar_event",
+        wraps=calendar._create_calendar_event,
+    ) as mock_create:
+        april = await calendar.async_get_events(
+            hass_instance, datetime(2024, 4, 1), datetime(2024, 4, 30)
+        )
+        may = await calendar.async_get_events(
+            hass_instance, datetime(2024, 5, 1), datetime(2024, 5, 31)
+        )
+        assert mock_create.call_count == 52
+
+        mock_coordinator.schedule = BinScheduleIndex(
+            [BinCollection("Recycling", date(2024, 4, 12))]
+        )
+        rescheduled = await calendar.async_get_events(
+            hass_instance, datetime(2024, 4, 1), datetime(2024, 4, 30)
+        )
+        assert mock_create.call_count == 53
+
+    assert [event.start for event in april] == [
+        date(2024, 4, 11),
+        date(2024, 4, 18),
+        date(2024, 4, 25),
+    ]
+    assert [event.start for event in may] == [
+        date(2024, 5, 2),
+        date(2024, 5, 9),
+        date(2024, 5, 16),
+        date(2024, 5, 23),
+        date(2024, 5, 30),
+    ]
+    assert [event.start for event in rescheduled] == [date(2024, 4, 12)]
+
+
 def test_calendar_update_on_coordinator_change(hass_instance, mock_coordinator):
     """Test that the calendar entity updates when the coordinator's data changes."""
     collection_date_initial = date(2024, 4, 25)
@@ -205,6 +205,10 @@ async def test_coordinator_fetch(hass):
     assert (
         coordinator.last_update_success is True
     ), "Coordinator update was not successful."
+    assert coordinator.schedule.types() == sorted(MOCK_PROCESSED_DATA)
+    assert coordinator.schedule.next("Recycling", date(2023, 10, 14)) == date(
+        2023, 10, 16
+    )
 
 
 @pytest.mark.asyncio
@@ -2135,3 +2139,133 @@ def test_raw_json_sensor_with_no_data():
     assert sensor.extra_state_attributes == {"raw_data": {}}
     # Availability should depend on last_update_success
     assert sensor.available is True
+
+
+@freeze_time("2023-10-14")
+@pytest.mark.asyncio
+async def test_coordinator_fetch_native_async(hass):
+    """Test the coordinator awaits councils that support asyncio on the event loop."""
+    app = MagicMock()
+    app.supports_async = True
+    app.async_run = AsyncMock(return_value=json.dumps(MOCK_BIN_COLLECTION_DATA))
+
+    async def run_in_executor(func, *args):
+        return func(*args)
+
+    hass.async_add_executor_job = AsyncMock(side_effect=run_in_executor)
+
+    with patch(
+        "custom_components.uk_bin_collection.async_get_clientsession"
+    ) as mock_get_session:
+        coordinator = HouseholdBinCoordinator(hass, app, "Test Name", timeout=60)
+        await coordinator.async_refresh()
+
+    assert coordinator.data == MOCK_PROCESSED_DATA
+    app.async_run.assert_awaited_once_with(
+        http_session=mock_get_session.return_value
+    )
+    app.run.assert_not_called()
+    # Only the one-off async support check ran in the executor
+    assert hass.async_add_executor_job.await_count == 1
+
+
+@freeze_time("2023-10-14")
+@pytest.mark.asyncio
+async def test_coordinator_fetch_sync_council_uses_executor(hass):
+    """Test councils without async support still run in an executor thread."""
+    app = MagicMock()
+    app.supports_async = False
+    app.run.return_value = json.dumps(MOCK_BIN_COLLECTION_DATA)
+    app.async_run = AsyncMock()
+
+    async def run_in_executor(func, *args):
+        return func(*args)
+
+    hass.async_add_executor_job = AsyncMock(side_effect=run_in_executor)
+
+    coordinator = HouseholdBinCoordinator(hass, app, "Test Name", timeout=60)
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+
+    assert coordinator.data == MOCK_PROCESSED_DATA
+    app.async_run.assert_not_awaited()
+    assert app.run.call_count == 2
+    # The support check is cached after the first refresh
+    assert hass.async_add_executor_job.await_count == 3
+
+
+@freeze_time("2023-10-14 09:00:00")
+@pytest.mark.asyncio
+async def test_coordinator_schedules_refresh_after_next_collection(hass):
+    """Test the coordinator refreshes the day after the earliest upcoming collection."""
+    app = MagicMock()
+    hass.async_add_executor_job = AsyncMock(
+        return_value=json.dumps(MOCK_BIN_COLLECTION_DATA)
+    )
+
+    coordinator = HouseholdBinCoordinator(
+        hass, app, "Test Name", timeout=60, update_interval=timedelta(hours=12)
+    )
+    with patch(
+        "custom_components.uk_bin_collection.random.uniform", return_value=0
+    ):
+        await coordinator.async_refresh()
+
+    # Earliest collection is 15/10/2023, so refresh at midnight on the 16th
+    expected = dt_util.start_of_local_day(date(2023, 10, 16)) - dt_util.now()
+    assert coordinator.update_interval == expected
+
+
+@freeze_time("2023-10-14 09:00:00")
+@pytest.mark.asyncio
+async def test_coordinator_refresh_interval_falls_back_on_failure(hass):
+    """Test a failed update goes back to the configured interval."""
+    app = MagicMock()
+    hass.async_add_executor_job = AsyncMock(
+        return_value=json.dumps(MOCK_BIN_COLLECTION_DATA)
+    )
+    coordinator = HouseholdBinCoordinator(
+        hass, app, "Test Name", timeout=60, update_interval=timedelta(hours=12)
+    )
+    await coordinator.async_refresh()
+    assert coordinator.update_interval > timedelta(hours=12)
+
+    hass.async_add_executor_job = AsyncMock(side_effect=Exception("boom"))
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success is False
+    assert coordinator.update_interval == timedelta(hours=12)
+
+
+@freeze_time("2023-10-14 09:00:00")
+@pytest.mark.asyncio
+async def test_coordinator_manual_refresh_only_is_not_rescheduled(hass):
+    """Test a coordinator without an update interval stays manual-only."""
+    app = MagicMock()
+    hass.async_add_executor_job = AsyncMock(
+        return_value=json.dumps(MOCK_BIN_COLLECTION_DATA)
+    )
+    coordinator = HouseholdBinCoordinator(
+        hass, app, "Test Name", timeout=60, update_interval=None
+    )
+    await coordinator.async_refresh()
+
+    assert coordinator.update_interval is None
+
+
+def test_next_refresh_interval_has_floor(freezer):
+    """Test the refresh interval never drops below the minimum."""
+    freezer.move_to("2023-10-15 23:59:00")
+    interval = HouseholdBinCoordinator.next_refresh_interval(
+        {"General Waste": date(2023, 10, 14)}
+    )
+    assert interval == timedelta(hours=1)
+
+
+def test_next_refresh_interval_has_ceiling(freezer):
+    """Test a far-off collection still refreshes within the maximum interval."""
+    freezer.move_to("2023-10-15 09:00:00")
+    interval = HouseholdBinCoordinator.next_refresh_interval(
+        {"General Waste": date(2023, 12, 25)}
+    )
+    assert interval == timedelta(days=7)
@@ -0,0 +1,234 @@
+"""Result Cache
+
+A small SQLite store for parsed bin data, keyed by council and address, so that
+repeat lookups within the TTL never touch the council's website.
+
+Keyword arguments:
+None
+"""
+
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+from uk_bin_collection.uk_bin_collection.common import parse_collection_date
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CACHE_TTL = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_REFRESH_JITTER = 6 * 60 * 60
+CACHE_KEY_FIELDS = ("uprn", "usrn", "postcode", "paon")
+
+
+def get_cache_dir() -> str:
+    """Return (creating it if needed) the directory used for on-disk caches."""
+    base_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    cache_dir = os.path.join(base_dir, "uk_bin_collection")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def default_cache_path() -> str:
+    """Return the result cache path, overridable with UKBC_CACHE_PATH."""
+    return os.environ.get("UKBC_CACHE_PATH") or os.path.join(
+        get_cache_dir(), "results.sqlite3"
+    )
+
+
+def open_result_cache(path: str = None, **kwargs):
+    """Return a ResultCache, or None if its directory or SQLite file cannot be
+    created (a read-only home directory, say), so that lookups run uncached.
+
+    Keyword arguments:
+    path -- the SQLite file to use, defaults to default_cache_path()
+    kwargs -- passed through to ResultCache
+    """
+    try:
+        return ResultCache(path, **kwargs)
+    except (OSError, sqlite3.Error) as err:
+        _LOGGER.warning(f"Result cache unavailable, running without it: {err}")
+        return None
+
+
+def next_refresh_time(
+    bin_data: dict, now: datetime = None, jitter: float = DEFAULT_REFRESH_JITTER
+):
+    """Return when parsed data goes stale: the start of the day after its earliest
+    upcoming collection, plus up to jitter seconds so refreshes do not all land at
+    midnight. Returns None if the data has no upcoming collections.
+
+    Keyword arguments:
+    bin_data -- a dict of parsed data in the {"bins": [...]} format
+    now -- the current time, defaults to datetime.now()
+    jitter -- the maximum number of seconds to add
+    """
+    now = now or datetime.now()
+    today = now.date()
+    earliest = None
+    for bin_data_item in (bin_data or {}).get("bins", []):
+        try:
+            collection_date = parse_collection_date(
+                bin_data_item.get("collectionDate")
+            )
+        except (TypeError, ValueError):
+            continue
+        if collection_date >= today and (
+            earliest is None or collection_date < earliest
+        ):
+            earliest = collection_date
+    if earliest is None:
+        return None
+    stale_from = datetime.combine(earliest + timedelta(days=1), datetime.min.time())
+    return stale_from + timedelta(seconds=random.uniform(0, jitter))
+
+
+def make_cache_key(council: str, address_url: str, **kwargs) -> str:
+    """Build the cache key for a lookup.
+
+    Keyword arguments:
+    council -- the council module name
+    address_url -- the URL passed to the council
+    kwargs -- the lookup parameters; only uprn, usrn, postcode and paon are used
+    """
+    parts = [council, address_url or ""]
+    for field in CACHE_KEY_FIELDS:
+        value = kwargs.get(field)
+        value = "" if value is None else str(value).strip()
+        if field == "postcode":
+            value = value.replace(" ", "").upper()
+        parts.append(value)
+    return json.dumps(parts, separators=(",", ":"))
+
+
+class ResultCache:
+    """SQLite-backed cache of parsed bin data with a TTL, LRU eviction and size caps.
+
+    Keyword arguments:
+    path -- the SQLite file to use, or ":memory:"
+    ttl -- the number of seconds an entry stays fresh
+    max_entries -- the number of entries to keep before evicting the least recently used
+    max_bytes -- the total size of stored values to keep before evicting
+    expire_after_collection -- expire entries the day after their earliest upcoming
+                               collection when that is sooner than the TTL
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        ttl: float = DEFAULT_CACHE_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        expire_after_collection: bool = True,
+    ):
+        self.path = path or default_cache_path()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.expire_after_collection = expire_after_collection
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, "
+            "value TEXT NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "expires_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed_at)"
+        )
+
+    def get(self, key: str):
+        """Return the cached data for key, or None if it is missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                "UPDATE results SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        _LOGGER.debug(f"Result cache hit for {key}")
+        return json.loads(row[0])
+
+    def set(self, key: str, value: dict, ttl: float = None):
+        """Store value under key for ttl seconds. Without an explicit ttl the entry
+        lives for the cache's TTL, or until its data goes stale if that is sooner."""
+        now = time.time()
+        payload = json.dumps(value, separators=(",", ":"))
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        if ttl is None and self.expire_after_collection:
+            refresh_at = next_refresh_time(value, datetime.fromtimestamp(now))
+            if refresh_at is not None:
+                expires_at = min(expires_at, refresh_at.timestamp())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results "
+                "(key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), expires_at, now),
+            )
+            self._evict(now)
+
+    def delete(self, key: str):
+        """Remove key from the cache."""
+        with self._lock:
+            self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def _evict(self, now: float):
+        self._conn.execute("DELETE FROM results WHERE expires_at <= ?", (now,))
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN ("
+                "SELECT key FROM results ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()[0]
+        if total > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM results ORDER BY accessed_at"
+            ).fetchall()
+            evicted = []
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                evicted.append((key,))
+                total -= size
+            self._conn.executemany("DELETE FROM results WHERE key = ?", evicted)
@@ -114,12 +114,9 @@ class UKBinCollectionApp:
             raise ValueError("Invalid CLI arguments passed to UKBinCollectionApp")
 
 
-    def run(self):
-        """Run the application with the provided arguments."""
-        council_module = import_council_module(self.parsed_args.module)
-        return self.client_code(
-            council_module.CouncilClass(),
-            self.parsed_args.URL,
+    def council_kwargs(self) -> dict:
+        """Return the keyword arguments passed to the council for the parsed args."""
+        return dict(
             postcode=self.parsed_args.postcode,
             paon=self.parsed_args.number,
             uprn=self.parsed_args.uprn,
@@ -131,6 +128,39 @@ class UKBinCollectionApp:
             council_module_str=self.parsed_args.module,
         )
 
+    def get_council_module(self):
+        """Import (once) and return the council module for the parsed args."""
+        if getattr(self, "_council_module_name", None) != self.parsed_args.module:
+            self._council_module = import_council_module(self.parsed_args.module)
+            self._council_module_name = self.parsed_args.module
+        return self._council_module
+
+    @property
+    def supports_async(self) -> bool:
+        """Whether the selected council can run natively on an event loop."""
+        return self.get_council_module().CouncilClass.supports_async()
+
+    def run(self):
+        """Run the application with the provided arguments."""
+        council_module = self.get_council_module()
+        return self.client_code(
+            council_module.CouncilClass(),
+            self.parsed_args.URL,
+            **self.council_kwargs(),
+        )
+
+    async def async_run(self, **kwargs):
+        """Run the application on the event loop. Only councils whose supports_async()
+        is True avoid blocking a thread.
+
+        Keyword arguments:
+        kwargs -- extra arguments for the council, such as http_session
+        """
+        council_module = self.get_council_module()
+        return await council_module.CouncilClass().async_template_method(
+            self.parsed_args.URL, **self.council_kwargs(), **kwargs
+        )
+
     def client_code(self, get_bin_data_class, address_url, **kwargs):
         """
         Call the template method to execute the algorithm. Client code does not need
@@ -1,18 +1,52 @@
 import calendar
+import functools
+import importlib
 import json
 import os
 import re
-from datetime import datetime, timedelta
+import shutil
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
 from enum import Enum
+from itertools import islice
+from typing import TYPE_CHECKING
 
-import holidays
-import pandas as pd
 import requests
-from dateutil.parser import parse
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
 from urllib3.exceptions import MaxRetryError
-from webdriver_manager.chrome import ChromeDriverManager
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    from selenium import webdriver
+
+# Heavy dependencies are imported on first use so that importing a council
+# module only pays for what that council actually needs. Module attributes of
+# the same names are still available, e.g. common.pd or common.webdriver.
+_LAZY_IMPORTS = {
+    "holidays": ("holidays", None),
+    "pd": ("pandas", None),
+    "parse": ("dateutil.parser", "parse"),
+    "webdriver": ("selenium.webdriver", None),
+    "ChromeService": ("selenium.webdriver.chrome.service", "Service"),
+    "ChromeDriverManager": ("webdriver_manager.chrome", "ChromeDriverManager"),
+}
+
+
+def __getattr__(name: str):
+    """
+    Imports a heavy dependency the first time it is accessed as a module attribute
+        :param name: Attribute name, e.g. pd
+        :return: The imported module or object
+    """
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_IMPORTS[name]
+    value = importlib.import_module(module_name)
+    if attribute:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
+
 
 date_format = "%d/%m/%Y"
 days_of_week = {
@@ -146,6 +180,42 @@ def parse_header(raw_header: str) -> dict:
     return header
 
 
+_holiday_ordinals = {}
+_holiday_ordinals_lock = threading.Lock()
+
+
+def get_holiday_ordinals(region: Region, year: int) -> frozenset:
+    """
+    Returns the public holidays for a UK nation and year as a set of date ordinals.
+    Each region and year is only looked up once per process and is shared between threads
+        :param region: The UK nation to get holidays for
+        :param year: The year to get holidays for
+        :return: Frozenset of date.toordinal() values
+    """
+    key = (region, year)
+    ordinals = _holiday_ordinals.get(key)
+    if ordinals is None:
+        with _holiday_ordinals_lock:
+            ordinals = _holiday_ordinals.get(key)
+            if ordinals is None:
+                import holidays
+
+                uk_holidays = holidays.country_holidays(
+                    "GB", subdiv=region.name, years=year
+                )
+                ordinals = frozenset(day.toordinal() for day in uk_holidays)
+                _holiday_ordinals[key] = ordinals
+    return ordinals
+
+
+def clear_holiday_cache():
+    """
+    Clears the holiday sets cached by get_holiday_ordinals()
+    """
+    with _holiday_ordinals_lock:
+        _holiday_ordinals.clear()
+
+
 def is_holiday(date_to_check: datetime, region: Region = Region.ENG) -> bool:
     """
     Checks if a given date is a public holiday
@@ -153,12 +223,9 @@ def is_holiday(date_to_check: datetime, region: Region = Region.ENG) -> bool:
         :param region: The UK nation to check. Defaults to ENG.
         :return: Bool - true if a holiday, false if not
     """
-    uk_holidays = holidays.country_holidays("GB", subdiv=region.name)
-
-    if date_to_check in uk_holidays:
-        return True
-    else:
-        return False
+    return date_to_check.toordinal() in get_holiday_ordinals(
+        region, date_to_check.year
+    )
 
 
 def is_weekend(date_to_check: datetime) -> bool:
@@ -185,11 +252,50 @@ def is_working_day(date_to_check: datetime, region: Region = Region.ENG) -> bool
 
 
 def get_next_working_day(date: datetime, region: Region = Region.ENG) -> datetime:
-    while not is_working_day(date, region):
+    """
+    Returns the first working day on or after a given date
+    :param date: Date to start from
+    :param region: The UK nation to check. Defaults to ENG.
+    :return: The date itself if it is a working day, otherwise the next one
+    """
+    holiday_ordinals = get_holiday_ordinals(region, date.year)
+    while date.weekday() >= 5 or date.toordinal() in holiday_ordinals:
         date += timedelta(days=1)
+        if date.month == 1 and date.day == 1:
+            holiday_ordinals = get_holiday_ordinals(region, date.year)
     return date
 
 
+def iter_weekday_dates(start: datetime, day_of_week: int):
+    """
+    Lazily yields every date falling on a given weekday, starting from the start date
+        :param start: Start date. Included if it already falls on day_of_week
+        :param day_of_week: Day of week number. Recommended to use calendar.DAY (Monday=0, Sunday=6)
+        :return: Generator of dates one week apart
+    """
+    if not 0 <= day_of_week <= 6:
+        raise ValueError(f"Invalid day of week: {day_of_week}")
+    return iter_dates_every_x_days(
+        start + timedelta(days=(day_of_week - start.weekday()) % 7), 7
+    )
+
+
+def iter_dates_every_x_days(start: datetime, step: int):
+    """
+    Lazily yields a date every `step` days, starting with the start date itself
+        :param start: Date to start from
+        :param step: X amount of days
+        :return: Generator of dates step days apart
+    """
+    if step == 0:
+        raise ValueError("step must not be 0")
+    interval = timedelta(days=step)
+    current = start
+    while True:
+        yield current
+        current += interval
+
+
 def get_weekday_dates_in_period(start: datetime, day_of_week: int, amount=8) -> list:
     """
     Returns a list of dates of a given weekday from a start date for the given amount of weeks
@@ -198,12 +304,8 @@ def get_weekday_dates_in_period(start: datetime, day_of_week: int, amount=8) ->
         :param amount: Number of weeks to get dates. Defaults to 8 weeks.
         :return: List of dates where the specified weekday is in the period
     """
-    return (
-        pd.date_range(
-            start=start, freq=f"W-{calendar.day_abbr[day_of_week]}", periods=amount
-        )
-        .strftime(date_format)
-        .tolist()
+    return format_collection_dates(
+        islice(iter_weekday_dates(start, day_of_week), amount)
     )
 
 
@@ -217,13 +319,24 @@ def get_dates_every_x_days(start: datetime, step: int, amount: int = 8) -> list:
         :return: List of dates every X days from start date
         :rtype: list
     """
-    return (
-        pd.date_range(start=start, freq=f"{step}D", periods=amount)
-        .strftime(date_format)
-        .tolist()
+    return format_collection_dates(
+        islice(iter_dates_every_x_days(start, step), amount)
     )
 
 
+def add_years(date: datetime, years: int) -> datetime:
+    """
+    Adds a number of years to a date, moving 29 February to 28 February in non-leap years
+        :param date: Date to move
+        :param years: Number of years to add
+        :return: The moved date
+    """
+    try:
+        return date.replace(year=date.year + years)
+    except ValueError:
+        return date.replace(year=date.year + years, day=28)
+
+
 def get_next_occurrence_from_day_month(date: datetime) -> datetime:
     current_date = datetime.now()
     # Get the current day and month as integers
@@ -238,7 +351,7 @@ def get_next_occurrence_from_day_month(date: datetime) -> datetime:
     if (target_month < current_month) or (
         target_month == current_month and target_day < current_day
     ):
-        date = pd.to_datetime(date) + pd.DateOffset(years=1)
+        date = add_years(date, 1)
 
     return date
 
@@ -303,6 +416,96 @@ def get_next_day_of_week(day_name, date_format="%d/%m/%Y"):
     return next_day.strftime(date_format)
 
 
+DATE_CACHE_SIZE = 4096
+
+
+def parse_collection_date(value: str) -> date:
+    """
+    Parses a dd/mm/YYYY collectionDate without going through strptime
+        :param value: The date string, e.g. 06/01/2025
+        :return: The date
+        :raises ValueError: If the string is not a valid dd/mm/YYYY date
+    """
+    if (
+        len(value) == 10
+        and value[2] == "/"
+        and value[5] == "/"
+        and value[:2].isdigit()
+        and value[3:5].isdigit()
+        and value[6:].isdigit()
+    ):
+        return date(int(value[6:]), int(value[3:5]), int(value[:2]))
+    # Unpadded days or months, e.g. 6/1/2025, which strptime also accepts
+    return datetime.strptime(value, date_format).date()
+
+
+def format_collection_date(value: date) -> str:
+    """
+    Formats a date or datetime as a dd/mm/YYYY collectionDate without going through strftime
+        :param value: The date
+        :return: The date string, e.g. 06/01/2025
+    """
+    return f"{value.day:02d}/{value.month:02d}/{value.year:04d}"
+
+
+def parse_collection_dates(values) -> list:
+    """
+    Parses many dd/mm/YYYY collectionDates, parsing each distinct string once
+        :param values: An iterable of date strings
+        :return: A list of dates in the same order
+    """
+    values = list(values)
+    parsed = {value: parse_collection_date(value) for value in dict.fromkeys(values)}
+    return [parsed[value] for value in values]
+
+
+def format_collection_dates(values) -> list:
+    """
+    Formats many dates as dd/mm/YYYY collectionDates, formatting each distinct date once
+        :param values: An iterable of dates
+        :return: A list of date strings in the same order
+    """
+    values = list(values)
+    formatted = {
+        value: format_collection_date(value) for value in dict.fromkeys(values)
+    }
+    return [formatted[value] for value in values]
+
+
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date_text(text, date_format, fuzzy, dayfirst, today) -> datetime:
+    if date_format is not None:
+        return datetime.strptime(text, date_format)
+    from dateutil.parser import parse
+
+    return parse(text, fuzzy=fuzzy, dayfirst=dayfirst)
+
+
+def parse_date_text(
+    text: str, date_format: str = None, fuzzy: bool = False, dayfirst: bool = False
+) -> datetime:
+    """
+    Parses a date as a council writes it, remembering the results of recent calls since
+    councils repeat the same few dates many times
+        :param text: The date text, e.g. Monday 6 January 2025
+        :param date_format: A strptime format, e.g. %A %d %B %Y. Without one, dateutil guesses
+        :param fuzzy: Ignore unknown words in text, when date_format is not given
+        :param dayfirst: Read 01/02 as 1 February, when date_format is not given
+        :return: The datetime
+        :raises ValueError: If the text cannot be parsed
+    """
+    # dateutil fills in missing parts from today, so only reuse its results on the same day
+    today = None if date_format is not None else date.today()
+    return _parse_date_text(text, date_format, fuzzy, dayfirst, today)
+
+
+def clear_date_cache():
+    """
+    Forgets the dates remembered by parse_date_text()
+    """
+    _parse_date_text.cache_clear()
+
+
 def contains_date(string, fuzzy=False) -> bool:
     """
     Return whether the string can be interpreted as a date.
@@ -311,19 +514,350 @@ def contains_date(string, fuzzy=False) -> bool:
     :param fuzzy: bool, ignore unknown tokens in string if True
     """
     try:
-        parse(string, fuzzy=fuzzy)
+        parse_date_text(string, fuzzy=fuzzy)
         return True
 
-    except ValueError:
+    except (ValueError, OverflowError):
         return False
 
 
+_html_parser = None
+
+
+def get_html_parser() -> str:
+    """
+    Returns the fastest BeautifulSoup tree builder available: lxml, or html.parser without it
+        :return: The parser name to pass to BeautifulSoup
+    """
+    global _html_parser
+    if _html_parser is None:
+        try:
+            import lxml  # noqa: F401
+
+            _html_parser = "lxml"
+        except ImportError:
+            _html_parser = "html.parser"
+    return _html_parser
+
+
+def make_soup(markup, parse_only=None, parser: str = None) -> "BeautifulSoup":
+    """
+    Parses HTML with lxml, optionally keeping only the parts of the page a council reads.
+    Restricting the parse with parse_only skips building the rest of the tree.
+        :param markup: The page as str or bytes, e.g. response.content
+        :param parse_only: A SoupStrainer, or a tag name or list of tag names, to keep
+        :param parser: The tree builder to use, defaults to get_html_parser()
+        :return: A BeautifulSoup
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    if isinstance(parse_only, (str, list)):
+        parse_only = SoupStrainer(parse_only)
+    return BeautifulSoup(
+        markup, features=parser or get_html_parser(), parse_only=parse_only
+    )
+
+
+def html_xpath(markup, expression: str) -> list:
+    """
+    Runs an XPath expression over a page with lxml, without building a BeautifulSoup tree
+        :param markup: The page as str or bytes
+        :param expression: XPath expression, e.g. //div[@class='resirow']
+        :return: The matching elements, strings or attribute values
+    """
+    from lxml import html
+
+    if not markup or not markup.strip():
+        return []
+    return html.fromstring(markup).xpath(expression)
+
+
+def get_input_values(markup, *names: str) -> dict:
+    """
+    Returns the values of named form inputs, such as hidden tokens, using lxml
+        :param markup: The page as str or bytes
+        :param names: The input names to look for
+        :return: A dict of input name to value, with None for inputs that are missing
+    """
+    values = dict.fromkeys(names)
+    for element in html_xpath(markup, "//input[@name]"):
+        name = element.get("name")
+        if name in values and values[name] is None:
+            values[name] = element.get("value", "")
+    return values
+
+
+HTML_STREAM_CHUNK_SIZE = 16 * 1024
+SELECTOR_PATTERN = re.compile(r"^([a-zA-Z][\w-]*)?(?:([#.])([\w-]+))?$")
+
+
+class HTMLStreamTarget:
+    """
+    Feeds a page to lxml's incremental HTML parser chunk by chunk and reports when an
+    element matching a simple selector ("table", "table#bins", "div.results", "#bins")
+    has been read in full, so that the rest of the page need not be downloaded.
+    """
+
+    def __init__(self, selector: str):
+        from lxml import etree
+
+        match = SELECTOR_PATTERN.match(selector.strip())
+        if match is None or not any(match.groups()):
+            raise ValueError(f"Unsupported selector: {selector!r}")
+        tag, kind, value = match.groups()
+        self.tag = tag.lower() if tag else None
+        self.attribute = {"#": "id", ".": "class"}.get(kind)
+        self.value = value
+        self.found = False
+        self._parser = etree.HTMLPullParser(events=("end",))
+
+    def matches(self, element) -> bool:
+        """
+        Returns whether a parsed element matches the selector
+            :param element: An lxml element
+            :return: True if it matches
+        """
+        if self.tag is not None and element.tag != self.tag:
+            return False
+        if self.attribute == "id":
+            return element.get("id") == self.value
+        if self.attribute == "class":
+            return self.value in (element.get("class") or "").split()
+        return True
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Parses the next chunk of the page
+            :param chunk: The next bytes of the page
+            :return: True once the target element has been closed
+        """
+        if not self.found:
+            self._parser.feed(chunk)
+            self.found = any(
+                self.matches(element) for _, element in self._parser.read_events()
+            )
+        return self.found
+
+
+def read_html_until(
+    response: requests.Response,
+    selector: str,
+    chunk_size: int = HTML_STREAM_CHUNK_SIZE,
+) -> bool:
+    """
+    Reads a response opened with stream=True only until the element matching selector
+    has been read, then closes it. The response's content and text are what was read,
+    which HTML parsers handle like a complete page.
+        :param response: A requests.Response opened with stream=True
+        :param selector: The element to stop after, see HTMLStreamTarget
+        :param chunk_size: The number of bytes to read at a time
+        :return: Whether the element was found before the end of the page
+    """
+    target = HTMLStreamTarget(selector)
+    chunks = []
+    try:
+        for chunk in response.iter_content(chunk_size):
+            chunks.append(chunk)
+            if target.feed(chunk):
+                break
+    finally:
+        response.close()
+    # Let content and text return what was read rather than the closed stream
+    response._content = b"".join(chunks)
+    response._content_consumed = True
+    return target.found
+
+
+CHROME_BINARIES = (
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+)
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+
+def get_chrome_stamp() -> str:
+    """
+    Returns a stamp identifying the installed Chrome, from its binary's path, size
+    and modification time, without starting it
+        :return: The stamp, or None if no Chrome binary is on the PATH
+    """
+    for name in CHROME_BINARIES:
+        binary = shutil.which(name)
+        if binary:
+            binary = os.path.realpath(binary)
+            stat = os.stat(binary)
+            return f"{binary}:{stat.st_size}:{stat.st_mtime_ns}"
+    return None
+
+
+def get_chromedriver_path() -> str:
+    """
+    Returns the path to a chromedriver matching the installed Chrome. The path that
+    ChromeDriverManager resolves is kept for the life of the process and saved to
+    disk, so it is only resolved again once Chrome is upgraded
+        :return: Path to the chromedriver executable
+    """
+    global _chromedriver_path
+    if _chromedriver_path is not None:
+        return _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path is not None:
+            return _chromedriver_path
+        from uk_bin_collection.uk_bin_collection.cache import get_cache_dir
+
+        try:
+            stamp_file = os.path.join(get_cache_dir(), "chromedriver.json")
+        except OSError:
+            # Without a cache directory the path is only kept in memory
+            stamp_file = None
+        chrome_stamp = get_chrome_stamp()
+        if stamp_file is not None:
+            try:
+                with open(stamp_file) as f:
+                    saved = json.load(f)
+                if (
+                    saved["chrome"] == chrome_stamp
+                    and chrome_stamp is not None
+                    and os.path.isfile(saved["driver"])
+                ):
+                    _chromedriver_path = saved["driver"]
+                    return _chromedriver_path
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        driver_path = ChromeDriverManager().install()
+        if stamp_file is not None:
+            try:
+                with open(stamp_file, "w") as f:
+                    json.dump({"chrome": chrome_stamp, "driver": driver_path}, f)
+            except OSError:
+                pass
+        _chromedriver_path = driver_path
+        return _chromedriver_path
+
+
+def clear_chromedriver_cache():
+    """
+    Forgets the chromedriver path resolved by get_chromedriver_path(), in memory and on disk
+    """
+    global _chromedriver_path
+    from uk_bin_collection.uk_bin_collection.cache import get_cache_dir
+
+    with _chromedriver_lock:
+        _chromedriver_path = None
+        try:
+            # get_cache_dir() raises OSError too when the directory can't be made
+            os.remove(os.path.join(get_cache_dir(), "chromedriver.json"))
+        except OSError:
+            pass
+
+
+TRACKER_URL_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*facebook.net*",
+    "*connect.facebook.com*",
+    "*hotjar.com*",
+    "*clarity.ms*",
+    "*siteimprove*",
+    "*cookiebot.com*",
+    "*cookielaw.org*",
+    "*onetrust.com*",
+    "*browsealoud.com*",
+    "*recite.me*",
+    "*addthis.com*",
+    "*sharethis.com*",
+    "*youtube.com*",
+    "*twitter.com*",
+    "*maps.googleapis.com*",
+    "*maps.gstatic.com*",
+    "*arcgisonline.com*",
+    "*tile.openstreetmap.org*",
+]
+IMAGE_URL_PATTERNS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico"]
+FONT_URL_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*fonts.googleapis.com*"]
+STYLESHEET_URL_PATTERNS = ["*.css"]
+
+# Browser profiles selectable per council with "browser_profile" in input.json.
+# "default" loads everything; "light" skips images, fonts, analytics and maps;
+# "minimal" also skips stylesheets, for councils that never check visibility.
+BROWSER_PROFILES = {
+    "default": {},
+    "light": {
+        "prefs": {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        },
+        "blocked_urls": IMAGE_URL_PATTERNS + FONT_URL_PATTERNS + TRACKER_URL_PATTERNS,
+        "page_load_strategy": "eager",
+        "window_size": "1280,800",
+    },
+    "minimal": {
+        "prefs": {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.stylesheets": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        },
+        "blocked_urls": IMAGE_URL_PATTERNS
+        + FONT_URL_PATTERNS
+        + STYLESHEET_URL_PATTERNS
+        + TRACKER_URL_PATTERNS,
+        "page_load_strategy": "eager",
+        "window_size": "1280,800",
+    },
+}
+
+
+def get_council_browser_profile(council: str) -> str:
+    """
+    Returns the browser profile a council asks for in input.json
+        :param council: Council module name
+        :return: The profile name, "default" if the council does not set one
+    """
+    from uk_bin_collection.uk_bin_collection.registry import get_registry
+
+    try:
+        info = get_registry().index.get(council) or {}
+    except OSError:
+        info = {}
+    return info.get("browser_profile") or "default"
+
+
+def execute_cdp_cmd(driver, cmd: str, params: dict) -> dict:
+    """
+    Runs a Chrome DevTools Protocol command on a local or remote Chrome WebDriver
+        :param driver: The WebDriver
+        :param cmd: CDP command, e.g. Network.enable
+        :param params: CDP command parameters
+        :return: The command's result
+    """
+    if hasattr(driver, "execute_cdp_cmd"):
+        return driver.execute_cdp_cmd(cmd, params)
+    # webdriver.Remote does not register Chrome's CDP endpoint itself
+    driver.command_executor.add_command(
+        "executeCdpCommand", "POST", "/session/$sessionId/goog/cdp/execute"
+    )
+    return driver.execute("executeCdpCommand", {"cmd": cmd, "params": params})[
+        "value"
+    ]
+
+
 def create_webdriver(
     web_driver: str = None,
     headless: bool = True,
     user_agent: str = None,
     session_name: str = None,
-) -> webdriver.Chrome:
+    profile: str = None,
+    capture_network: bool = False,
+) -> "webdriver.Chrome":
     """
     Create and return a Chrome WebDriver configured for optional headless operation.
 
@@ -331,9 +865,22 @@ def create_webdriver(
     :param headless: Whether to run the browser in headless mode.
     :param user_agent: Optional custom user agent string.
     :param session_name: Optional custom session name string.
+    :param profile: Optional name of a BROWSER_PROFILES entry. Defaults to the profile
+                    set for the session_name council in input.json, or "default".
+    :param capture_network: Whether to record network events in the "performance" log,
+                            as used by the recipe recorder.
     :return: An instance of a Chrome WebDriver.
     :raises WebDriverException: If the WebDriver cannot be created.
     """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service as ChromeService
+
+    if profile is None:
+        profile = get_council_browser_profile(session_name) if session_name else "default"
+    if profile not in BROWSER_PROFILES:
+        raise ValueError(f"Unknown browser profile: {profile}")
+    browser_profile = BROWSER_PROFILES[profile]
+
     options = webdriver.ChromeOptions()
     if headless:
         options.add_argument("--headless")
@@ -341,20 +888,68 @@ def create_webdriver(
     options.add_argument("--disable-gpu")
     options.add_argument("--start-maximized")
     options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--window-size=1920,1080")
+    options.add_argument(
+        f"--window-size={browser_profile.get('window_size', '1920,1080')}"
+    )
     if user_agent:
         options.add_argument(f"--user-agent={user_agent}")
     options.add_experimental_option("excludeSwitches", ["enable-logging"])
+    if browser_profile.get("prefs"):
+        options.add_experimental_option("prefs", browser_profile["prefs"])
+    if browser_profile.get("page_load_strategy"):
+        options.page_load_strategy = browser_profile["page_load_strategy"]
     if session_name and web_driver:
         options.set_capability("se:name", session_name)
+    if capture_network:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
 
     try:
         if web_driver:
-            return webdriver.Remote(command_executor=web_driver, options=options)
+            driver = webdriver.Remote(command_executor=web_driver, options=options)
         else:
-            return webdriver.Chrome(
-                service=ChromeService(ChromeDriverManager().install()), options=options
+            driver = webdriver.Chrome(
+                service=ChromeService(get_chromedriver_path()), options=options
             )
     except MaxRetryError as e:
         print(f"Failed to create WebDriver: {e}")
         raise
+
+    if browser_profile.get("blocked_urls"):
+        try:
+            execute_cdp_cmd(driver, "Network.enable", {})
+            execute_cdp_cmd(
+                driver,
+                "Network.setBlockedURLs",
+                {"urls": browser_profile["blocked_urls"]},
+            )
+        except Exception as e:
+            print(f"Could not block URLs for browser profile {profile}: {e}")
+    return driver
+
+
+@contextmanager
+def borrow_webdriver(
+    web_driver: str = None,
+    headless: bool = True,
+    user_agent: str = None,
+    session_name: str = None,
+    profile: str = None,
+):
+    """
+    Lease a Chrome WebDriver from the shared pool for the duration of a with block,
+    instead of creating and quitting one per lookup.
+
+    :param web_driver: URL to the Selenium server for remote web drivers. If None, a local driver is used.
+    :param headless: Whether to run the browser in headless mode.
+    :param user_agent: Optional custom user agent string.
+    :param session_name: Optional council module name, used to pick its browser profile.
+    :param profile: Optional name of a BROWSER_PROFILES entry, overriding the council's.
+    :return: A context manager yielding a WebDriver. Do not quit it; it is returned to the pool on exit.
+    """
+    from uk_bin_collection.uk_bin_collection.webdriver_pool import get_webdriver_pool
+
+    if profile is None:
+        profile = get_council_browser_profile(session_name) if session_name else "default"
+    pool = get_webdriver_pool(web_driver, headless, user_agent, profile)
+    with pool.lease() as driver:
+        yield driver
@@ -1,8 +1,9 @@
-import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
 from uk_bin_collection.uk_bin_collection.common import *
 from uk_bin_collection.uk_bin_collection.get_bin_data import AbstractGetBinDataClass
+from uk_bin_collection.uk_bin_collection.models import BinSchedule
+from uk_bin_collection.uk_bin_collection.sessions import get_form_session
 
 # import the wonderful Beautiful Soup and the URL grabber
 class CouncilClass(AbstractGetBinDataClass):
@@ -15,24 +16,17 @@ class CouncilClass(AbstractGetBinDataClass):
     def council_name(self):
         return "Cumberland (Renderform)"
 
-    def parse_data(self, page: str, **kwargs) -> dict:
+    def parse_data(self, page: str, **kwargs) -> BinSchedule:
         user_uprn = kwargs.get("uprn")
         postcode = kwargs.get("postcode")
         check_uprn(user_uprn)
-        bindata = {"bins": []}
+        bindata = BinSchedule()
 
         URI = "https://waste.cumberland.gov.uk/renderform?t=25&k=E43CEB1FB59F859833EF2D52B16F3F4EBE1CAB6A"
 
-        s = requests.Session()
-
-        # Make the GET request
-        response = s.get(URI)
-
-        # Make a BS4 object
-        soup = BeautifulSoup(response.content, features="html.parser")
-
-        token = soup.find("input", {"name": "__RequestVerificationToken"}).get("value")
-        formguid = soup.find("input", {"name": "FormGuid"}).get("value")
+        # The form's tokens and cookies are fetched once and shared by every
+        # lookup until they expire or the form rejects them
+        form_session = get_form_session(URI, ("__RequestVerificationToken", "FormGuid"))
 
         headers = {
             "Content-Type": "application/x-www-form-urlencoded",
@@ -43,8 +37,6 @@ class CouncilClass(AbstractGetBinDataClass):
         }
 
         payload = {
-            "__RequestVerificationToken": token,
-            "FormGuid": formguid,
             "ObjectTemplateID": "25",
             "Trigger": "submit",
             "CurrentSectionID": "33",
@@ -54,14 +46,24 @@ class CouncilClass(AbstractGetBinDataClass):
             "FF265-text": postcode
         }
 
-        response = s.post(
-            "https://waste.cumberland.gov.uk/renderform/Form",
-            headers=headers,
-            data=payload,
-        )
+        # A session the server has expired can come back without results rather
+        # than as an error, so fetch fresh tokens and send the form once more
+        for attempt in range(2):
+            if attempt:
+                form_session.invalidate()
+            response = form_session.post(
+                "https://waste.cumberland.gov.uk/renderform/Form",
+                headers=headers,
+                data=payload,
+            )
+            soup = make_soup(
+                response.content, parse_only=SoupStrainer("div", class_="resirow")
+            )
+            rows = soup.find_all("div", class_="resirow")
+            if rows:
+                break
 
-        soup = BeautifulSoup(response.content, features="html.parser")
-        for row in soup.find_all("div", class_="resirow"):
+        for row in rows:
             collection_type_div = row.find("div", class_="col")
             collection_type = (
                 collection_type_div.get("class")[1]
@@ -72,16 +74,9 @@ class CouncilClass(AbstractGetBinDataClass):
             date_div = row.find("div", style="width:360px;")
             collection_date = date_div.text.strip() if date_div else "Unknown"
 
-            dict_data = {
-                "type": collection_type,
-                "collectionDate": datetime.strptime(
-                    collection_date, "%A %d %B %Y"
-                ).strftime(date_format),
-            }
-            bindata["bins"].append(dict_data)
-
-        bindata["bins"].sort(
-            key=lambda x: datetime.strptime(x.get("collectionDate"), "%d/%m/%Y")
-        )
+            # The schedule keeps dates as dates and stays sorted as it is built
+            bindata.add(
+                collection_type, parse_date_text(collection_date, "%A %d %B %Y")
+            )
 
         return bindata
@@ -4,6 +4,7 @@ Keyword arguments:
 None
 """
 
+import asyncio
 import json
 import logging, logging.config
 from abc import ABC, abstractmethod
@@ -11,7 +12,18 @@ import os
 import requests
 import urllib3
 
-from uk_bin_collection.uk_bin_collection.common import update_input_json
+from uk_bin_collection.uk_bin_collection.cache import make_cache_key
+from uk_bin_collection.uk_bin_collection.common import (
+    HTML_STREAM_CHUNK_SIZE,
+    HTMLStreamTarget,
+    read_html_until,
+    update_input_json,
+)
+from uk_bin_collection.uk_bin_collection.models import as_bin_data_dict
+from uk_bin_collection.uk_bin_collection.sessions import (
+    DEFAULT_USER_AGENT,
+    get_session,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,6 +59,15 @@ class AbstractGetBinDataClass(ABC):
     Keyword arguments: None
     """
 
+    # Selenium councils can name a recipe in councils/recipes (see recipes.py) and
+    # implement parse_recipe_response to replay it with requests before a browser
+    recipe = None
+
+    # Councils whose data sits near the top of a large page can set this to a
+    # selector such as "table#bins" or "div.results" so that get_data stops
+    # downloading the page once that element has been read
+    stream_until = None
+
     def template_method(self, address_url: str, **kwargs) -> None:  # pragma: no cover
         """The main template method that is constructed
 
@@ -58,7 +79,7 @@ class AbstractGetBinDataClass(ABC):
         if not this_local_browser:
             kwargs["web_driver"] = kwargs.get("web_driver", None)
 
-        bin_data_dict = self.get_and_parse_data(this_url, **kwargs)
+        bin_data_dict = self.get_and_parse_data_cached(this_url, **kwargs)
         json_output = self.output_json(bin_data_dict)
 
         # if dev mode create/update council's entry in the input.json
@@ -71,20 +92,196 @@ class AbstractGetBinDataClass(ABC):
 
         return json_output
 
-    def get_and_parse_data(self, address_url, **kwargs):
-        """Get and parse data from the URL
+    async def async_template_method(self, address_url: str, **kwargs) -> str:
+        """The asyncio counterpart of template_method
+
+        Keyword arguments:
+        address_url -- the url to get the data from
+        http_session -- an optional aiohttp.ClientSession to make requests with
+        """
+        this_url = address_url
+        this_local_browser = kwargs.get("local_browser", False)
+        if not this_local_browser:
+            kwargs["web_driver"] = kwargs.get("web_driver", None)
+
+        result_cache = kwargs.pop("result_cache", None)
+        refresh = kwargs.pop("refresh", False)
+        cache_key = self.get_cache_key(this_url, **kwargs)
+        bin_data_dict = None
+        if result_cache is not None and not refresh:
+            bin_data_dict = await asyncio.to_thread(result_cache.get, cache_key)
+        if bin_data_dict is None:
+            # Councils may override async_get_and_parse_data and return a BinSchedule
+            bin_data_dict = as_bin_data_dict(
+                await self.async_get_and_parse_data(this_url, **kwargs)
+            )
+            if result_cache is not None:
+                await asyncio.to_thread(
+                    self.store_cached_data, result_cache, cache_key, bin_data_dict
+                )
+        json_output = self.output_json(bin_data_dict)
+
+        if kwargs.get("dev_mode"):
+            self.update_dev_mode_data(
+                council_module_str=kwargs.get("council_module_str"),
+                this_url=this_url,
+                **kwargs,
+            )
+
+        return json_output
+
+    @classmethod
+    def supports_async(cls) -> bool:
+        """Whether the council implements async_parse_data and can run on an event loop"""
+        return cls.async_parse_data is not AbstractGetBinDataClass.async_parse_data
+
+    @classmethod
+    def supports_recipe(cls) -> bool:
+        """Whether the council names a recipe and implements parse_recipe_response"""
+        return bool(cls.recipe) and (
+            cls.parse_recipe_response
+            is not AbstractGetBinDataClass.parse_recipe_response
+        )
+
+    def get_cache_key(self, address_url, **kwargs) -> str:
+        """Return the result cache key for a lookup
 
         Keyword arguments:
         address_url -- the URL to get the data from
         """
+        council = kwargs.get("council_module_str") or type(self).__module__
+        return make_cache_key(council, address_url, **kwargs)
+
+    def get_and_parse_data_cached(
+        self, address_url, result_cache=None, refresh=False, **kwargs
+    ):
+        """Get and parse data from the URL, going through a result cache if given
+
+        Keyword arguments:
+        address_url -- the URL to get the data from
+        result_cache -- an optional ResultCache to read from and write to
+        refresh -- skip the cached entry and fetch fresh data
+        """
+        if result_cache is None:
+            return self.get_and_parse_data(address_url, **kwargs)
+
+        cache_key = self.get_cache_key(address_url, **kwargs)
+        if not refresh:
+            bin_data_dict = result_cache.get(cache_key)
+            if bin_data_dict is not None:
+                return bin_data_dict
+
+        bin_data_dict = self.get_and_parse_data(address_url, **kwargs)
+        self.store_cached_data(result_cache, cache_key, bin_data_dict)
+        return bin_data_dict
+
+    @staticmethod
+    def store_cached_data(result_cache, cache_key, bin_data_dict):
+        """Store parsed data in the result cache, skipping empty or unserialisable results
+
+        Keyword arguments:
+        result_cache -- the ResultCache to write to
+        cache_key -- the key returned by get_cache_key
+        bin_data_dict -- a dict of parsed data
+        """
+        if not bin_data_dict or not bin_data_dict.get("bins"):
+            return
+        try:
+            result_cache.set(cache_key, bin_data_dict)
+        except (TypeError, ValueError) as err:
+            _LOGGER.warning(f"Could not cache result for {cache_key}: {err}")
+
+    def get_and_parse_data(self, address_url, **kwargs) -> dict:
+        """Get and parse data from the URL. Returns the {"bins": [...]} dict even when
+        parse_data returns a BinSchedule
+
+        Keyword arguments:
+        address_url -- the URL to get the data from
+        """
+        if self.supports_recipe() and not kwargs.get("skip_recipe"):
+            bin_data_dict = self.get_and_parse_recipe_data(address_url, **kwargs)
+            if bin_data_dict:
+                return bin_data_dict
+
         if not kwargs.get("skip_get_url"):
             page = self.get_data(address_url)
             bin_data_dict = self.parse_data(page, url=address_url, **kwargs)
         else:
             bin_data_dict = self.parse_data("", url=address_url, **kwargs)
 
+        return as_bin_data_dict(bin_data_dict)
+
+    async def async_get_and_parse_data(self, address_url, **kwargs) -> dict:
+        """Get and parse data from the URL without blocking the event loop. Returns the
+        {"bins": [...]} dict even when async_parse_data returns a BinSchedule
+
+        Keyword arguments:
+        address_url -- the URL to get the data from
+        """
+        if not self.supports_async():
+            # parse_data reads page.text from a requests.Response, so councils
+            # without async_parse_data run the whole synchronous lookup in a thread
+            kwargs.pop("http_session", None)
+            return await asyncio.to_thread(
+                self.get_and_parse_data, address_url, **kwargs
+            )
+
+        if self.supports_recipe() and not kwargs.get("skip_recipe"):
+            bin_data_dict = await asyncio.to_thread(
+                self.get_and_parse_recipe_data, address_url, **kwargs
+            )
+            if bin_data_dict:
+                return bin_data_dict
+
+        if not kwargs.get("skip_get_url"):
+            page = await self.async_get_data(
+                address_url, session=kwargs.get("http_session")
+            )
+            bin_data_dict = await self.async_parse_data(page, url=address_url, **kwargs)
+        else:
+            bin_data_dict = await self.async_parse_data("", url=address_url, **kwargs)
+
+        return as_bin_data_dict(bin_data_dict)
+
+    def get_and_parse_recipe_data(self, address_url, **kwargs):
+        """Replay the council's recipe and parse the responses. Returns None when the
+        recipe no longer works, so that the caller falls back to the browser
+
+        Keyword arguments:
+        address_url -- the URL to get the data from
+        """
+        from uk_bin_collection.uk_bin_collection.recipes import (
+            get_recipe_path,
+            load_recipe,
+            run_recipe,
+        )
+
+        try:
+            recipe = self.recipe
+            if not isinstance(recipe, dict):
+                recipe = load_recipe(get_recipe_path(recipe))
+            responses = run_recipe(recipe, **kwargs)
+            bin_data_dict = as_bin_data_dict(
+                self.parse_recipe_response(responses, url=address_url, **kwargs)
+            )
+        except Exception as err:
+            _LOGGER.warning(f"Recipe failed, falling back to Selenium: {err}")
+            return None
+        if not bin_data_dict or not bin_data_dict.get("bins"):
+            _LOGGER.warning("Recipe found no bins, falling back to Selenium")
+            return None
         return bin_data_dict
 
+    def parse_recipe_response(self, responses: list, **kwargs) -> dict:
+        """Parse the responses of a replayed recipe. Councils that set recipe override
+        this; the last response usually holds what the browser would have scraped.
+        The recipe is only replayed when it is overridden, see supports_recipe()
+
+        Keyword arguments:
+        responses -- the requests.Response of each recipe step, in order
+        """
+        return None
+
     def update_dev_mode_data(self, council_module_str, this_url, **kwargs):
         """Update input.json if in development mode
 
@@ -108,39 +305,115 @@ class AbstractGetBinDataClass(ABC):
 
     @classmethod
     def get_data(cls, url) -> str:
-        """This method makes the request to the council
+        """This method makes the request to the council using the pooled,
+        keep-alive session shared by every lookup in the process
 
         Keyword arguments:
         url -- the url to get the data from
         """
-        user_agent = (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/108.0.0.0 Safari/537.36"
-        )
-        headers = {"User-Agent": user_agent}
+        headers = {"User-Agent": DEFAULT_USER_AGENT}
         urllib3.disable_warnings(category=urllib3.exceptions.InsecureRequestWarning)
 
         try:
-            full_page = requests.get(url, headers, verify=False, timeout=120)
+            if cls.stream_until:
+                full_page = get_session().get(
+                    url, headers=headers, verify=False, timeout=120, stream=True
+                )
+                if not read_html_until(full_page, cls.stream_until):
+                    _LOGGER.debug(f"{cls.stream_until} not found, read all of {url}")
+                return full_page
+            full_page = get_session().get(
+                url, headers=headers, verify=False, timeout=120
+            )
             return full_page
         except requests.exceptions.RequestException as err:
             _LOGGER.error(f"Request Error: {err}")
             raise
 
+    @classmethod
+    async def async_get_data(cls, url, session=None) -> str:
+        """This method makes the request to the council with aiohttp and returns
+        the body as text
+
+        Keyword arguments:
+        url -- the url to get the data from
+        session -- an optional aiohttp.ClientSession to reuse
+        """
+        try:
+            import aiohttp
+        except ImportError as err:
+            raise ImportError(
+                f"{cls.__name__} fetches pages with aiohttp, which is not installed; "
+                "install it with 'pip install uk_bin_collection[async]'"
+            ) from err
+
+        headers = {"User-Agent": DEFAULT_USER_AGENT}
+        timeout = aiohttp.ClientTimeout(total=120)
+
+        try:
+            if session is None:
+                async with aiohttp.ClientSession() as own_session:
+                    async with own_session.get(
+                        url, headers=headers, ssl=False, timeout=timeout
+                    ) as response:
+                        return await cls.async_read_page(response)
+            async with session.get(
+                url, headers=headers, ssl=False, timeout=timeout
+            ) as response:
+                return await cls.async_read_page(response)
+        except aiohttp.ClientError as err:
+            _LOGGER.error(f"Request Error: {err}")
+            raise
+
+    @classmethod
+    async def async_read_page(cls, response) -> str:
+        """Return the body of an aiohttp response as text, reading it only up to
+        the stream_until element when the council sets one
+
+        Keyword arguments:
+        response -- the aiohttp.ClientResponse
+        """
+        if not cls.stream_until:
+            return await response.text()
+        target = HTMLStreamTarget(cls.stream_until)
+        chunks = []
+        async for chunk in response.content.iter_chunked(HTML_STREAM_CHUNK_SIZE):
+            chunks.append(chunk)
+            if target.feed(chunk):
+                break
+        return b"".join(chunks).decode(response.charset or "utf-8", "replace")
+
     @abstractmethod
     def parse_data(self, page: str, **kwargs) -> dict:
-        """Abstract method that takes a page as a string
+        """Abstract method that takes a page as a string and returns either a
+        {"bins": [...]} dict or a BinSchedule
 
         Keyword arguments:
         page -- a string from the requested page
         """
 
+    async def async_parse_data(self, page: str, **kwargs) -> dict:
+        """Parse the page without blocking the event loop. Councils that can scrape
+        natively with asyncio override this; async_get_and_parse_data runs the
+        synchronous get_and_parse_data in a thread for councils that don't
+
+        Unlike parse_data, which is given the requests.Response from get_data,
+        page is the body already decoded to a str, so use page rather than
+        page.text. The default hands page straight to parse_data
+
+        Keyword arguments:
+        page -- the body returned by async_get_data, as a str
+        """
+        return await asyncio.to_thread(self.parse_data, page, **kwargs)
+
     @classmethod
     def output_json(cls, bin_data_dict: dict) -> str:
         """Method to output the json as a pretty printed string
 
         Keyword arguments:
-        bin_data_dict -- a dict of parsed data
+        bin_data_dict -- a dict of parsed data, or a BinSchedule
         """
-        json_data = json.dumps(bin_data_dict, sort_keys=False, indent=4)
+        json_data = json.dumps(
+            as_bin_data_dict(bin_data_dict), sort_keys=False, indent=4
+        )
         return json_data
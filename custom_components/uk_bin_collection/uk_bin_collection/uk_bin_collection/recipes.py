@@ -0,0 +1,528 @@
+"""HTTP Recipes
+
+Records the requests a Selenium council's browser makes while it looks up an
+address and turns them into a recipe: the same requests, with the address
+details and any form tokens swapped for placeholders, which can be replayed with
+requests instead of starting a browser.
+
+Usage:
+    uk_bin_collection record CouncilName "https://example.gov.uk/bins" -p "AB1 2CD" -n 1
+"""
+
+import argparse
+import base64
+import fnmatch
+import functools
+import json
+import logging
+import os
+import re
+from contextlib import contextmanager
+from urllib.parse import parse_qsl, quote, quote_plus, urlsplit
+
+import requests
+import urllib3
+
+from uk_bin_collection.uk_bin_collection.common import (
+    TRACKER_URL_PATTERNS,
+    create_webdriver,
+    execute_cdp_cmd,
+)
+from uk_bin_collection.uk_bin_collection.sessions import new_session
+
+_LOGGER = logging.getLogger(__name__)
+
+RECIPE_VERSION = 1
+RECIPES_DIR = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "councils", "recipes"
+)
+# Lookup arguments that are swapped for placeholders when a recipe is recorded
+TEMPLATE_FIELDS = ("uprn", "usrn", "postcode", "paon")
+RECORDED_TYPES = ("Document", "XHR", "Fetch")
+# Request headers worth replaying. Everything else is left to requests
+REPLAYED_HEADERS = (
+    "accept",
+    "authorization",
+    "content-type",
+    "origin",
+    "referer",
+    "requestverificationtoken",
+    "x-csrf-token",
+    "x-requested-with",
+    "x-xsrf-token",
+)
+# Headers whose values are never tokens
+FIXED_HEADERS = ("accept", "content-type", "origin", "referer", "x-requested-with")
+MIN_TOKEN_LENGTH = 6
+TOKEN_PREFIX_LENGTH = 40
+TOKEN_CHARS = r"[^\"'&<>\s]+"
+PLACEHOLDER_PATTERN = re.compile(r"\{\{(\w+)(?:\|(url|quote))?\}\}")
+PLACEHOLDER_FILTERS = {
+    None: lambda value: value,
+    "url": quote_plus,
+    "quote": lambda value: quote(value, safe=""),
+}
+
+
+class RecipeError(Exception):
+    """Raised when a recipe cannot be replayed, e.g. a request fails or a token
+    is no longer on the page it was recorded from."""
+
+
+def parse_performance_log(entries) -> list:
+    """Return the requests in a Chrome "performance" log, in the order they were sent.
+
+    Keyword arguments:
+    entries -- the entries returned by driver.get_log("performance")
+    """
+    recorded = {}
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        method = message.get("method")
+        params = message.get("params", {})
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            # Redirects reuse the request ID; requests follows them by itself
+            if request_id in recorded:
+                continue
+            request = params["request"]
+            data = request.get("postData")
+            if data is None and request.get("postDataEntries"):
+                data = "".join(
+                    base64.b64decode(part.get("bytes", "")).decode("utf-8", "replace")
+                    for part in request["postDataEntries"]
+                )
+            recorded[request_id] = {
+                "id": request_id,
+                "method": request["method"],
+                "url": request["url"],
+                "headers": request.get("headers", {}),
+                "data": data,
+                "type": params.get("type"),
+                "status": None,
+                "cookies": {},
+                "set_cookies": [],
+            }
+        elif request_id not in recorded:
+            continue
+        elif method == "Network.requestWillBeSentExtraInfo":
+            for cookie in params.get("associatedCookies", []):
+                if not cookie.get("blockedReasons"):
+                    recorded[request_id]["cookies"][cookie["cookie"]["name"]] = cookie[
+                        "cookie"
+                    ]["value"]
+        elif method == "Network.responseReceived":
+            recorded[request_id]["status"] = params["response"]["status"]
+            recorded[request_id]["mime_type"] = params["response"].get("mimeType")
+        elif method == "Network.responseReceivedExtraInfo":
+            headers = {k.lower(): v for k, v in params.get("headers", {}).items()}
+            for line in headers.get("set-cookie", "").splitlines():
+                recorded[request_id]["set_cookies"].append(line.split("=", 1)[0].strip())
+    return list(recorded.values())
+
+
+def is_recorded(request: dict) -> bool:
+    """Whether a logged request is part of the lookup rather than an asset or tracker"""
+    return (
+        request["type"] in RECORDED_TYPES
+        and request["url"].startswith("http")
+        and request["status"] is not None
+        and not any(
+            fnmatch.fnmatch(request["url"], pattern) for pattern in TRACKER_URL_PATTERNS
+        )
+    )
+
+
+def capture_network(driver) -> list:
+    """Return the lookup requests a WebDriver started with capture_network=True has
+    made so far, with the body of each response. Call this before quitting the driver.
+
+    Keyword arguments:
+    driver -- the WebDriver
+    """
+    captured = [
+        request
+        for request in parse_performance_log(driver.get_log("performance"))
+        if is_recorded(request)
+    ]
+    for request in captured:
+        try:
+            result = execute_cdp_cmd(
+                driver, "Network.getResponseBody", {"requestId": request["id"]}
+            )
+        except Exception as err:
+            _LOGGER.debug(f"No response body for {request['url']}: {err}")
+            request["body"] = ""
+            continue
+        body = result.get("body", "")
+        if result.get("base64Encoded"):
+            body = base64.b64decode(body).decode("utf-8", "replace")
+        request["body"] = body
+    return captured
+
+
+def _step_values(step: dict):
+    for name, value in parse_qsl(urlsplit(step["url"]).query):
+        yield name, value
+    data = step.get("data")
+    if data:
+        try:
+            yield from _json_values(json.loads(data))
+        except ValueError:
+            yield from parse_qsl(data)
+    for name, value in step["headers"].items():
+        if name not in FIXED_HEADERS:
+            yield name, value
+    yield from step.get("cookies", {}).items()
+
+
+def _json_values(value, name=""):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _json_values(item, key)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _json_values(item, name)
+    elif isinstance(value, str):
+        yield name, value
+
+
+def _token_pattern(body: str, value: str):
+    start = body.find(value)
+    if start < 0:
+        return None
+    prefix = body[max(0, start - TOKEN_PREFIX_LENGTH) : start]
+    prefix = prefix[max(prefix.rfind("\n"), prefix.rfind(">")) + 1 :]
+    if not prefix:
+        return None
+    end = start + len(value)
+    for pattern in (
+        re.escape(prefix) + f"({TOKEN_CHARS})",
+        re.escape(prefix) + "(.+?)" + re.escape(body[end : end + 1]),
+    ):
+        match = re.search(pattern, body)
+        if match is not None and match.group(1) == value:
+            return pattern
+    return None
+
+
+def _substitute(steps: list, value: str, name: str):
+    replacements = [(value, f"{{{{{name}}}}}")]
+    for filter_name in ("url", "quote"):
+        encoded = PLACEHOLDER_FILTERS[filter_name](value)
+        if encoded != value:
+            replacements.insert(0, (encoded, f"{{{{{name}|{filter_name}}}}}"))
+
+    def replace(text):
+        for old, new in replacements:
+            text = text.replace(old, new)
+        return text
+
+    for step in steps:
+        step["url"] = replace(step["url"])
+        if step.get("data"):
+            step["data"] = replace(step["data"])
+        step["headers"] = {k: replace(v) for k, v in step["headers"].items()}
+        if step.get("cookies"):
+            step["cookies"] = {k: replace(v) for k, v in step["cookies"].items()}
+
+
+def build_recipe(
+    captured: list, council: str, values: dict, recorded_bins: int = None
+) -> dict:
+    """Turn captured requests into a recipe. Lookup values become placeholders, and
+    any other value sent by a request that appeared in an earlier response body
+    (e.g. a hidden form token) is extracted from that response when replaying.
+
+    Keyword arguments:
+    captured -- the requests returned by capture_network
+    council -- the council module name
+    values -- the lookup arguments the requests were recorded with
+    recorded_bins -- the number of bins the council found while recording
+    """
+    steps = []
+    bodies = []
+    set_cookies = set()
+    for request in captured:
+        headers = {
+            name.lower(): value
+            for name, value in request["headers"].items()
+            if name.lower() in REPLAYED_HEADERS
+        }
+        step = {"method": request["method"], "url": request["url"], "headers": headers}
+        if request.get("data") is not None:
+            step["data"] = request["data"]
+        # Cookies set by the site are carried by the session, but ones set by
+        # scripts (consent banners etc.) have to be sent explicitly
+        cookies = {
+            name: value
+            for name, value in request.get("cookies", {}).items()
+            if name not in set_cookies
+        }
+        if cookies:
+            step["cookies"] = cookies
+        set_cookies.update(request.get("set_cookies", []))
+        steps.append(step)
+        bodies.append(request.get("body") or "")
+
+    for field in TEMPLATE_FIELDS:
+        if values.get(field):
+            _substitute(steps, str(values[field]), field)
+
+    names = set(TEMPLATE_FIELDS)
+    for index, step in enumerate(steps):
+        for name, value in list(_step_values(step)):
+            if len(value) < MIN_TOKEN_LENGTH or "{{" in value:
+                continue
+            for source in range(index - 1, -1, -1):
+                pattern = _token_pattern(bodies[source], value)
+                if pattern is not None:
+                    break
+            else:
+                continue
+            variable = re.sub(r"\W+", "_", name).strip("_").lower() or "token"
+            while variable in names:
+                variable += "_"
+            names.add(variable)
+            steps[source].setdefault("extract", {})[variable] = pattern
+            _substitute(steps[index:], value, variable)
+
+    recipe = {"version": RECIPE_VERSION, "council": council, "steps": steps}
+    if recorded_bins is not None:
+        recipe["recorded_bins"] = recorded_bins
+    return recipe
+
+
+def render(text: str, variables: dict) -> str:
+    """Fill in the placeholders of a recipe string.
+
+    Keyword arguments:
+    text -- a URL, body or header value from a recipe step
+    variables -- the lookup arguments and extracted tokens
+    """
+
+    def replace(match):
+        name, filter_name = match.groups()
+        if variables.get(name) is None:
+            raise RecipeError(f"Recipe value {name} is not set")
+        return PLACEHOLDER_FILTERS[filter_name](variables[name])
+
+    return PLACEHOLDER_PATTERN.sub(replace, text)
+
+
+def run_recipe(recipe: dict, session: requests.Session = None, **kwargs) -> list:
+    """Replay a recipe and return the response of each step, in order.
+
+    Keyword arguments:
+    recipe -- the recipe, as returned by build_recipe or load_recipe
+    session -- the session to use, defaults to a new session with its own cookie jar
+    kwargs -- the lookup arguments (uprn, usrn, postcode, paon)
+    """
+    if recipe.get("version") != RECIPE_VERSION:
+        raise RecipeError(f"Unsupported recipe version {recipe.get('version')}")
+    variables = {
+        field: str(kwargs[field])
+        for field in TEMPLATE_FIELDS
+        if kwargs.get(field) is not None
+    }
+    session = session or new_session()
+    urllib3.disable_warnings(category=urllib3.exceptions.InsecureRequestWarning)
+
+    responses = []
+    for number, step in enumerate(recipe["steps"], 1):
+        data = step.get("data")
+        try:
+            response = session.request(
+                step["method"],
+                render(step["url"], variables),
+                headers={k: render(v, variables) for k, v in step["headers"].items()},
+                cookies={
+                    k: render(v, variables) for k, v in step.get("cookies", {}).items()
+                },
+                data=None if data is None else render(data, variables).encode("utf-8"),
+                verify=False,
+                timeout=60,
+            )
+        except requests.exceptions.RequestException as err:
+            raise RecipeError(f"Recipe step {number} failed: {err}") from err
+        if response.status_code >= 400:
+            raise RecipeError(
+                f"Recipe step {number} returned HTTP {response.status_code}"
+            )
+        for name, pattern in step.get("extract", {}).items():
+            match = re.search(pattern, response.text)
+            if match is None:
+                raise RecipeError(f"Recipe step {number} did not return {name}")
+            variables[name] = match.group(1)
+        responses.append(response)
+    return responses
+
+
+def get_recipe_path(name: str) -> str:
+    """Return the path of a recipe shipped in councils/recipes."""
+    return os.path.join(RECIPES_DIR, f"{name}.json")
+
+
+@functools.lru_cache(maxsize=128)
+def load_recipe(path: str) -> dict:
+    """Load (once) a recipe from a JSON file."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_recipe(recipe: dict, path: str):
+    """Write a recipe to a JSON file."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(recipe, f, indent=4)
+        f.write("\n")
+
+
+def record_council(module_name: str, address_url: str, **kwargs):
+    """Run a Selenium council with network capture and return the recipe built from
+    the requests its browser made, along with the data the council returned.
+
+    Keyword arguments:
+    module_name -- the name of the council module
+    address_url -- the URL to pass to the council
+    kwargs -- the lookup arguments passed to the council
+    """
+    from uk_bin_collection.uk_bin_collection.collect_data import import_council_module
+
+    council_module = import_council_module(module_name)
+    captured = []
+
+    def recording_create_webdriver(*args, **driver_kwargs):
+        driver_kwargs["capture_network"] = True
+        driver = create_webdriver(*args, **driver_kwargs)
+        quit_driver = driver.quit
+
+        def quit():
+            try:
+                captured.extend(capture_network(driver))
+            finally:
+                quit_driver()
+
+        driver.quit = quit
+        return driver
+
+    @contextmanager
+    def recording_borrow_webdriver(*args, **driver_kwargs):
+        driver = recording_create_webdriver(*args, **driver_kwargs)
+        try:
+            yield driver
+        finally:
+            driver.quit()
+
+    # Councils star-import these from common, so swap them in the council's namespace
+    recorders = {
+        "create_webdriver": recording_create_webdriver,
+        "borrow_webdriver": recording_borrow_webdriver,
+    }
+    originals = {
+        name: getattr(council_module, name)
+        for name in recorders
+        if hasattr(council_module, name)
+    }
+    for name in originals:
+        setattr(council_module, name, recorders[name])
+    try:
+        kwargs.setdefault("council_module_str", module_name)
+        bin_data_dict = council_module.CouncilClass().get_and_parse_data(
+            address_url, skip_recipe=True, **kwargs
+        )
+    finally:
+        for name, original in originals.items():
+            setattr(council_module, name, original)
+
+    if not captured:
+        raise RecipeError(f"{module_name} did not make any requests through a WebDriver")
+    recipe = build_recipe(
+        captured,
+        module_name,
+        kwargs,
+        recorded_bins=len((bin_data_dict or {}).get("bins", [])),
+    )
+    return recipe, bin_data_dict
+
+
+def setup_arg_parser() -> argparse.ArgumentParser:
+    """Return the argument parser for the record subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="uk_bin_collection record",
+        description="Record the HTTP requests behind a Selenium council as a recipe",
+    )
+    parser.add_argument("module", type=str, help="Name of council module to record")
+    parser.add_argument(
+        "URL", type=str, help="URL to parse - should be wrapped in double quotes"
+    )
+    parser.add_argument("-p", "--postcode", type=str, help="Postcode to look up")
+    parser.add_argument("-n", "--number", type=str, help="House number to look up")
+    parser.add_argument("-u", "--uprn", type=str, help="UPRN to look up")
+    parser.add_argument("--usrn", type=str, help="USRN to look up")
+    parser.add_argument(
+        "-s",
+        "--skip_get_url",
+        action="store_true",
+        help="Skips the generic get_url - uses one in council class",
+    )
+    parser.add_argument(
+        "-w",
+        "--web_driver",
+        type=str,
+        help="URL for remote Selenium web driver - should be wrapped in double quotes",
+    )
+    parser.add_argument(
+        "--not-headless",
+        dest="headless",
+        action="store_false",
+        help="Run Selenium with a visible browser",
+    )
+    parser.add_argument(
+        "--local_browser",
+        action="store_true",
+        help="Run Selenium locally rather than on a remote server",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        help="File to write the recipe to. Defaults to councils/recipes/<module>.json",
+    )
+    parser.add_argument(
+        "--no-verify",
+        dest="verify",
+        action="store_false",
+        help="Do not replay the recipe after recording it",
+    )
+    return parser
+
+
+def main(argv) -> int:
+    """Run the record subcommand and return the process exit code."""
+    args = setup_arg_parser().parse_args(argv)
+    kwargs = dict(
+        postcode=args.postcode,
+        paon=args.number,
+        uprn=args.uprn,
+        usrn=args.usrn,
+        skip_get_url=args.skip_get_url,
+        headless=args.headless,
+        local_browser=args.local_browser,
+        web_driver=args.web_driver,
+    )
+    recipe, bin_data_dict = record_council(args.module, args.URL, **kwargs)
+    output = args.output or get_recipe_path(args.module)
+    save_recipe(recipe, output)
+    print(
+        f"Recorded {len(recipe['steps'])} requests for {args.module} "
+        f"({recipe['recorded_bins']} bins) to {output}"
+    )
+    if args.verify:
+        try:
+            run_recipe(recipe, **kwargs)
+        except RecipeError as err:
+            print(f"The recipe could not be replayed: {err}")
+            return 1
+        print("The recipe replayed successfully")
+    return 0
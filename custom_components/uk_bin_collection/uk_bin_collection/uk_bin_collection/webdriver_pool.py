@@ -0,0 +1,339 @@
+"""WebDriver Pool
+
+Keeps Chrome sessions (local or on a remote Selenium server) alive between
+lookups so that Selenium councils lease a ready browser instead of paying for a
+browser start on every lookup.
+
+Keyword arguments:
+None
+"""
+
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from uk_bin_collection.uk_bin_collection.common import create_webdriver
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MIN_SIZE = 0
+DEFAULT_MAX_SIZE = 4
+DEFAULT_MAX_USES = 20
+DEFAULT_ACQUIRE_TIMEOUT = 300
+# Selenium Grid ends sessions idle for 300 seconds by default; quit them first
+DEFAULT_IDLE_TIMEOUT = 240
+
+
+class WebDriverPool:
+    """A bounded pool of WebDrivers that all share one configuration.
+
+    Drivers are health checked when leased, have their cookies and storage
+    cleared when returned, and are quit after max_uses leases, after sitting
+    idle for idle_timeout seconds, or as soon as a lease ends in an error.
+    Spare drivers for min_size are started in a background thread, so a lease
+    never waits for them.
+
+    Keyword arguments:
+    web_driver -- URL of a remote Selenium server, or None for a local Chrome
+    headless -- whether to run the browsers headless
+    user_agent -- an optional user agent for the browsers
+    profile -- the browser profile to start the browsers with (see common.BROWSER_PROFILES)
+    min_size -- the number of idle drivers to keep ready once the pool is used
+    max_size -- the most drivers the pool will have open at once
+    max_uses -- the number of leases after which a driver is replaced
+    idle_timeout -- seconds an idle driver is kept before it is quit, or None to keep it
+    driver_factory -- the callable that starts a driver, defaults to create_webdriver
+    """
+
+    def __init__(
+        self,
+        web_driver: str = None,
+        headless: bool = True,
+        user_agent: str = None,
+        profile: str = "default",
+        min_size: int = DEFAULT_MIN_SIZE,
+        max_size: int = DEFAULT_MAX_SIZE,
+        max_uses: int = DEFAULT_MAX_USES,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        driver_factory=None,
+    ):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("WebDriverPool needs 0 <= min_size <= max_size and max_size >= 1")
+        self.web_driver = web_driver
+        self.headless = headless
+        self.user_agent = user_agent
+        self.profile = profile
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.idle_timeout = idle_timeout
+        self.driver_factory = driver_factory or create_webdriver
+        self._idle = []
+        self._idle_since = {}
+        self._uses = {}
+        self._size = 0
+        self._closed = False
+        lock = threading.RLock()
+        self._condition = threading.Condition(lock)
+        # The reaper sleeps on its own condition so that a returned driver always
+        # wakes a waiting acquire() rather than the reaper
+        self._reaper_condition = threading.Condition(lock)
+        self._fill_thread = None
+        self._reaper_thread = None
+
+    def __len__(self) -> int:
+        """The number of drivers the pool currently has open."""
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        """The number of open drivers waiting to be leased."""
+        return len(self._idle)
+
+    def acquire(self, timeout: float = DEFAULT_ACQUIRE_TIMEOUT):
+        """Lease a healthy driver, starting one if the pool is below max_size.
+
+        Keyword arguments:
+        timeout -- seconds to wait for a driver when the pool is full
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._condition:
+                while not self._idle and self._size >= self.max_size:
+                    if self._closed:
+                        raise RuntimeError("WebDriverPool is closed")
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f"No WebDriver became free within {timeout} seconds"
+                        )
+                    self._condition.wait(remaining)
+                if self._closed:
+                    raise RuntimeError("WebDriverPool is closed")
+                driver = self._idle.pop() if self._idle else None
+                if driver is None:
+                    self._size += 1
+                else:
+                    self._idle_since.pop(id(driver), None)
+            if driver is None:
+                driver = self._start_driver()
+            elif not self._is_healthy(driver):
+                _LOGGER.info("Replacing a WebDriver that failed its health check")
+                self._discard(driver)
+                continue
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+            self._fill_in_background()
+            return driver
+
+    def release(self, driver, discard: bool = False):
+        """Return a leased driver to the pool.
+
+        Keyword arguments:
+        driver -- the driver returned by acquire
+        discard -- quit the driver instead of keeping it, e.g. after it crashed
+        """
+        if discard or self._closed or self._uses.get(id(driver), 0) >= self.max_uses:
+            self._discard(driver)
+            return
+        try:
+            self._reset(driver)
+        except Exception as err:
+            _LOGGER.info(f"Discarding a WebDriver that could not be reset: {err}")
+            self._discard(driver)
+            return
+        with self._condition:
+            self._add_idle(driver)
+
+    @contextmanager
+    def lease(self, timeout: float = DEFAULT_ACQUIRE_TIMEOUT):
+        """Lease a driver for the duration of a with block. The driver is discarded
+        rather than reused if the block raises.
+
+        Keyword arguments:
+        timeout -- seconds to wait for a driver when the pool is full
+        """
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        except BaseException:
+            self.release(driver, discard=True)
+            raise
+        else:
+            self.release(driver)
+
+    def close(self):
+        """Quit every idle driver. Leased drivers are quit when they are returned."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._idle_since.clear()
+            self._condition.notify_all()
+            self._reaper_condition.notify_all()
+        for driver in idle:
+            self._discard(driver)
+
+    def _start_driver(self):
+        try:
+            return self.driver_factory(
+                self.web_driver,
+                self.headless,
+                self.user_agent,
+                __name__,
+                profile=self.profile,
+            )
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def _add_idle(self, driver):
+        # Called with self._condition held
+        self._idle.append(driver)
+        self._idle_since[id(driver)] = time.monotonic()
+        self._condition.notify()
+        if self.idle_timeout is not None and not self._is_running(self._reaper_thread):
+            self._reaper_thread = threading.Thread(
+                target=self._reap, name="webdriver-pool-reaper", daemon=True
+            )
+            self._reaper_thread.start()
+
+    @staticmethod
+    def _is_running(thread) -> bool:
+        return thread is not None and thread.is_alive()
+
+    def _fill_in_background(self):
+        with self._condition:
+            if (
+                self._closed
+                or len(self._idle) >= self.min_size
+                or self._size >= self.max_size
+                or self._is_running(self._fill_thread)
+            ):
+                return
+            self._fill_thread = threading.Thread(
+                target=self._fill, name="webdriver-pool-fill", daemon=True
+            )
+            self._fill_thread.start()
+
+    def _fill(self):
+        while True:
+            with self._condition:
+                if (
+                    self._closed
+                    or len(self._idle) >= self.min_size
+                    or self._size >= self.max_size
+                ):
+                    return
+                self._size += 1
+            try:
+                driver = self._start_driver()
+            except Exception as err:
+                _LOGGER.warning(f"Could not start a spare WebDriver: {err}")
+                return
+            with self._condition:
+                if self._closed:
+                    break
+                self._add_idle(driver)
+        self._discard(driver)
+
+    def _reap(self):
+        while True:
+            with self._condition:
+                if self._closed or not self._idle:
+                    return
+                now = time.monotonic()
+                expired = [
+                    driver
+                    for driver in self._idle
+                    if now - self._idle_since[id(driver)] >= self.idle_timeout
+                ]
+                if not expired:
+                    oldest = min(self._idle_since[id(driver)] for driver in self._idle)
+                    self._reaper_condition.wait(oldest + self.idle_timeout - now)
+                    continue
+                for driver in expired:
+                    self._idle.remove(driver)
+                    self._idle_since.pop(id(driver), None)
+            _LOGGER.debug(f"Quitting {len(expired)} idle WebDriver(s)")
+            for driver in expired:
+                self._discard(driver)
+
+    def _discard(self, driver):
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as err:
+            _LOGGER.debug(f"Error quitting WebDriver: {err}")
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    @staticmethod
+    def _is_healthy(driver) -> bool:
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _reset(driver):
+        try:
+            driver.execute_script(
+                "window.localStorage.clear(); window.sessionStorage.clear();"
+            )
+        except Exception:
+            # about:blank and some error pages have no storage to clear
+            pass
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_pool_settings = {}
+
+
+def configure_webdriver_pools(**kwargs):
+    """Set the min_size, max_size and max_uses used for pools created from now on,
+    and close any existing pools.
+
+    Keyword arguments:
+    kwargs -- passed through to WebDriverPool
+    """
+    with _pools_lock:
+        _pool_settings.clear()
+        _pool_settings.update(kwargs)
+    close_webdriver_pools()
+
+
+def get_webdriver_pool(
+    web_driver: str = None,
+    headless: bool = True,
+    user_agent: str = None,
+    profile: str = "default",
+) -> WebDriverPool:
+    """Return the process-wide pool for a driver configuration, creating it on first use."""
+    key = (web_driver, headless, user_agent, profile)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = WebDriverPool(
+                    web_driver, headless, user_agent, profile, **_pool_settings
+                )
+    return pool
+
+
+@atexit.register
+def close_webdriver_pools():
+    """Quit the idle drivers of every pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,222 @@
+"""Benchmarks for the helpers in common.py
+
+Run with `make benchmark` or `python uk_bin_collection/tests/benchmark_common.py`.
+"""
+
+import calendar
+import os
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime, timedelta
+
+from tabulate import tabulate
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def time_subprocess(code: str, repeats: int = 5) -> float:
+    """Return the median wall-clock seconds to run code in a fresh interpreter."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def benchmark_import_time(repeats: int = 5) -> list:
+    """Compare the cold import time of common.py with its heavy dependencies."""
+    modules = [
+        "uk_bin_collection.uk_bin_collection.common",
+        "pandas",
+        "selenium.webdriver",
+        "holidays",
+    ]
+    baseline = time_subprocess("pass", repeats)
+    rows = []
+    for module in modules:
+        seconds = time_subprocess(f"import {module}", repeats) - baseline
+        rows.append([module, f"{seconds * 1000:.1f}"])
+    return rows
+
+
+def benchmark_date_ranges(number: int = 2000) -> list:
+    """Compare the stdlib recurrence helpers with the pandas date_range they replaced."""
+    import pandas as pd
+
+    from uk_bin_collection.uk_bin_collection.common import (
+        date_format,
+        get_dates_every_x_days,
+        get_weekday_dates_in_period,
+    )
+
+    start = datetime(2024, 1, 3, 7, 30)
+    cases = [
+        (
+            "get_weekday_dates_in_period(start, 4, 8)",
+            lambda: get_weekday_dates_in_period(start, 4, 8),
+            lambda: pd.date_range(
+                start=start, freq=f"W-{calendar.day_abbr[4]}", periods=8
+            )
+            .strftime(date_format)
+            .tolist(),
+        ),
+        (
+            "get_dates_every_x_days(start, 14, 8)",
+            lambda: get_dates_every_x_days(start, 14, 8),
+            lambda: pd.date_range(start=start, freq="14D", periods=8)
+            .strftime(date_format)
+            .tolist(),
+        ),
+    ]
+    rows = []
+    for name, stdlib_func, pandas_func in cases:
+        assert stdlib_func() == pandas_func()
+        stdlib_us = timeit.timeit(stdlib_func, number=number) / number * 1e6
+        pandas_us = timeit.timeit(pandas_func, number=number) / number * 1e6
+        rows.append(
+            [name, f"{pandas_us:.1f}", f"{stdlib_us:.1f}", f"{pandas_us / stdlib_us:.0f}x"]
+        )
+    return rows
+
+
+def benchmark_date_codec(number: int = 200) -> list:
+    """Compare strptime/strftime with the collectionDate codec on a year of weekly dates."""
+    from uk_bin_collection.uk_bin_collection.common import (
+        format_collection_date,
+        parse_collection_date,
+        parse_collection_dates,
+        parse_date_text,
+    )
+
+    dates = [
+        datetime(2025, 1, 6) + timedelta(days=7 * week)
+        for week in range(52)
+        for _ in range(3)
+    ]
+    strings = [d.strftime("%d/%m/%Y") for d in dates]
+    texts = [d.strftime("%A %d %B %Y") for d in dates]
+    cases = [
+        (
+            "parse dd/mm/YYYY",
+            lambda: [datetime.strptime(s, "%d/%m/%Y").date() for s in strings],
+            lambda: [parse_collection_date(s) for s in strings],
+        ),
+        (
+            "parse dd/mm/YYYY (batch)",
+            lambda: [datetime.strptime(s, "%d/%m/%Y").date() for s in strings],
+            lambda: parse_collection_dates(strings),
+        ),
+        (
+            "format dd/mm/YYYY",
+            lambda: [d.strftime("%d/%m/%Y") for d in dates],
+            lambda: [format_collection_date(d) for d in dates],
+        ),
+        (
+            "parse %A %d %B %Y",
+            lambda: [datetime.strptime(t, "%A %d %B %Y") for t in texts],
+            lambda: [parse_date_text(t, "%A %d %B %Y") for t in texts],
+        ),
+    ]
+    rows = []
+    for name, stdlib_func, codec_func in cases:
+        assert stdlib_func() == codec_func()
+        stdlib_us = timeit.timeit(stdlib_func, number=number) / number * 1e6
+        codec_us = timeit.timeit(codec_func, number=number) / number * 1e6
+        rows.append(
+            [name, f"{stdlib_us:.0f}", f"{codec_us:.0f}", f"{stdlib_us / codec_us:.1f}x"]
+        )
+    return rows
+
+
+def benchmark_html_parsing(number: int = 50) -> list:
+    """Compare full html.parser trees with the lxml helpers on a padded results page."""
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    from uk_bin_collection.uk_bin_collection.common import get_input_values, make_soup
+
+    filler = "<p class='text'>Recycling guidance <a href='#'>link</a></p>" * 2000
+    rows = (
+        "<div class='resirow'><div class='col Refuse'></div>"
+        "<div style='width:360px;'>Monday 6 January 2025</div></div>"
+    ) * 4
+    page = (
+        "<html><body><form><input name='__RequestVerificationToken' value='abc' />"
+        f"</form>{filler}{rows}</body></html>"
+    )
+    cases = [
+        (
+            "read two hidden inputs",
+            lambda: BeautifulSoup(page, features="html.parser")
+            .find("input", {"name": "__RequestVerificationToken"})
+            .get("value"),
+            lambda: get_input_values(page, "__RequestVerificationToken")[
+                "__RequestVerificationToken"
+            ],
+        ),
+        (
+            "find div.resirow rows",
+            lambda: len(
+                BeautifulSoup(page, features="html.parser").find_all(
+                    "div", class_="resirow"
+                )
+            ),
+            lambda: len(
+                make_soup(
+                    page, parse_only=SoupStrainer("div", class_="resirow")
+                ).find_all("div", class_="resirow")
+            ),
+        ),
+    ]
+    results = []
+    for name, full_func, fast_func in cases:
+        assert full_func() == fast_func()
+        full_ms = timeit.timeit(full_func, number=number) / number * 1e3
+        fast_ms = timeit.timeit(fast_func, number=number) / number * 1e3
+        results.append(
+            [name, f"{full_ms:.2f}", f"{fast_ms:.2f}", f"{full_ms / fast_ms:.1f}x"]
+        )
+    return results
+
+
+def main():
+    print("Cold import time (median of 5 fresh interpreters)")
+    print(
+        tabulate(
+            benchmark_import_time(),
+            headers=["module", "ms over interpreter start"],
+        )
+    )
+    print()
+    print("Date recurrence helpers (microseconds per call)")
+    print(
+        tabulate(
+            benchmark_date_ranges(),
+            headers=["call", "pandas", "stdlib", "speed-up"],
+        )
+    )
+    print()
+    print("collectionDate codec (microseconds per 156 dates)")
+    print(
+        tabulate(
+            benchmark_date_codec(),
+            headers=["task", "strptime/strftime", "codec", "speed-up"],
+        )
+    )
+    print()
+    print("HTML parsing (milliseconds per page)")
+    print(
+        tabulate(
+            benchmark_html_parsing(),
+            headers=["task", "html.parser", "lxml helper", "speed-up"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
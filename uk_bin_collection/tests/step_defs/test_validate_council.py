@@ -95,6 +95,8 @@ def scrape_step(
         args.append(f"-w={selenium_url}")
     if "skip_get_url" in context.metadata:
         args.append("-s")
+    # Always check the council's live output, never a cached result
+    args.append("--no-cache")
 
     CollectData = collect_data.UKBinCollectionApp()
     CollectData.set_args(args)
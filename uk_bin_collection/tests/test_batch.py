@@ -0,0 +1,250 @@
+import io
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from uk_bin_collection.batch import (
+    main,
+    normalise_lookup,
+    read_lookups,
+    run_batch,
+    write_jsonl,
+)
+
+
+def test_normalise_lookup_aliases_and_booleans():
+    lookup = normalise_lookup(
+        {
+            "module": "CumberlandCouncil",
+            "url": "https://example.com",
+            "house_number": "1",
+            "skip_get_url": "True",
+            "postcode": "",
+            "unknown": "ignored",
+        }
+    )
+    assert lookup == {
+        "council": "CumberlandCouncil",
+        "url": "https://example.com",
+        "paon": "1",
+        "skip_get_url": True,
+    }
+
+
+def test_normalise_lookup_missing_council():
+    with pytest.raises(ValueError):
+        normalise_lookup({"url": "https://example.com"})
+
+
+def test_read_lookups_csv():
+    stream = io.StringIO(
+        "council,url,uprn,postcode\n"
+        "CouncilA,https://a.example,1,AB1 2CD\n"
+        "CouncilB,,2,\n"
+    )
+    lookups = list(read_lookups(stream, "csv"))
+    assert lookups == [
+        {
+            "council": "CouncilA",
+            "url": "https://a.example",
+            "uprn": "1",
+            "postcode": "AB1 2CD",
+        },
+        {"council": "CouncilB", "url": "", "uprn": "2"},
+    ]
+
+
+def test_read_lookups_jsonl():
+    stream = io.StringIO(
+        '{"council": "CouncilA", "uprn": "1"}\n\n{"council": "CouncilB", "paon": "2"}\n'
+    )
+    lookups = list(read_lookups(stream, "jsonl"))
+    assert lookups == [
+        {"council": "CouncilA", "uprn": "1", "url": ""},
+        {"council": "CouncilB", "paon": "2", "url": ""},
+    ]
+
+
+def test_read_lookups_bad_format():
+    with pytest.raises(ValueError):
+        list(read_lookups(io.StringIO(""), "xml"))
+
+
+@patch("uk_bin_collection.batch.import_council_module")
+def test_run_batch_respects_per_council_limit(mock_import):
+    lock = threading.Lock()
+    running = {}
+    peaks = {}
+
+    def fake_lookup(council, url, **kwargs):
+        with lock:
+            running[council] = running.get(council, 0) + 1
+            peaks[council] = max(peaks.get(council, 0), running[council])
+        time.sleep(0.01)
+        with lock:
+            running[council] -= 1
+        return {"bins": [], "uprn": kwargs["uprn"]}
+
+    lookups = [
+        {"council": council, "url": "", "uprn": str(i)}
+        for i in range(10)
+        for council in ("CouncilA", "CouncilB")
+    ]
+    results = list(
+        run_batch(lookups, max_workers=4, per_council_limit=2, lookup_func=fake_lookup)
+    )
+
+    assert len(results) == 20
+    assert sorted(r["index"] for r in results) == list(range(20))
+    assert all(r["status"] == "ok" for r in results)
+    assert peaks["CouncilA"] <= 2 and peaks["CouncilB"] <= 2
+    assert mock_import.call_count == 2
+
+
+@patch("uk_bin_collection.batch.import_council_module")
+def test_run_batch_reports_errors(mock_import):
+    def fake_import(name):
+        if name == "Missing":
+            raise ModuleNotFoundError(name)
+
+    mock_import.side_effect = fake_import
+
+    def fake_lookup(council, url, **kwargs):
+        if kwargs.get("uprn") == "bad":
+            raise ValueError("boom")
+        return {"bins": []}
+
+    lookups = [
+        {"council": "CouncilA", "url": "", "uprn": "good"},
+        {"council": "CouncilA", "url": "", "uprn": "bad"},
+        {"council": "Missing", "url": ""},
+    ]
+    results = {
+        r["index"]: r for r in run_batch(lookups, lookup_func=fake_lookup)
+    }
+
+    assert results[0] == {
+        "index": 0,
+        "council": "CouncilA",
+        "url": "",
+        "uprn": "good",
+        "status": "ok",
+        "data": {"bins": []},
+    }
+    assert results[1]["status"] == "error" and results[1]["error"] == "boom"
+    assert results[2]["status"] == "error" and results[2]["error"] == "Missing"
+
+
+@patch("uk_bin_collection.batch.import_council_module")
+def test_run_batch_applies_defaults(mock_import):
+    calls = []
+
+    def fake_lookup(council, url, **kwargs):
+        calls.append(kwargs)
+        return {"bins": []}
+
+    lookups = [{"council": "CouncilA", "url": "", "web_driver": "http://row:4444"}]
+    list(
+        run_batch(
+            lookups,
+            defaults={"web_driver": "http://default:4444", "headless": True},
+            lookup_func=fake_lookup,
+        )
+    )
+    assert calls == [{"web_driver": "http://row:4444", "headless": True}]
+
+
+def test_run_batch_invalid_limits():
+    with pytest.raises(ValueError):
+        list(run_batch([], max_workers=0))
+
+
+def test_write_jsonl_counts_failures():
+    stream = io.StringIO()
+    failures = write_jsonl(
+        [{"index": 0, "status": "ok"}, {"index": 1, "status": "error"}], stream
+    )
+    assert failures == 1
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line)["index"] for line in lines] == [0, 1]
+
+
+@patch("uk_bin_collection.batch.run_batch")
+def test_main_writes_jsonl(mock_run_batch, tmp_path):
+    input_file = tmp_path / "lookups.csv"
+    input_file.write_text("council,url,uprn\nCouncilA,https://a.example,1\n")
+    output_file = tmp_path / "results.jsonl"
+    mock_run_batch.return_value = iter(
+        [{"index": 0, "council": "CouncilA", "status": "ok", "data": {"bins": []}}]
+    )
+
+    exit_code = main(
+        [
+            str(input_file),
+            "-o",
+            str(output_file),
+            "--workers",
+            "2",
+            "-w",
+            "http://s:4444",
+            "--no-cache",
+        ]
+    )
+
+    assert exit_code == 0
+    args, kwargs = mock_run_batch.call_args
+    assert kwargs["max_workers"] == 2
+    assert kwargs["defaults"] == {
+        "headless": True,
+        "local_browser": False,
+        "web_driver": "http://s:4444",
+    }
+    assert json.loads(output_file.read_text())["status"] == "ok"
+
+
+@patch("uk_bin_collection.batch.run_batch")
+def test_main_uses_result_cache(mock_run_batch, tmp_path):
+    input_file = tmp_path / "lookups.jsonl"
+    input_file.write_text('{"council": "CouncilA", "uprn": "1"}\n')
+    cache_path = str(tmp_path / "results.sqlite3")
+    mock_run_batch.return_value = iter([])
+
+    main(
+        [
+            str(input_file),
+            "-o",
+            str(tmp_path / "out.jsonl"),
+            "--cache-path",
+            cache_path,
+            "--cache-ttl",
+            "2",
+            "--refresh",
+        ]
+    )
+
+    args, kwargs = mock_run_batch.call_args
+    assert kwargs["defaults"]["result_cache"].path == cache_path
+    assert kwargs["defaults"]["result_cache"].ttl == 7200
+    assert kwargs["defaults"]["refresh"] is True
+
+
+@patch("uk_bin_collection.batch.run_batch")
+def test_main_without_writable_cache(mock_run_batch, tmp_path):
+    input_file = tmp_path / "lookups.jsonl"
+    input_file.write_text('{"council": "CouncilA", "uprn": "1"}\n')
+    mock_run_batch.return_value = iter([])
+
+    exit_code = main(
+        [
+            str(input_file),
+            "-o",
+            str(tmp_path / "out.jsonl"),
+            "--cache-path",
+            str(tmp_path / "missing" / "results.sqlite3"),
+        ]
+    )
+
+    assert exit_code == 0
+    assert "result_cache" not in mock_run_batch.call_args.kwargs["defaults"]
@@ -0,0 +1,205 @@
+import json
+import os
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from uk_bin_collection.cache import (
+    ResultCache,
+    default_cache_path,
+    get_cache_dir,
+    make_cache_key,
+    next_refresh_time,
+    open_result_cache,
+)
+
+BIN_DATA = {"bins": [{"type": "Refuse", "collectionDate": "01/01/2024"}]}
+
+
+@pytest.fixture
+def result_cache():
+    cache = ResultCache(":memory:", ttl=60)
+    yield cache
+    cache.close()
+
+
+def test_get_cache_dir_uses_xdg(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    cache_dir = get_cache_dir()
+    assert cache_dir == os.path.join(str(tmp_path), "uk_bin_collection")
+    assert os.path.isdir(cache_dir)
+
+
+def test_default_cache_path_env_override(monkeypatch):
+    monkeypatch.setenv("UKBC_CACHE_PATH", "/tmp/custom.sqlite3")
+    assert default_cache_path() == "/tmp/custom.sqlite3"
+
+
+def test_open_result_cache_unwritable(tmp_path, monkeypatch):
+    monkeypatch.delenv("UKBC_CACHE_PATH", raising=False)
+    with patch("os.makedirs", side_effect=PermissionError("read-only")):
+        assert open_result_cache() is None
+    assert open_result_cache(str(tmp_path / "missing" / "results.sqlite3")) is None
+
+
+def test_open_result_cache(tmp_path):
+    result_cache = open_result_cache(str(tmp_path / "results.sqlite3"), ttl=60)
+    assert result_cache.ttl == 60
+    result_cache.close()
+
+
+def test_make_cache_key_normalises_postcode():
+    first = make_cache_key("Council", "http://a", postcode="ab1 2cd", uprn=1)
+    second = make_cache_key("Council", "http://a", postcode="AB12CD ", uprn="1")
+    assert first == second
+    assert json.loads(first) == ["Council", "http://a", "1", "", "AB12CD", ""]
+
+
+def test_make_cache_key_ignores_unrelated_kwargs():
+    assert make_cache_key("Council", "http://a", uprn="1") == make_cache_key(
+        "Council", "http://a", uprn="1", headless=True, web_driver=None
+    )
+    assert make_cache_key("Council", "http://a", uprn="1") != make_cache_key(
+        "Other", "http://a", uprn="1"
+    )
+
+
+def test_result_cache_set_get(result_cache):
+    assert result_cache.get("key") is None
+    result_cache.set("key", BIN_DATA)
+    assert result_cache.get("key") == BIN_DATA
+    assert len(result_cache) == 1
+
+
+def test_result_cache_expiry(result_cache):
+    with patch("uk_bin_collection.cache.time.time", return_value=1000):
+        result_cache.set("key", BIN_DATA)
+    with patch("uk_bin_collection.cache.time.time", return_value=1059):
+        assert result_cache.get("key") == BIN_DATA
+    with patch("uk_bin_collection.cache.time.time", return_value=1060):
+        assert result_cache.get("key") is None
+    assert len(result_cache) == 0
+
+
+def test_result_cache_custom_ttl(result_cache):
+    with patch("uk_bin_collection.cache.time.time", return_value=1000):
+        result_cache.set("key", BIN_DATA, ttl=5)
+    with patch("uk_bin_collection.cache.time.time", return_value=1006):
+        assert result_cache.get("key") is None
+
+
+def test_result_cache_lru_entry_cap():
+    cache = ResultCache(":memory:", max_entries=2)
+    with patch("uk_bin_collection.cache.time.time", side_effect=range(1, 100)):
+        cache.set("a", BIN_DATA)
+        cache.set("b", BIN_DATA)
+        cache.get("a")
+        cache.set("c", BIN_DATA)
+        assert cache.get("b") is None
+        assert cache.get("a") == BIN_DATA
+        assert cache.get("c") == BIN_DATA
+
+
+def test_result_cache_size_cap():
+    payload_size = len(json.dumps(BIN_DATA, separators=(",", ":")))
+    cache = ResultCache(":memory:", max_bytes=payload_size * 2)
+    with patch("uk_bin_collection.cache.time.time", side_effect=range(1, 100)):
+        cache.set("a", BIN_DATA)
+        cache.set("b", BIN_DATA)
+        cache.set("c", BIN_DATA)
+        assert len(cache) == 2
+        assert cache.get("a") is None
+
+
+def test_result_cache_delete_and_clear(result_cache):
+    result_cache.set("a", BIN_DATA)
+    result_cache.set("b", BIN_DATA)
+    result_cache.delete("a")
+    assert result_cache.get("a") is None
+    result_cache.clear()
+    assert len(result_cache) == 0
+
+
+def test_result_cache_persists_to_disk(tmp_path):
+    path = str(tmp_path / "results.sqlite3")
+    cache = ResultCache(path)
+    cache.set("key", BIN_DATA)
+    cache.close()
+
+    reopened = ResultCache(path)
+    assert reopened.get("key") == BIN_DATA
+    reopened.close()
+
+
+def test_next_refresh_time_day_after_earliest_upcoming():
+    bin_data = {
+        "bins": [
+            {"type": "Old", "collectionDate": "01/01/2024"},
+            {"type": "Refuse", "collectionDate": "12/01/2024"},
+            {"type": "Recycling", "collectionDate": "10/01/2024"},
+            {"type": "Bad", "collectionDate": "not a date"},
+        ]
+    }
+    refresh_at = next_refresh_time(bin_data, now=datetime(2024, 1, 5, 9), jitter=0)
+    assert refresh_at == datetime(2024, 1, 11)
+
+
+def test_next_refresh_time_today_collection():
+    bin_data = {"bins": [{"type": "Refuse", "collectionDate": "05/01/2024"}]}
+    refresh_at = next_refresh_time(bin_data, now=datetime(2024, 1, 5, 9), jitter=0)
+    assert refresh_at == datetime(2024, 1, 6)
+
+
+def test_next_refresh_time_jitter():
+    bin_data = {"bins": [{"type": "Refuse", "collectionDate": "10/01/2024"}]}
+    with patch("uk_bin_collection.cache.random.uniform", return_value=3600) as jitter:
+        refresh_at = next_refresh_time(bin_data, now=datetime(2024, 1, 5), jitter=7200)
+    jitter.assert_called_once_with(0, 7200)
+    assert refresh_at == datetime(2024, 1, 11, 1)
+
+
+def test_next_refresh_time_no_upcoming():
+    bin_data = {"bins": [{"type": "Refuse", "collectionDate": "01/01/2024"}]}
+    assert next_refresh_time(bin_data, now=datetime(2024, 1, 5)) is None
+    assert next_refresh_time({}, now=datetime(2024, 1, 5)) is None
+
+
+def test_result_cache_expires_after_next_collection():
+    cache = ResultCache(":memory:", ttl=7 * 24 * 60 * 60)
+    bin_data = {"bins": [{"type": "Refuse", "collectionDate": "06/01/2024"}]}
+    now = datetime(2024, 1, 5, 12).timestamp()
+    stale_from = datetime(2024, 1, 7).timestamp()
+
+    with patch("uk_bin_collection.cache.time.time", return_value=now), patch(
+        "uk_bin_collection.cache.random.uniform", return_value=0
+    ):
+        cache.set("key", bin_data)
+    with patch("uk_bin_collection.cache.time.time", return_value=stale_from - 1):
+        assert cache.get("key") == bin_data
+    with patch("uk_bin_collection.cache.time.time", return_value=stale_from):
+        assert cache.get("key") is None
+
+
+def test_result_cache_ttl_caps_collection_expiry():
+    cache = ResultCache(":memory:", ttl=60)
+    bin_data = {"bins": [{"type": "Refuse", "collectionDate": "06/01/2024"}]}
+    now = datetime(2024, 1, 5, 12).timestamp()
+
+    with patch("uk_bin_collection.cache.time.time", return_value=now):
+        cache.set("key", bin_data)
+    with patch("uk_bin_collection.cache.time.time", return_value=now + 60):
+        assert cache.get("key") is None
+
+
+def test_result_cache_collection_expiry_disabled():
+    cache = ResultCache(":memory:", ttl=7 * 24 * 60 * 60, expire_after_collection=False)
+    bin_data = {"bins": [{"type": "Refuse", "collectionDate": "06/01/2024"}]}
+    now = datetime(2024, 1, 5, 12).timestamp()
+
+    with patch("uk_bin_collection.cache.time.time", return_value=now):
+        cache.set("key", bin_data)
+    with patch(
+        "uk_bin_collection.cache.time.time",
+        return_value=datetime(2024, 1, 8).timestamp(),
+    ):
+        assert cache.get("key") == bin_data
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 import argparse
 import pytest
 from uk_bin_collection.collect_data import UKBinCollectionApp, import_council_module
@@ -25,6 +25,10 @@ def test_setup_arg_parser():
         "headless",
         "local_browser",
         "dev_mode",
+        "cache",
+        "refresh",
+        "cache_ttl",
+        "cache_path",
     ]
     assert all(arg in arg_names for arg in expected_args)
 
@@ -70,3 +74,101 @@ def test_run_function(mock_app_run, mock_setup_logging):
     # Ensure logging was set up and the app run method was called
     mock_setup_logging.assert_called_once()
     mock_app_run.assert_called_once()
+
+
+@patch("uk_bin_collection.collect_data.import_council_module")
+def test_collect_bin_data(mock_import):
+    council = mock_import.return_value.CouncilClass.return_value
+    council.get_and_parse_data_cached.return_value = {"bins": []}
+
+    from uk_bin_collection.collect_data import collect_bin_data
+
+    result = collect_bin_data("council_module", "http://example.com", uprn="1")
+
+    assert result == {"bins": []}
+    council.get_and_parse_data_cached.assert_called_once_with(
+        "http://example.com",
+        uprn="1",
+        council_module_str="council_module",
+        web_driver=None,
+    )
+
+
+@patch("uk_bin_collection.uk_bin_collection.batch.main", return_value=0)
+@patch("uk_bin_collection.collect_data.setup_logging")
+@patch("sys.argv", ["uk_bin_collection.py", "batch", "lookups.csv"])
+def test_run_function_batch(mock_setup_logging, mock_batch_main):
+    from uk_bin_collection.collect_data import run
+
+    with pytest.raises(SystemExit) as exc_info:
+        run()
+
+    assert exc_info.value.code == 0
+    mock_batch_main.assert_called_once_with(["lookups.csv"])
+
+
+@patch("uk_bin_collection.collect_data.import_council_module")
+def test_supports_async(mock_import):
+    mock_import.return_value.CouncilClass.supports_async.return_value = True
+    app = UKBinCollectionApp()
+    app.set_args(["council_module", "http://example.com"])
+
+    assert app.supports_async is True
+    assert app.supports_async is True
+    mock_import.assert_called_once_with("council_module")
+
+
+@patch("uk_bin_collection.collect_data.import_council_module")
+async def test_async_run(mock_import):
+    council = mock_import.return_value.CouncilClass.return_value
+    council.async_template_method = AsyncMock(return_value='{"bins": []}')
+    app = UKBinCollectionApp()
+    app.set_args(["council_module", "http://example.com", "-u", "1", "--no-cache"])
+
+    result = await app.async_run(http_session="session")
+
+    assert result == '{"bins": []}'
+    args, kwargs = council.async_template_method.call_args
+    assert args == ("http://example.com",)
+    assert kwargs["uprn"] == "1"
+    assert kwargs["council_module_str"] == "council_module"
+    assert kwargs["http_session"] == "session"
+
+
+def test_get_result_cache(tmp_path):
+    cache_path = str(tmp_path / "results.sqlite3")
+    app = UKBinCollectionApp()
+    app.set_args(
+        ["council_module", "http://example.com", "--cache-path", cache_path, "--cache-ttl", "2"]
+    )
+
+    result_cache = app.get_result_cache()
+
+    assert result_cache.path == cache_path
+    assert result_cache.ttl == 7200
+    assert app.get_result_cache() is result_cache
+    assert app.council_kwargs()["result_cache"] is result_cache
+    assert app.council_kwargs()["refresh"] is False
+
+
+def test_get_result_cache_unavailable(tmp_path):
+    app = UKBinCollectionApp()
+    app.set_args(
+        [
+            "council_module",
+            "http://example.com",
+            "--cache-path",
+            str(tmp_path / "missing" / "results.sqlite3"),
+        ]
+    )
+
+    assert app.get_result_cache() is None
+    assert app.council_kwargs()["result_cache"] is None
+
+
+@pytest.mark.parametrize("flag", ["--no-cache", "--dev_mode"])
+def test_get_result_cache_disabled(flag):
+    app = UKBinCollectionApp()
+    app.set_args(["council_module", "http://example.com", flag])
+
+    assert app.get_result_cache() is None
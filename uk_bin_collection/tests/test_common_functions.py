@@ -1,14 +1,48 @@
+import os
+import subprocess
+import sys
 from contextlib import redirect_stdout
 from io import StringIO
 from unittest import mock
 from unittest.mock import MagicMock, mock_open, patch
 
+import pandas as pd
 import pytest
+import requests
 from selenium.common.exceptions import WebDriverException
 from uk_bin_collection.common import *
 from urllib3.exceptions import MaxRetryError
 
 
+HEAVY_DEPENDENCIES = ("pandas", "holidays", "selenium", "webdriver_manager", "dateutil")
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def test_common_import_defers_heavy_dependencies():
+    code = (
+        "import sys\n"
+        "import uk_bin_collection.uk_bin_collection.common\n"
+        f"print(','.join(m for m in {HEAVY_DEPENDENCIES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_common_lazy_attributes():
+    import uk_bin_collection.common as common
+
+    assert common.pd is pd
+    assert common.parse("2024-01-01") == datetime(2024, 1, 1)
+    with pytest.raises(AttributeError):
+        common.not_a_dependency
+
+
 def test_check_postcode_valid():
     valid_postcode = "SW1A 1AA"
     result = check_postcode(valid_postcode)
@@ -88,6 +122,13 @@ def test_parse_header():
     assert type(result) is dict
 
 
+@pytest.fixture(autouse=True)
+def fresh_holiday_cache():
+    clear_holiday_cache()
+    yield
+    clear_holiday_cache()
+
+
 # Mock data for holidays
 mock_holidays = {
     datetime(2023, 1, 1): "New Year's Day",
@@ -114,7 +155,7 @@ def test_is_holiday_when_false(mock_holidays_func):
     assert is_holiday(datetime(2023, 1, 2), Region.ENG) is False
 
 
-def holiday_effect(country_code, subdiv=None):
+def holiday_effect(country_code, subdiv=None, **kwargs):
     if subdiv == "ENG":
         return {
             datetime(2023, 12, 25): "Christmas Day",
@@ -160,6 +201,31 @@ def test_get_next_working_day():
     assert next_working_day == datetime(2024, 12, 9)
 
 
+def test_get_next_working_day_skips_holidays_across_year_end():
+    # Christmas Day, Boxing Day, a weekend and New Year's Day in a row
+    assert get_next_working_day(datetime(2021, 12, 25)) == datetime(2021, 12, 29)
+    assert get_next_working_day(datetime(2022, 12, 31)) == datetime(2023, 1, 3)
+
+
+@patch("holidays.country_holidays", side_effect=holiday_effect)
+def test_holiday_lookups_are_cached(mock_holidays_func):
+    for day in range(1, 31):
+        is_working_day(datetime(2023, 11, day), Region.SCT)
+    get_next_working_day(datetime(2023, 11, 30), Region.SCT)
+    mock_holidays_func.assert_called_once_with("GB", subdiv="SCT", years=2023)
+
+    clear_holiday_cache()
+    assert is_holiday(datetime(2023, 11, 30), Region.SCT) is True
+    assert mock_holidays_func.call_count == 2
+
+
+def test_get_holiday_ordinals():
+    ordinals = get_holiday_ordinals(Region.ENG, 2024)
+    assert type(ordinals) is frozenset
+    assert datetime(2024, 12, 25).toordinal() in ordinals
+    assert get_holiday_ordinals(Region.ENG, 2024) is ordinals
+
+
 def test_remove_alpha_characters():
     test_string = "12345abc12345"
     result = remove_alpha_characters(test_string)
@@ -219,7 +285,56 @@ def test_get_next_occurrence_from_day_month_false():
 
 def test_get_next_occurrence_from_day_month_true():
     result = get_next_occurrence_from_day_month(datetime(2023, 1, 1))
-    assert result == pd.Timestamp("2024-01-01 00:00:00")
+    assert result == datetime(2024, 1, 1, 0, 0)
+    assert type(result) is datetime
+
+
+def test_add_years():
+    assert add_years(datetime(2023, 3, 1, 7, 30), 1) == datetime(2024, 3, 1, 7, 30)
+    assert add_years(datetime(2024, 2, 29), 1) == datetime(2025, 2, 28)
+    assert add_years(datetime(2024, 2, 29), 4) == datetime(2028, 2, 29)
+
+
+def test_iter_weekday_dates_is_lazy():
+    dates = iter_weekday_dates(datetime(2023, 2, 22), 5)
+    assert next(dates) == datetime(2023, 2, 25)
+    assert next(dates) == datetime(2023, 3, 4)
+
+
+def test_iter_weekday_dates_invalid_day():
+    with pytest.raises(ValueError):
+        iter_weekday_dates(datetime(2023, 2, 22), 7)
+
+
+def test_iter_dates_every_x_days_invalid_step():
+    with pytest.raises(ValueError):
+        next(iter_dates_every_x_days(datetime(2023, 2, 22), 0))
+
+
+@pytest.mark.parametrize("day_of_week", range(7))
+@pytest.mark.parametrize(
+    "start", [datetime(2023, 2, 25, 7, 7, 17), datetime(2024, 2, 26), datetime(2023, 12, 31)]
+)
+def test_get_weekday_dates_in_period_matches_pandas(start, day_of_week):
+    expected = (
+        pd.date_range(
+            start=start, freq=f"W-{calendar.day_abbr[day_of_week]}", periods=10
+        )
+        .strftime(date_format)
+        .tolist()
+    )
+    assert get_weekday_dates_in_period(start, day_of_week, 10) == expected
+
+
+@pytest.mark.parametrize("step", [1, 5, 7, 14, 21])
+def test_get_dates_every_x_days_matches_pandas(step):
+    start = datetime(2024, 2, 20, 7, 7, 17)
+    expected = (
+        pd.date_range(start=start, freq=f"{step}D", periods=10)
+        .strftime(date_format)
+        .tolist()
+    )
+    assert get_dates_every_x_days(start, step, 10) == expected
 
 
 @patch("uk_bin_collection.common.load_data", return_value={})
@@ -463,3 +578,319 @@ def test_get_next_day_of_week(today_str, day_name, expected):
         mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
         result = get_next_day_of_week(day_name, date_format="%m/%d/%Y")
         assert result == expected
+
+
+@pytest.fixture
+def chromedriver_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    driver = tmp_path / "chromedriver"
+    driver.write_text("")
+    clear_chromedriver_cache()
+    with patch("webdriver_manager.chrome.ChromeDriverManager") as mock_manager:
+        mock_manager.return_value.install.return_value = str(driver)
+        yield mock_manager
+    clear_chromedriver_cache()
+
+
+@patch("uk_bin_collection.common.get_chrome_stamp", return_value="chrome:1")
+def test_get_chromedriver_path_is_memoised(mock_stamp, chromedriver_cache):
+    path = get_chromedriver_path()
+
+    assert get_chromedriver_path() == path
+    chromedriver_cache.return_value.install.assert_called_once()
+    mock_stamp.assert_called_once()
+
+
+@patch("uk_bin_collection.common.get_chrome_stamp", return_value="chrome:1")
+def test_get_chromedriver_path_persisted(mock_stamp, chromedriver_cache):
+    path = get_chromedriver_path()
+
+    # A new process with the same Chrome reuses the saved path
+    uk_bin_collection_common = sys.modules[get_chromedriver_path.__module__]
+    uk_bin_collection_common._chromedriver_path = None
+    assert get_chromedriver_path() == path
+    chromedriver_cache.return_value.install.assert_called_once()
+
+    # Upgrading Chrome resolves the driver again
+    uk_bin_collection_common._chromedriver_path = None
+    mock_stamp.return_value = "chrome:2"
+    assert get_chromedriver_path() == path
+    assert chromedriver_cache.return_value.install.call_count == 2
+
+
+@patch("uk_bin_collection.common.get_chrome_stamp", return_value="chrome:1")
+def test_get_chromedriver_path_without_cache_dir(mock_stamp, chromedriver_cache):
+    with patch(
+        "uk_bin_collection.uk_bin_collection.cache.get_cache_dir",
+        side_effect=PermissionError("read-only"),
+    ):
+        path = get_chromedriver_path()
+        clear_chromedriver_cache()
+        assert get_chromedriver_path() == path
+
+    assert chromedriver_cache.return_value.install.call_count == 2
+
+
+def test_get_chrome_stamp(tmp_path, monkeypatch):
+    chrome = tmp_path / "google-chrome"
+    chrome.write_text("#!/bin/sh\n")
+    chrome.chmod(0o755)
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    stamp = get_chrome_stamp()
+
+    assert stamp.startswith(f"{chrome}:")
+    monkeypatch.setenv("PATH", "")
+    assert get_chrome_stamp() is None
+
+
+def test_create_webdriver_light_profile():
+    with mock.patch("uk_bin_collection.common.webdriver.Remote") as mock_remote:
+        driver = create_webdriver(
+            web_driver="http://localhost:4444/wd/hub", profile="light"
+        )
+
+    options = mock_remote.call_args.kwargs["options"]
+    assert options.page_load_strategy == "eager"
+    assert "--window-size=1280,800" in options.arguments
+    assert (
+        options.experimental_options["prefs"][
+            "profile.managed_default_content_settings.images"
+        ]
+        == 2
+    )
+    driver.execute_cdp_cmd.assert_any_call("Network.enable", {})
+    driver.execute_cdp_cmd.assert_any_call(
+        "Network.setBlockedURLs", {"urls": BROWSER_PROFILES["light"]["blocked_urls"]}
+    )
+
+
+def test_create_webdriver_default_profile_blocks_nothing():
+    with mock.patch("uk_bin_collection.common.webdriver.Remote") as mock_remote:
+        driver = create_webdriver(web_driver="http://localhost:4444/wd/hub")
+
+    options = mock_remote.call_args.kwargs["options"]
+    assert "--window-size=1920,1080" in options.arguments
+    assert "prefs" not in options.experimental_options
+    driver.execute_cdp_cmd.assert_not_called()
+
+
+def test_create_webdriver_profile_from_council():
+    with mock.patch(
+        "uk_bin_collection.common.get_council_browser_profile", return_value="minimal"
+    ) as mock_profile, mock.patch(
+        "uk_bin_collection.common.webdriver.Remote"
+    ) as mock_remote:
+        create_webdriver("http://localhost:4444/wd/hub", session_name="SomeCouncil")
+
+    mock_profile.assert_called_once_with("SomeCouncil")
+    options = mock_remote.call_args.kwargs["options"]
+    assert "*.css" in BROWSER_PROFILES["minimal"]["blocked_urls"]
+    assert options.page_load_strategy == "eager"
+
+
+def test_create_webdriver_unknown_profile():
+    with pytest.raises(ValueError):
+        create_webdriver("http://localhost:4444/wd/hub", profile="nonexistent")
+
+
+def test_execute_cdp_cmd_on_remote_driver():
+    driver = MagicMock(spec=["command_executor", "execute"])
+    driver.execute.return_value = {"value": {}}
+
+    assert execute_cdp_cmd(driver, "Network.enable", {}) == {}
+    driver.command_executor.add_command.assert_called_once_with(
+        "executeCdpCommand", "POST", "/session/$sessionId/goog/cdp/execute"
+    )
+    driver.execute.assert_called_once_with(
+        "executeCdpCommand", {"cmd": "Network.enable", "params": {}}
+    )
+
+
+RENDERFORM_PAGE = b"""<html><head><title>Bins</title></head><body>
+<form>
+<input name="__RequestVerificationToken" type="hidden" value="abc123" />
+<input name="FormGuid" type="hidden" value="d1e2f3" />
+<input name="Empty" type="hidden" />
+</form>
+<div class="resirow"><div class="col Refuse"></div><div style="width:360px;">Monday 6 January 2025</div></div>
+<p>Unrelated <b>content</b></p>
+<div class="resirow"><div class="col Recycling"></div><div style="width:360px;">Monday 13 January 2025</div></div>
+</body></html>"""
+
+
+def test_get_html_parser():
+    assert get_html_parser() == "lxml"
+
+
+def test_make_soup_with_strainer():
+    from bs4 import SoupStrainer
+
+    soup = make_soup(RENDERFORM_PAGE, parse_only=SoupStrainer("div", class_="resirow"))
+    rows = soup.find_all("div", class_="resirow")
+
+    assert [row.find("div", class_="col").get("class")[1] for row in rows] == [
+        "Refuse",
+        "Recycling",
+    ]
+    assert soup.find("p") is None
+    assert soup.find("input") is None
+
+
+def test_make_soup_with_tag_names():
+    soup = make_soup(RENDERFORM_PAGE, parse_only=["input"])
+
+    assert len(soup.find_all("input")) == 3
+    assert soup.find("div") is None
+
+
+def test_make_soup_full_tree_matches_html_parser():
+    from bs4 import BeautifulSoup
+
+    expected = BeautifulSoup(RENDERFORM_PAGE, features="html.parser")
+    soup = make_soup(RENDERFORM_PAGE)
+
+    assert soup.get_text() == expected.get_text()
+
+
+def test_html_xpath():
+    dates = html_xpath(RENDERFORM_PAGE, "//div[@style='width:360px;']/text()")
+
+    assert dates == ["Monday 6 January 2025", "Monday 13 January 2025"]
+    assert html_xpath("", "//div") == []
+
+
+def test_get_input_values():
+    values = get_input_values(
+        RENDERFORM_PAGE, "__RequestVerificationToken", "FormGuid", "Empty", "Missing"
+    )
+
+    assert values == {
+        "__RequestVerificationToken": "abc123",
+        "FormGuid": "d1e2f3",
+        "Empty": "",
+        "Missing": None,
+    }
+
+
+BIG_PAGE = (
+    b"<html><body><div class='results'><table id='bins'><tr><td>Refuse</td></tr>"
+    b"</table></div>" + b"<p>Unrelated content</p>" * 20000 + b"</body></html>"
+)
+
+
+def make_streamed_response(body, chunk_size=1024):
+    response = requests.Response()
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+    response.iter_content = MagicMock(side_effect=lambda size: iter(chunks))
+    response.close = MagicMock()
+    response.encoding = "utf-8"
+    return response
+
+
+@pytest.mark.parametrize(
+    "selector", ["table#bins", "#bins", "div.results", "table", "td"]
+)
+def test_html_stream_target(selector):
+    target = HTMLStreamTarget(selector)
+
+    assert target.feed(BIG_PAGE[:200])
+    assert target.found
+
+
+def test_html_stream_target_not_found():
+    target = HTMLStreamTarget("table#missing")
+
+    assert not target.feed(BIG_PAGE[:200])
+    assert not target.feed(BIG_PAGE[200:])
+
+
+@pytest.mark.parametrize("selector", ["", "table > tr", "div.a.b", "[id=bins]"])
+def test_html_stream_target_unsupported_selector(selector):
+    with pytest.raises(ValueError):
+        HTMLStreamTarget(selector)
+
+
+def test_read_html_until_stops_early():
+    response = make_streamed_response(BIG_PAGE)
+
+    assert read_html_until(response, "table#bins", chunk_size=1024)
+
+    response.close.assert_called_once()
+    assert len(response.content) < 1024 * 2 < len(BIG_PAGE)
+    assert BIG_PAGE.startswith(response.content)
+    assert "Refuse" in response.text
+    assert html_xpath(response.content, "//table[@id='bins']//td/text()") == ["Refuse"]
+
+
+def test_read_html_until_reads_whole_page_when_missing():
+    response = make_streamed_response(BIG_PAGE)
+
+    assert not read_html_until(response, "table#missing")
+
+    assert response.content == BIG_PAGE
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("06/01/2025", date(2025, 1, 6)),
+        ("29/02/2024", date(2024, 2, 29)),
+        ("6/1/2025", date(2025, 1, 6)),
+    ],
+)
+def test_parse_collection_date(value, expected):
+    assert parse_collection_date(value) == expected
+    assert parse_collection_date(value) == datetime.strptime(value, "%d/%m/%Y").date()
+
+
+@pytest.mark.parametrize(
+    "value", ["31/02/2025", "2025-01-06", "06/13/2025", "aa/bb/cccc", "", "06/01/25"]
+)
+def test_parse_collection_date_invalid(value):
+    with pytest.raises(ValueError):
+        parse_collection_date(value)
+
+
+def test_format_collection_date():
+    assert format_collection_date(date(2025, 1, 6)) == "06/01/2025"
+    assert format_collection_date(datetime(987, 12, 25, 7, 30)) == "25/12/0987"
+
+
+def test_parse_and_format_collection_dates():
+    values = ["06/01/2025", "13/01/2025", "06/01/2025"]
+
+    dates = parse_collection_dates(values)
+
+    assert dates == [date(2025, 1, 6), date(2025, 1, 13), date(2025, 1, 6)]
+    assert format_collection_dates(iter(dates)) == values
+    assert parse_collection_dates([]) == []
+
+
+def test_parse_date_text_with_format():
+    clear_date_cache()
+
+    parsed = parse_date_text("Monday 6 January 2025", "%A %d %B %Y")
+
+    assert parsed == datetime(2025, 1, 6)
+    with mock.patch("uk_bin_collection.common.datetime") as mock_datetime:
+        assert parse_date_text("Monday 6 January 2025", "%A %d %B %Y") == parsed
+    mock_datetime.strptime.assert_not_called()
+    with pytest.raises(ValueError):
+        parse_date_text("Someday", "%A %d %B %Y")
+
+
+def test_parse_date_text_without_format(freezer):
+    clear_date_cache()
+    freezer.move_to("2024-03-01")
+
+    assert parse_date_text("01/02/2025", dayfirst=True) == datetime(2025, 2, 1)
+    assert parse_date_text("01/02/2025") == datetime(2025, 1, 2)
+    assert parse_date_text("Collection on 6 January", fuzzy=True) == datetime(
+        2024, 1, 6
+    )
+    # Missing parts come from today, so results are not reused on another day
+    freezer.move_to("2025-03-01")
+    assert parse_date_text("Collection on 6 January", fuzzy=True) == datetime(
+        2025, 1, 6
+    )
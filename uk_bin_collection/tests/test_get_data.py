@@ -8,6 +8,7 @@ from requests.models import Response
 from unittest.mock import patch
 from uk_bin_collection.get_bin_data import AbstractGetBinDataClass as agbdc
 from uk_bin_collection.get_bin_data import setup_logging
+from uk_bin_collection.cache import ResultCache
 import logging
 
 
@@ -83,7 +84,7 @@ def test_setup_logging_valid_config():
     assert logger.level == logging.DEBUG
 
 
-@mock.patch("requests.get", side_effect=mocked_requests_get)
+@mock.patch("requests.Session.get", side_effect=mocked_requests_get)
 def test_get_data(mock_get):
     page_data = agbdc.get_data("aurl")
     assert page_data.text == {"test_data": "test"}
@@ -92,13 +93,21 @@ def test_get_data(mock_get):
 @pytest.mark.parametrize(
     "url", ["HTTPError", "ConnectionError", "Timeout", "RequestException"]
 )
-@mock.patch("requests.get", side_effect=mocked_requests_get)
+@mock.patch("requests.Session.get", side_effect=mocked_requests_get)
 def test_get_data_error(mock_get, url):
     with pytest.raises(Exception) as exc_info:
         result = agbdc.get_data(url)
     assert exc_info.typename == url
 
 
+@mock.patch("requests.Session.get", side_effect=mocked_requests_get)
+def test_get_data_sends_headers(mock_get):
+    agbdc.get_data("aurl")
+    args, kwargs = mock_get.call_args
+    assert "User-Agent" in kwargs["headers"]
+    assert kwargs["verify"] is False
+
+
 def test_output_json():
     bin_data = {"bin": ""}
     output = agbdc.output_json(bin_data)
@@ -117,6 +126,16 @@ class ConcreteGetBinDataClass(agbdc):
         super().update_dev_mode_data(council_module_str, this_url, **kwargs)
 
 
+class AsyncConcreteGetBinDataClass(agbdc):
+    """Concrete implementation that scrapes natively with asyncio."""
+
+    def parse_data(self, page: str, **kwargs) -> dict:
+        raise AssertionError("parse_data should not be called")
+
+    async def async_parse_data(self, page: str, **kwargs) -> dict:
+        return {"bins": [{"type": "Refuse", "collectionDate": "01/01/2024"}]}
+
+
 @pytest.fixture
 def concrete_class_instance():
     return ConcreteGetBinDataClass()
@@ -210,3 +229,203 @@ def test_update_dev_mode_data(setup_test_update_dev_mode_data):
 
     # Example assertion - check if certain values exist in the file content (based on your actual file format)
     assert "100012345" in file_content  # Checking UPRN as an example
+
+
+def test_supports_async():
+    assert ConcreteGetBinDataClass.supports_async() is False
+    assert AsyncConcreteGetBinDataClass.supports_async() is True
+
+
+async def test_async_parse_data_defaults_to_parse_data(concrete_class_instance):
+    result = await concrete_class_instance.async_parse_data("page", url="http://a")
+    assert result == {"mock_key": "mock_value"}
+
+
+async def test_async_get_data_without_aiohttp():
+    with mock.patch.dict("sys.modules", {"aiohttp": None}):
+        with pytest.raises(ImportError, match=r"uk_bin_collection\[async\]"):
+            await agbdc.async_get_data("http://example.com")
+
+
+class PageTextGetBinDataClass(agbdc):
+    """A council written against get_data, like the council template."""
+
+    def parse_data(self, page, **kwargs) -> dict:
+        return {"bins": [{"type": page.text, "collectionDate": "01/01/2024"}]}
+
+
+async def test_async_get_and_parse_data_runs_sync_councils_in_thread():
+    obj = PageTextGetBinDataClass()
+    response = mock.Mock(text="Refuse")
+    with mock.patch.object(
+        obj, "get_data", return_value=response
+    ) as mock_get_data, mock.patch.object(
+        obj, "async_get_data", new=mock.AsyncMock()
+    ) as mock_async_get_data:
+        result = await obj.async_get_and_parse_data(
+            "http://example.com", http_session=object()
+        )
+        output = await obj.async_template_method("http://example.com")
+
+    assert mock_get_data.call_count == 2
+    mock_async_get_data.assert_not_awaited()
+    assert result == {"bins": [{"type": "Refuse", "collectionDate": "01/01/2024"}]}
+    assert output == obj.output_json(result)
+
+
+async def test_async_get_and_parse_data_no_skip_get_url():
+    obj = AsyncConcreteGetBinDataClass()
+    session = object()
+    with mock.patch.object(
+        obj,
+        "async_get_data",
+        new=mock.AsyncMock(return_value="mocked page content"),
+    ) as mock_get_data, mock.patch.object(
+        obj,
+        "async_parse_data",
+        new=mock.AsyncMock(return_value={"mock_key": "mock_value"}),
+    ) as mock_parse_data:
+        result = await obj.async_get_and_parse_data(
+            "http://example.com", http_session=session
+        )
+
+    mock_get_data.assert_awaited_once_with("http://example.com", session=session)
+    mock_parse_data.assert_awaited_once_with(
+        "mocked page content", url="http://example.com", http_session=session
+    )
+    assert result == {"mock_key": "mock_value"}
+
+
+async def test_async_template_method_skip_get_url():
+    obj = AsyncConcreteGetBinDataClass()
+    with mock.patch.object(obj, "async_get_data") as mock_get_data:
+        output = await obj.async_template_method(
+            "http://example.com", skip_get_url=True
+        )
+
+    mock_get_data.assert_not_called()
+    assert output == obj.output_json(
+        {"bins": [{"type": "Refuse", "collectionDate": "01/01/2024"}]}
+    )
+
+
+def test_get_and_parse_data_cached_without_cache(concrete_class_instance):
+    with mock.patch.object(
+        concrete_class_instance, "get_and_parse_data", return_value={"bins": []}
+    ) as mock_get_and_parse:
+        result = concrete_class_instance.get_and_parse_data_cached(
+            "http://example.com", uprn="1"
+        )
+
+    mock_get_and_parse.assert_called_once_with("http://example.com", uprn="1")
+    assert result == {"bins": []}
+
+
+def test_get_and_parse_data_cached_hit_and_refresh(concrete_class_instance):
+    result_cache = ResultCache(":memory:")
+    fresh = {"bins": [{"type": "Refuse", "collectionDate": "01/01/2024"}]}
+
+    with mock.patch.object(
+        concrete_class_instance, "get_and_parse_data", return_value=fresh
+    ) as mock_get_and_parse:
+        first = concrete_class_instance.get_and_parse_data_cached(
+            "http://example.com", result_cache=result_cache, uprn="1"
+        )
+        second = concrete_class_instance.get_and_parse_data_cached(
+            "http://example.com", result_cache=result_cache, uprn="1"
+        )
+        assert mock_get_and_parse.call_count == 1
+
+        concrete_class_instance.get_and_parse_data_cached(
+            "http://example.com", result_cache=result_cache, refresh=True, uprn="1"
+        )
+        assert mock_get_and_parse.call_count == 2
+
+    assert first == second == fresh
+
+
+def test_get_and_parse_data_cached_skips_empty_results(concrete_class_instance):
+    result_cache = ResultCache(":memory:")
+
+    with mock.patch.object(
+        concrete_class_instance, "get_and_parse_data", return_value={"bins": []}
+    ):
+        concrete_class_instance.get_and_parse_data_cached(
+            "http://example.com", result_cache=result_cache, uprn="1"
+        )
+
+    assert len(result_cache) == 0
+
+
+async def test_async_template_method_uses_cache():
+    obj = AsyncConcreteGetBinDataClass()
+    result_cache = ResultCache(":memory:")
+    cached = {"bins": [{"type": "Cached", "collectionDate": "02/01/2024"}]}
+    result_cache.set(obj.get_cache_key("http://example.com", uprn="1"), cached)
+
+    output = await obj.async_template_method(
+        "http://example.com", skip_get_url=True, uprn="1", result_cache=result_cache
+    )
+    assert output == obj.output_json(cached)
+
+    output = await obj.async_template_method(
+        "http://example.com",
+        skip_get_url=True,
+        uprn="1",
+        result_cache=result_cache,
+        refresh=True,
+    )
+    assert output == obj.output_json(
+        {"bins": [{"type": "Refuse", "collectionDate": "01/01/2024"}]}
+    )
+
+
+class StreamingGetBinDataClass(agbdc):
+    stream_until = "table#bins"
+
+    def parse_data(self, page, **kwargs):
+        return {"bins": []}
+
+
+STREAMED_PAGE = b"<table id='bins'><tr><td>Refuse</td></tr></table>" + b"<p>x</p>" * 5000
+
+
+@mock.patch("requests.Session.get")
+def test_get_data_streams_until_target(mock_get):
+    response = Response()
+    response.raw = mock.MagicMock()
+    response.raw.stream.return_value = iter(
+        [STREAMED_PAGE[:1024], STREAMED_PAGE[1024:]]
+    )
+    mock_get.return_value = response
+
+    page = StreamingGetBinDataClass.get_data("aurl")
+
+    assert mock_get.call_args.kwargs["stream"] is True
+    assert page.content == STREAMED_PAGE[:1024]
+    response.raw.close.assert_called_once()
+
+
+@mock.patch("requests.Session.get", side_effect=mocked_requests_get)
+def test_get_data_does_not_stream_by_default(mock_get):
+    agbdc.get_data("aurl")
+    assert "stream" not in mock_get.call_args.kwargs
+
+
+async def test_async_read_page_streams_until_target():
+    class Content:
+        def __init__(self):
+            self.chunks_read = 0
+
+        async def iter_chunked(self, size):
+            for start in range(0, len(STREAMED_PAGE), size):
+                self.chunks_read += 1
+                yield STREAMED_PAGE[start : start + size]
+
+    response = mock.MagicMock(content=Content(), charset=None)
+
+    text = await StreamingGetBinDataClass.async_read_page(response)
+
+    assert text.startswith("<table id='bins'>")
+    assert len(text) < len(STREAMED_PAGE)
+    assert response.content.chunks_read == 1
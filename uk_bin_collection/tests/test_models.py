@@ -0,0 +1,150 @@
+import asyncio
+import json
+from datetime import date, datetime
+
+import pytest
+from uk_bin_collection.uk_bin_collection.get_bin_data import AbstractGetBinDataClass
+from uk_bin_collection.uk_bin_collection.models import (
+    BinCollection,
+    BinSchedule,
+    BinScheduleIndex,
+    as_bin_data_dict,
+)
+
+LEGACY_DATA = {
+    "bins": [
+        {"type": "Recycling", "collectionDate": "13/01/2025"},
+        {"type": "Refuse", "collectionDate": "06/01/2025"},
+        {"type": "Garden", "collectionDate": "06/01/2025"},
+        {"type": "Refuse", "collectionDate": "20/01/2025"},
+    ]
+}
+
+
+def test_bin_collection():
+    collection = BinCollection("Refuse", datetime(2025, 1, 6, 7, 30))
+
+    assert collection.date == date(2025, 1, 6)
+    assert collection.to_dict() == {"type": "Refuse", "collectionDate": "06/01/2025"}
+    assert BinCollection.from_dict(collection.to_dict()) == collection
+    assert not hasattr(collection, "__dict__")
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"collectionDate": "06/01/2025"},
+        {"type": "Refuse"},
+        {"type": "Refuse", "collectionDate": "2025-01-06"},
+    ],
+)
+def test_bin_collection_from_invalid_dict(data):
+    with pytest.raises(ValueError):
+        BinCollection.from_dict(data)
+
+
+def test_schedule_is_sorted():
+    schedule = BinSchedule.from_dict(LEGACY_DATA)
+
+    assert [(c.type, c.date.day) for c in schedule] == [
+        ("Garden", 6),
+        ("Refuse", 6),
+        ("Recycling", 13),
+        ("Refuse", 20),
+    ]
+    schedule.add("Food", date(2025, 1, 1))
+    assert schedule[0] == BinCollection("Food", date(2025, 1, 1))
+    assert len(schedule) == 5
+    assert schedule.types() == ["Food", "Garden", "Recycling", "Refuse"]
+
+
+def test_schedule_round_trip():
+    schedule = BinSchedule.from_dict(LEGACY_DATA)
+
+    assert BinSchedule.from_dict(schedule.to_dict()) == schedule
+    assert schedule.to_dict()["bins"][0] == {
+        "type": "Garden",
+        "collectionDate": "06/01/2025",
+    }
+
+
+def test_schedule_next_collections():
+    schedule = BinSchedule.from_dict(LEGACY_DATA)
+
+    assert schedule.next_collections(date(2025, 1, 7)) == {
+        "Recycling": date(2025, 1, 13),
+        "Refuse": date(2025, 1, 20),
+    }
+    assert schedule.next_collections(date(2025, 2, 1)) == {}
+
+
+def test_schedule_skip_invalid():
+    data = {"bins": LEGACY_DATA["bins"] + [{"type": "Refuse", "collectionDate": "soon"}]}
+
+    with pytest.raises(ValueError):
+        BinSchedule.from_dict(data)
+    assert len(BinSchedule.from_dict(data, skip_invalid=True)) == 4
+
+
+def test_schedule_index():
+    index = BinScheduleIndex(BinSchedule.from_dict(LEGACY_DATA))
+
+    assert index.types() == ["Garden", "Recycling", "Refuse"]
+    assert len(index) == 4
+    assert "Refuse" in index and "Food" not in index
+    assert index.dates("Refuse") == [date(2025, 1, 6), date(2025, 1, 20)]
+    assert index.next("Refuse", date(2025, 1, 6)) == date(2025, 1, 6)
+    assert index.next("Refuse", date(2025, 1, 7)) == date(2025, 1, 20)
+    assert index.next("Refuse", date(2025, 1, 21)) is None
+    assert index.next("Food", date(2025, 1, 1)) is None
+    assert index.between("Refuse", date(2025, 1, 6), date(2025, 1, 20)) == [
+        date(2025, 1, 6),
+        date(2025, 1, 20),
+    ]
+    assert index.between("Refuse", date(2025, 1, 7), date(2025, 1, 19)) == []
+    assert index.after("Refuse", date(2025, 1, 6)) == [date(2025, 1, 20)]
+    assert index.after("Refuse", date(2025, 1, 1), limit=1) == [date(2025, 1, 6)]
+    assert len(BinScheduleIndex([BinCollection("Refuse", date(2025, 1, 6))] * 2)) == 1
+
+
+def test_schedule_index_next_collections():
+    schedule = BinSchedule.from_dict(LEGACY_DATA)
+    index = BinScheduleIndex(schedule)
+
+    for after in (date(2025, 1, 1), date(2025, 1, 7), date(2025, 2, 1)):
+        expected = schedule.next_collections(after)
+        assert index.next_collections(after) == expected
+        assert list(index.next_collections(after)) == list(expected)
+
+
+def test_as_bin_data_dict():
+    schedule = BinSchedule.from_dict(LEGACY_DATA)
+
+    assert as_bin_data_dict(schedule) == schedule.to_dict()
+    assert as_bin_data_dict(LEGACY_DATA) is LEGACY_DATA
+
+
+class ScheduleCouncil(AbstractGetBinDataClass):
+    def parse_data(self, page, **kwargs):
+        return BinSchedule.from_dict(LEGACY_DATA)
+
+
+def test_council_returning_schedule():
+    council = ScheduleCouncil()
+
+    result = council.get_and_parse_data_cached("url", skip_get_url=True)
+    output = council.template_method("url", skip_get_url=True)
+
+    assert result == BinSchedule.from_dict(LEGACY_DATA).to_dict()
+    assert json.loads(output) == result
+
+
+def test_get_and_parse_data_returns_dict():
+    council = ScheduleCouncil()
+    expected = BinSchedule.from_dict(LEGACY_DATA).to_dict()
+
+    assert council.get_and_parse_data("url", skip_get_url=True) == expected
+    assert (
+        asyncio.run(council.async_get_and_parse_data("url", skip_get_url=True))
+        == expected
+    )
@@ -0,0 +1,322 @@
+import json
+import types
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from uk_bin_collection.uk_bin_collection.get_bin_data import AbstractGetBinDataClass
+from uk_bin_collection.uk_bin_collection.recipes import (
+    RecipeError,
+    build_recipe,
+    capture_network,
+    load_recipe,
+    parse_performance_log,
+    record_council,
+    render,
+    run_recipe,
+    save_recipe,
+)
+
+FORM_PAGE = (
+    '<form><input name="__RequestVerificationToken" type="hidden" '
+    'value="tok3n-a1b2c3" /></form>'
+)
+RESULTS_PAGE = '{"bins": [{"type": "Refuse", "date": "01/01/2025"}]}'
+
+
+def log_entry(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+PERFORMANCE_LOG = [
+    log_entry(
+        "Network.requestWillBeSent",
+        requestId="1",
+        type="Document",
+        request={"method": "GET", "url": "https://bins.example.gov.uk/", "headers": {}},
+    ),
+    log_entry(
+        "Network.responseReceivedExtraInfo",
+        requestId="1",
+        headers={"Set-Cookie": "session=abc; Path=/"},
+    ),
+    log_entry(
+        "Network.responseReceived",
+        requestId="1",
+        response={"status": 200, "mimeType": "text/html"},
+    ),
+    log_entry(
+        "Network.requestWillBeSent",
+        requestId="2",
+        type="Script",
+        request={"method": "GET", "url": "https://bins.example.gov.uk/app.js"},
+    ),
+    log_entry(
+        "Network.responseReceived", requestId="2", response={"status": 200}
+    ),
+    log_entry(
+        "Network.requestWillBeSent",
+        requestId="3",
+        type="XHR",
+        request={"method": "GET", "url": "https://www.google-analytics.com/collect"},
+    ),
+    log_entry(
+        "Network.responseReceived", requestId="3", response={"status": 200}
+    ),
+    log_entry(
+        "Network.requestWillBeSent",
+        requestId="4",
+        type="XHR",
+        request={
+            "method": "POST",
+            "url": "https://bins.example.gov.uk/lookup?uprn=100012345678",
+            "headers": {
+                "Content-Type": "application/x-www-form-urlencoded",
+                "X-Requested-With": "XMLHttpRequest",
+                "Sec-Ch-Ua": "Chromium",
+            },
+            "postData": "postcode=AB1+2CD&__RequestVerificationToken=tok3n-a1b2c3",
+        },
+    ),
+    log_entry(
+        "Network.requestWillBeSentExtraInfo",
+        requestId="4",
+        associatedCookies=[
+            {"blockedReasons": [], "cookie": {"name": "session", "value": "abc"}},
+            {"blockedReasons": [], "cookie": {"name": "consent", "value": "yes"}},
+        ],
+    ),
+    log_entry(
+        "Network.responseReceived",
+        requestId="4",
+        response={"status": 200, "mimeType": "application/json"},
+    ),
+]
+LOOKUP = {"uprn": "100012345678", "postcode": "AB1 2CD"}
+
+
+def captured_requests():
+    logged = parse_performance_log(PERFORMANCE_LOG)
+    form, results = logged[0], logged[3]
+    form["body"] = FORM_PAGE
+    results["body"] = RESULTS_PAGE
+    return [form, results]
+
+
+def make_response(text, status_code=200):
+    response = MagicMock()
+    response.text = text
+    response.status_code = status_code
+    return response
+
+
+def test_parse_performance_log():
+    logged = parse_performance_log(PERFORMANCE_LOG)
+
+    assert [r["id"] for r in logged] == ["1", "2", "3", "4"]
+    assert logged[0]["set_cookies"] == ["session"]
+    assert logged[3]["method"] == "POST"
+    assert logged[3]["status"] == 200
+    assert logged[3]["cookies"] == {"session": "abc", "consent": "yes"}
+
+
+def test_capture_network_skips_assets_and_trackers():
+    driver = MagicMock()
+    driver.get_log.return_value = PERFORMANCE_LOG
+    driver.execute_cdp_cmd.side_effect = [
+        {"body": FORM_PAGE, "base64Encoded": False},
+        {"body": "eyJiaW5zIjogW119", "base64Encoded": True},
+    ]
+
+    captured = capture_network(driver)
+
+    driver.get_log.assert_called_once_with("performance")
+    assert [r["id"] for r in captured] == ["1", "4"]
+    assert captured[0]["body"] == FORM_PAGE
+    assert captured[1]["body"] == '{"bins": []}'
+
+
+def test_build_recipe():
+    recipe = build_recipe(captured_requests(), "ExampleCouncil", LOOKUP, recorded_bins=1)
+
+    assert recipe["council"] == "ExampleCouncil"
+    assert recipe["recorded_bins"] == 1
+    first, second = recipe["steps"]
+    assert first["url"] == "https://bins.example.gov.uk/"
+    assert "requestverificationtoken" in first["extract"]
+    assert second["url"] == "https://bins.example.gov.uk/lookup?uprn={{uprn}}"
+    assert second["data"] == (
+        "postcode={{postcode|url}}"
+        "&__RequestVerificationToken={{requestverificationtoken}}"
+    )
+    assert second["headers"] == {
+        "content-type": "application/x-www-form-urlencoded",
+        "x-requested-with": "XMLHttpRequest",
+    }
+    # The session cookie is set by the site; the consent cookie has to be sent
+    assert second["cookies"] == {"consent": "yes"}
+
+
+def test_render():
+    variables = {"postcode": "AB1 2CD"}
+
+    assert render("{{postcode}}/{{postcode|url}}", variables) == "AB1 2CD/AB1+2CD"
+    assert render("{{postcode|quote}}", variables) == "AB1%202CD"
+    assert render('{"a": {"b": 1}}', variables) == '{"a": {"b": 1}}'
+    with pytest.raises(RecipeError):
+        render("{{uprn}}", variables)
+
+
+def test_run_recipe_replays_with_extracted_tokens():
+    recipe = build_recipe(captured_requests(), "ExampleCouncil", LOOKUP)
+    session = MagicMock()
+    session.request.side_effect = [
+        make_response(FORM_PAGE.replace("tok3n-a1b2c3", "fresh-t0ken")),
+        make_response(RESULTS_PAGE),
+    ]
+
+    responses = run_recipe(recipe, session=session, uprn="200", postcode="ZZ9 9ZZ")
+
+    assert [r.text for r in responses][1] == RESULTS_PAGE
+    method, url = session.request.call_args.args
+    assert (method, url) == ("POST", "https://bins.example.gov.uk/lookup?uprn=200")
+    assert session.request.call_args.kwargs["data"] == (
+        b"postcode=ZZ9+9ZZ&__RequestVerificationToken=fresh-t0ken"
+    )
+    assert session.request.call_args.kwargs["cookies"] == {"consent": "yes"}
+
+
+def test_run_recipe_fails_when_token_missing():
+    recipe = build_recipe(captured_requests(), "ExampleCouncil", LOOKUP)
+    session = MagicMock()
+    session.request.return_value = make_response("<p>Site redesigned</p>")
+
+    with pytest.raises(RecipeError, match="did not return"):
+        run_recipe(recipe, session=session, **LOOKUP)
+
+
+def test_run_recipe_fails_on_http_error():
+    recipe = build_recipe(captured_requests(), "ExampleCouncil", LOOKUP)
+    session = MagicMock()
+    session.request.return_value = make_response("", status_code=500)
+
+    with pytest.raises(RecipeError, match="HTTP 500"):
+        run_recipe(recipe, session=session, **LOOKUP)
+
+    session.request.side_effect = requests.exceptions.ConnectionError("refused")
+    with pytest.raises(RecipeError, match="refused"):
+        run_recipe(recipe, session=session, **LOOKUP)
+
+
+def test_run_recipe_rejects_unknown_version():
+    with pytest.raises(RecipeError):
+        run_recipe({"version": 99, "steps": []}, session=MagicMock())
+
+
+def test_save_and_load_recipe(tmp_path):
+    recipe = build_recipe(captured_requests(), "ExampleCouncil", LOOKUP)
+    path = str(tmp_path / "recipes" / "ExampleCouncil.json")
+
+    save_recipe(recipe, path)
+
+    assert load_recipe(path) == recipe
+
+
+class RecipeCouncil(AbstractGetBinDataClass):
+    recipe = {"version": 1, "steps": []}
+
+    def parse_data(self, page, **kwargs):
+        return {"bins": [{"type": "Selenium", "collectionDate": "01/01/2025"}]}
+
+    def parse_recipe_response(self, responses, **kwargs):
+        return json.loads(responses[-1].text)
+
+
+@patch("uk_bin_collection.uk_bin_collection.recipes.run_recipe")
+def test_get_and_parse_data_uses_recipe(mock_run):
+    mock_run.return_value = [make_response(RESULTS_PAGE)]
+
+    result = RecipeCouncil().get_and_parse_data("url", skip_get_url=True, uprn="1")
+
+    assert result == json.loads(RESULTS_PAGE)
+    mock_run.assert_called_once_with(
+        RecipeCouncil.recipe, skip_get_url=True, uprn="1"
+    )
+
+
+@pytest.mark.parametrize(
+    "outcome",
+    [RecipeError("token missing"), [make_response('{"bins": []}')]],
+)
+@patch("uk_bin_collection.uk_bin_collection.recipes.run_recipe")
+def test_get_and_parse_data_falls_back_to_selenium(mock_run, outcome):
+    if isinstance(outcome, Exception):
+        mock_run.side_effect = outcome
+    else:
+        mock_run.return_value = outcome
+
+    result = RecipeCouncil().get_and_parse_data("url", skip_get_url=True)
+
+    assert result["bins"][0]["type"] == "Selenium"
+
+
+@patch("uk_bin_collection.uk_bin_collection.recipes.run_recipe")
+def test_skip_recipe(mock_run):
+    RecipeCouncil().get_and_parse_data("url", skip_get_url=True, skip_recipe=True)
+
+    mock_run.assert_not_called()
+
+
+class UnparsedRecipeCouncil(AbstractGetBinDataClass):
+    recipe = "ExampleCouncil"
+
+    def parse_data(self, page, **kwargs):
+        return {"bins": [{"type": "Selenium", "collectionDate": "01/01/2025"}]}
+
+
+@patch("uk_bin_collection.uk_bin_collection.recipes.run_recipe")
+def test_recipe_needs_parse_recipe_response(mock_run):
+    assert RecipeCouncil.supports_recipe()
+    assert not UnparsedRecipeCouncil.supports_recipe()
+
+    result = UnparsedRecipeCouncil().get_and_parse_data("url", skip_get_url=True)
+
+    assert result["bins"][0]["type"] == "Selenium"
+    mock_run.assert_not_called()
+
+
+@patch("uk_bin_collection.uk_bin_collection.recipes.create_webdriver")
+def test_record_council(mock_create):
+    driver = mock_create.return_value
+    quit_driver = driver.quit
+    driver.get_log.return_value = PERFORMANCE_LOG
+    driver.execute_cdp_cmd.side_effect = [
+        {"body": FORM_PAGE},
+        {"body": RESULTS_PAGE},
+    ]
+    module = types.ModuleType("ExampleCouncil")
+    module.create_webdriver = MagicMock()
+
+    class CouncilClass:
+        def get_and_parse_data(self, url, **kwargs):
+            assert kwargs["skip_recipe"] is True
+            browser = module.create_webdriver(kwargs.get("web_driver"), True)
+            browser.quit()
+            return json.loads(RESULTS_PAGE)
+
+    module.CouncilClass = CouncilClass
+    original = module.create_webdriver
+
+    with patch(
+        "uk_bin_collection.uk_bin_collection.collect_data.import_council_module",
+        return_value=module,
+    ):
+        recipe, result = record_council("ExampleCouncil", "url", **LOOKUP)
+
+    mock_create.assert_called_once_with(None, True, capture_network=True)
+    quit_driver.assert_called_once()
+    assert module.create_webdriver is original
+    assert result == json.loads(RESULTS_PAGE)
+    assert recipe["recorded_bins"] == 1
+    assert len(recipe["steps"]) == 2
+    assert recipe["steps"][1]["url"].endswith("uprn={{uprn}}")
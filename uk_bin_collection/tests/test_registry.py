@@ -0,0 +1,173 @@
+import json
+import sys
+from unittest.mock import patch
+
+import pytest
+from uk_bin_collection.registry import CouncilRegistry, get_registry
+
+SYNC_COUNCIL = """
+class CouncilClass:
+    def parse_data(self, page, **kwargs):
+        return {"bins": []}
+"""
+
+ASYNC_COUNCIL = """
+class CouncilClass:
+    async def async_parse_data(self, page, **kwargs):
+        return {"bins": []}
+"""
+
+INPUT_JSON = {
+    "RegistrySyncCouncil": {
+        "url": "https://sync.example.com",
+        "wiki_name": "Sync",
+        "uprn": "1",
+        "house_number": "2",
+        "postcode": "AB1 2CD",
+        "skip_get_url": True,
+    },
+    "RegistryAsyncCouncil": {
+        "url": "https://async.example.com",
+        "wiki_name": "Async",
+        "uprn": "3",
+        "web_driver": "http://selenium:4444",
+        "browser_profile": "light",
+    },
+}
+
+
+@pytest.fixture
+def councils(tmp_path):
+    councils_dir = tmp_path / "councils"
+    councils_dir.mkdir()
+    (councils_dir / "RegistrySyncCouncil.py").write_text(SYNC_COUNCIL)
+    (councils_dir / "RegistryAsyncCouncil.py").write_text(ASYNC_COUNCIL)
+    (councils_dir / "_helpers.py").write_text("")
+    (councils_dir / "README.md").write_text("")
+    input_json = tmp_path / "input.json"
+    input_json.write_text(json.dumps(INPUT_JSON))
+    yield tmp_path
+    for name in INPUT_JSON:
+        sys.modules.pop(name, None)
+
+
+def make_registry(tmp_path, index_path=""):
+    if index_path == "":
+        index_path = str(tmp_path / "index.json")
+    return CouncilRegistry(
+        str(tmp_path / "councils"), str(tmp_path / "input.json"), index_path
+    )
+
+
+def test_index(councils):
+    registry = make_registry(councils)
+
+    assert registry.names() == ["RegistryAsyncCouncil", "RegistrySyncCouncil"]
+    assert len(registry) == 2
+    assert "RegistrySyncCouncil" in registry
+    assert "_helpers" not in registry
+
+    sync_info = registry.get_info("RegistrySyncCouncil")
+    assert sync_info["url"] == "https://sync.example.com"
+    assert sync_info["name"] == "Sync"
+    assert sync_info["required_args"] == ["uprn", "postcode", "paon"]
+    assert sync_info["skip_get_url"] is True
+    assert sync_info["selenium"] is False
+    assert sync_info["supports_async"] is False
+
+    async_info = registry.get_info("RegistryAsyncCouncil")
+    assert async_info["required_args"] == ["uprn"]
+    assert async_info["selenium"] is True
+    assert async_info["supports_async"] is True
+    assert async_info["browser_profile"] == "light"
+    assert sync_info["browser_profile"] == "default"
+
+
+def test_unknown_council(councils):
+    registry = make_registry(councils)
+
+    with pytest.raises(ModuleNotFoundError):
+        registry.get_info("MissingCouncil")
+    with pytest.raises(ModuleNotFoundError):
+        registry.get_class("MissingCouncil")
+
+
+def test_get_class_imports_once(councils):
+    registry = make_registry(councils)
+    assert "RegistrySyncCouncil" not in sys.modules
+
+    council_class = registry.get_class("RegistrySyncCouncil")
+    module = registry.get_module("RegistrySyncCouncil")
+
+    assert council_class.__name__ == "CouncilClass"
+    assert module.CouncilClass is council_class
+    assert sys.modules["RegistrySyncCouncil"] is module
+    with patch("importlib.util.spec_from_file_location") as mock_spec:
+        assert registry.get_class("RegistrySyncCouncil") is council_class
+    mock_spec.assert_not_called()
+    assert str(councils / "councils") not in sys.path
+
+
+def test_failed_import_is_not_cached(councils):
+    (councils / "councils" / "RegistrySyncCouncil.py").write_text("raise ValueError")
+    registry = make_registry(councils)
+
+    with pytest.raises(ValueError):
+        registry.get_module("RegistrySyncCouncil")
+    assert "RegistrySyncCouncil" not in sys.modules
+
+
+def test_saved_index_is_reused(councils):
+    make_registry(councils).index
+    assert (councils / "index.json").exists()
+
+    with patch("uk_bin_collection.registry._council_entry") as mock_entry:
+        registry = make_registry(councils)
+        assert registry.names() == ["RegistryAsyncCouncil", "RegistrySyncCouncil"]
+    mock_entry.assert_not_called()
+
+
+def test_saved_index_is_rebuilt_when_councils_change(councils):
+    make_registry(councils).index
+    (councils / "councils" / "RegistryNewCouncil.py").write_text(SYNC_COUNCIL)
+
+    registry = make_registry(councils)
+
+    assert "RegistryNewCouncil" in registry
+    assert registry.get_info("RegistryNewCouncil")["required_args"] == []
+
+
+def test_refresh(councils):
+    registry = make_registry(councils, index_path=None)
+    registry.index
+    (councils / "councils" / "RegistryNewCouncil.py").write_text(SYNC_COUNCIL)
+    assert "RegistryNewCouncil" not in registry
+
+    registry.refresh()
+
+    assert "RegistryNewCouncil" in registry
+    assert not (councils / "index.json").exists()
+
+
+def test_bundled_councils(tmp_path, monkeypatch):
+    monkeypatch.setenv("UKBC_COUNCIL_INDEX_PATH", str(tmp_path / "index.json"))
+    registry = CouncilRegistry()
+
+    info = registry.get_info("CumberlandCouncil")
+    assert info["required_args"] == ["uprn", "postcode"]
+    assert registry.get_class("CumberlandCouncil").__name__ == "CouncilClass"
+
+
+def test_unwritable_cache_dir(councils, monkeypatch):
+    monkeypatch.delenv("UKBC_COUNCIL_INDEX_PATH", raising=False)
+    with patch("os.makedirs", side_effect=PermissionError("read-only")):
+        registry = CouncilRegistry(
+            str(councils / "councils"), str(councils / "input.json")
+        )
+
+    assert registry.index_path is None
+    assert registry.get_class("RegistrySyncCouncil").__name__ == "CouncilClass"
+
+
+def test_get_registry_is_shared():
+    assert get_registry() is get_registry()
@@ -0,0 +1,214 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from uk_bin_collection.sessions import (
+    FormSession,
+    SessionManager,
+    SharedPoolSession,
+    clear_form_sessions,
+    configure_session_manager,
+    get_form_session,
+    get_session,
+    get_session_manager,
+    new_session,
+)
+
+
+def test_session_manager_adapter_settings():
+    manager = SessionManager(
+        pool_connections=4, pool_maxsize=2, max_retries=5, backoff_factor=1
+    )
+    assert isinstance(manager.adapter, HTTPAdapter)
+    assert manager.adapter._pool_connections == 4
+    assert manager.adapter._pool_maxsize == 2
+    assert manager.adapter.max_retries.total == 5
+    assert manager.adapter.max_retries.backoff_factor == 1
+    assert manager.adapter.max_retries.read == 0
+    assert 503 in manager.adapter.max_retries.status_forcelist
+
+
+def test_new_session_shares_adapter():
+    manager = SessionManager()
+    first = manager.new_session()
+    second = manager.new_session()
+    assert first is not second
+    assert first.get_adapter("https://example.com") is manager.adapter
+    assert second.get_adapter("http://example.com") is manager.adapter
+    assert "User-Agent" in first.headers
+
+
+def test_new_session_isolates_cookies():
+    manager = SessionManager()
+    first = manager.new_session()
+    second = manager.new_session()
+    first.cookies.set("token", "abc")
+    assert "token" not in second.cookies
+
+
+def test_shared_pool_session_close_keeps_pool_open():
+    manager = SessionManager()
+    session = manager.new_session()
+    assert isinstance(session, SharedPoolSession)
+    session.cookies.set("token", "abc")
+    manager.adapter.poolmanager.connection_from_url("https://example.com")
+    session.close()
+    assert len(session.cookies) == 0
+    assert len(manager.adapter.poolmanager.pools) == 1
+
+
+def test_get_session_clears_cookies():
+    manager = SessionManager()
+    session = manager.get_session()
+    session.cookies.set("ASP.NET_SessionId", "first-address")
+
+    assert manager.get_session() is session
+    assert len(session.cookies) == 0
+
+
+def test_get_session_is_per_thread():
+    manager = SessionManager()
+    main_session = manager.get_session()
+    assert manager.get_session() is main_session
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(manager.get_session()))
+    thread.start()
+    thread.join()
+    assert other[0] is not main_session
+    assert other[0].get_adapter("https://example.com") is manager.adapter
+
+
+def test_configure_session_manager_replaces_default():
+    original = get_session_manager()
+    try:
+        manager = configure_session_manager(pool_maxsize=3)
+        assert get_session_manager() is manager
+        assert manager.adapter._pool_maxsize == 3
+        assert get_session().get_adapter("https://example.com") is manager.adapter
+        assert new_session().get_adapter("https://example.com") is manager.adapter
+    finally:
+        configure_session_manager()
+        assert get_session_manager() is not original
+
+
+FORM_PAGE = (
+    '<form><input name="__RequestVerificationToken" value="{token}" />'
+    '<input name="FormGuid" value="guid" /></form>'
+)
+
+
+def make_form_session(post_statuses, **kwargs):
+    """Return a FormSession whose sessions serve numbered tokens and the given
+    POST statuses, along with every session it created."""
+    sessions = []
+    tokens = iter(range(1, 100))
+    statuses = iter(post_statuses)
+
+    def factory():
+        session = MagicMock()
+        session.cookies = requests.cookies.RequestsCookieJar()
+
+        def get(url, **get_kwargs):
+            session.cookies.set("ASP.NET_SessionId", f"cookie{len(sessions)}")
+            return MagicMock(content=FORM_PAGE.format(token=f"t{next(tokens)}"))
+
+        session.get.side_effect = get
+        session.request.side_effect = lambda *args, **request_kwargs: MagicMock(
+            status_code=next(statuses)
+        )
+        sessions.append(session)
+        return session
+
+    form_session = FormSession(
+        "https://example.com/form",
+        ("__RequestVerificationToken", "FormGuid"),
+        session_factory=factory,
+        **kwargs,
+    )
+    return form_session, sessions
+
+
+def test_form_session_reuses_tokens():
+    form_session, sessions = make_form_session([200, 200])
+
+    form_session.post("https://example.com/submit", data={"uprn": "1"})
+    form_session.post("https://example.com/submit", data={"uprn": "2"})
+
+    fetches = [s for s in sessions if s.get.called]
+    assert len(fetches) == 1
+    posts = [s for s in sessions if s.request.called]
+    assert len(posts) == 2
+    method, url = posts[1].request.call_args.args
+    assert (method, url) == ("POST", "https://example.com/submit")
+    assert posts[1].request.call_args.kwargs["data"] == {
+        "__RequestVerificationToken": "t1",
+        "FormGuid": "guid",
+        "uprn": "2",
+    }
+    assert posts[1].cookies["ASP.NET_SessionId"] == "cookie1"
+
+
+def test_form_session_refreshes_rejected_tokens():
+    form_session, sessions = make_form_session([419, 200, 200])
+
+    response = form_session.post("https://example.com/submit", data={"uprn": "1"})
+
+    assert response.status_code == 200
+    last_post = [s for s in sessions if s.request.called][-1]
+    data = last_post.request.call_args.kwargs["data"]
+    assert data["__RequestVerificationToken"] == "t2"
+    # The refreshed tokens are kept for the next lookup
+    form_session.post("https://example.com/submit")
+    assert len([s for s in sessions if s.get.called]) == 2
+
+
+def test_form_session_retries_once():
+    form_session, sessions = make_form_session([400, 400])
+
+    response = form_session.post("https://example.com/submit")
+
+    assert response.status_code == 400
+    assert len([s for s in sessions if s.request.called]) == 2
+
+
+def test_form_session_expires_tokens():
+    form_session, sessions = make_form_session([200, 200], ttl=0)
+
+    form_session.post("https://example.com/submit")
+    form_session.post("https://example.com/submit")
+
+    assert len([s for s in sessions if s.get.called]) == 2
+
+
+def test_form_session_invalidate():
+    form_session, sessions = make_form_session([])
+    assert form_session.get_tokens()[0]["__RequestVerificationToken"] == "t1"
+
+    form_session.invalidate()
+
+    assert form_session.get_tokens()[0]["__RequestVerificationToken"] == "t2"
+
+
+def test_form_session_missing_token():
+    form_session = FormSession(
+        "https://example.com/form", ("Missing",), session_factory=MagicMock()
+    )
+    form_session.session_factory.return_value.get.return_value.content = FORM_PAGE
+
+    with pytest.raises(ValueError, match="Missing"):
+        form_session.get_tokens()
+
+
+def test_get_form_session_is_shared():
+    try:
+        form_session = get_form_session("https://example.com/form")
+        assert get_form_session("https://example.com/form") is form_session
+        other = get_form_session("https://example.com/form", ("FormGuid",))
+        assert other is not form_session
+    finally:
+        clear_form_sessions()
+    assert get_form_session("https://example.com/form") is not form_session
+    clear_form_sessions()
@@ -0,0 +1,253 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from uk_bin_collection.webdriver_pool import (
+    WebDriverPool,
+    close_webdriver_pools,
+    configure_webdriver_pools,
+    get_webdriver_pool,
+)
+
+
+def make_pool(**kwargs):
+    factory = MagicMock(side_effect=lambda *args, **kwargs: MagicMock(name="driver"))
+    return WebDriverPool(driver_factory=factory, **kwargs), factory
+
+
+def test_lease_reuses_driver():
+    pool, factory = make_pool()
+
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        pass
+
+    assert first is second
+    factory.assert_called_once_with(
+        None, True, None, "uk_bin_collection.webdriver_pool", profile="default"
+    )
+    first.delete_all_cookies.assert_called()
+    first.get.assert_called_with("about:blank")
+    first.quit.assert_not_called()
+    assert len(pool) == 1
+    assert pool.idle == 1
+
+
+def test_driver_recycled_after_max_uses():
+    pool, factory = make_pool(max_uses=2)
+
+    drivers = []
+    for _ in range(3):
+        with pool.lease() as driver:
+            drivers.append(driver)
+
+    assert drivers[0] is drivers[1]
+    assert drivers[2] is not drivers[0]
+    drivers[0].quit.assert_called_once()
+    assert factory.call_count == 2
+
+
+def test_driver_discarded_when_lease_raises():
+    pool, factory = make_pool()
+
+    with pytest.raises(ValueError):
+        with pool.lease() as driver:
+            raise ValueError("council page changed")
+
+    driver.quit.assert_called_once()
+    assert len(pool) == 0
+    with pool.lease() as replacement:
+        assert replacement is not driver
+
+
+def test_unhealthy_driver_replaced():
+    pool, factory = make_pool()
+    with pool.lease() as driver:
+        pass
+    driver.execute_script.side_effect = Exception("browser crashed")
+
+    with pool.lease() as replacement:
+        assert replacement is not driver
+
+    driver.quit.assert_called_once()
+    assert factory.call_count == 2
+    assert len(pool) == 1
+
+
+def test_reset_failure_discards_driver():
+    pool, factory = make_pool()
+    driver = pool.acquire()
+    driver.delete_all_cookies.side_effect = Exception("session deleted")
+
+    pool.release(driver)
+
+    driver.quit.assert_called_once()
+    assert len(pool) == 0
+
+
+def test_acquire_times_out_when_full():
+    pool, factory = make_pool(max_size=1)
+    driver = pool.acquire()
+
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+
+    pool.release(driver)
+    assert pool.acquire(timeout=0.05) is driver
+
+
+def test_acquire_waits_for_release():
+    pool, factory = make_pool(max_size=1)
+    driver = pool.acquire()
+    timer = threading.Timer(0.05, pool.release, (driver,))
+    timer.start()
+
+    assert pool.acquire(timeout=5) is driver
+    timer.join()
+    assert factory.call_count == 1
+
+
+def test_min_size_keeps_spare_drivers():
+    pool, factory = make_pool(min_size=2, max_size=3)
+
+    driver = pool.acquire()
+    pool._fill_thread.join(timeout=5)
+
+    assert factory.call_count == 3
+    assert pool.idle == 2
+    pool.release(driver)
+    assert pool.idle == 3
+
+
+def test_acquire_does_not_wait_for_spare_drivers():
+    started = threading.Event()
+    unblock = threading.Event()
+    calls = []
+
+    def factory(*args, **kwargs):
+        calls.append(args)
+        if len(calls) > 1:
+            started.set()
+            unblock.wait(timeout=5)
+        return MagicMock(name="driver")
+
+    pool = WebDriverPool(min_size=1, max_size=2, driver_factory=factory)
+
+    driver = pool.acquire()
+
+    assert started.wait(timeout=5)
+    assert pool.idle == 0
+    unblock.set()
+    pool._fill_thread.join(timeout=5)
+    assert pool.idle == 1
+    pool.release(driver)
+    pool.close()
+
+
+def test_idle_drivers_quit_after_idle_timeout():
+    pool, factory = make_pool(idle_timeout=0.05)
+
+    with pool.lease() as driver:
+        pass
+    pool._reaper_thread.join(timeout=5)
+
+    driver.quit.assert_called_once()
+    assert len(pool) == 0
+    assert pool.idle == 0
+
+
+def test_release_wakes_acquire_not_reaper():
+    pool, factory = make_pool(max_size=2)
+    first = pool.acquire()
+    second = pool.acquire()
+    pool.release(first)
+    # Let the reaper start waiting for the released driver to expire
+    time.sleep(0.1)
+    assert pool._reaper_thread.is_alive()
+    first = pool.acquire()
+
+    leased = []
+    waiter = threading.Thread(target=lambda: leased.append(pool.acquire(timeout=5)))
+    waiter.start()
+    time.sleep(0.2)
+    started = time.monotonic()
+    pool.release(first)
+    waiter.join(timeout=5)
+
+    assert leased == [first]
+    assert time.monotonic() - started < 2
+    pool.release(second)
+    pool.close()
+
+
+def test_idle_timeout_none_keeps_drivers():
+    pool, factory = make_pool(idle_timeout=None)
+
+    with pool.lease() as driver:
+        pass
+
+    assert pool._reaper_thread is None
+    driver.quit.assert_not_called()
+    assert pool.idle == 1
+
+
+def test_failed_start_frees_slot():
+    factory = MagicMock(side_effect=Exception("no browser"))
+    pool = WebDriverPool(max_size=1, driver_factory=factory)
+
+    with pytest.raises(Exception):
+        pool.acquire()
+
+    assert len(pool) == 0
+
+
+def test_close_quits_idle_drivers():
+    pool, factory = make_pool()
+    leased = pool.acquire()
+    with pool.lease() as idle:
+        pass
+
+    pool.close()
+
+    idle.quit.assert_called_once()
+    leased.quit.assert_not_called()
+    pool.release(leased)
+    leased.quit.assert_called_once()
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_invalid_sizes():
+    with pytest.raises(ValueError):
+        WebDriverPool(min_size=3, max_size=2)
+
+
+def test_get_webdriver_pool_shared_per_configuration():
+    configure_webdriver_pools(max_size=2, max_uses=5)
+    try:
+        pool = get_webdriver_pool("http://selenium:4444", True)
+        assert get_webdriver_pool("http://selenium:4444", True) is pool
+        assert get_webdriver_pool("http://selenium:4444", False) is not pool
+        assert pool.max_size == 2
+        assert pool.max_uses == 5
+    finally:
+        configure_webdriver_pools()
+    assert get_webdriver_pool("http://selenium:4444", True) is not pool
+    close_webdriver_pools()
+
+
+@patch("uk_bin_collection.uk_bin_collection.webdriver_pool.create_webdriver")
+def test_borrow_webdriver(mock_create):
+    from uk_bin_collection.uk_bin_collection.common import borrow_webdriver
+
+    try:
+        with borrow_webdriver("http://selenium:4444", True) as first:
+            pass
+        with borrow_webdriver("http://selenium:4444", True) as second:
+            pass
+        assert first is second is mock_create.return_value
+        mock_create.assert_called_once()
+    finally:
+        close_webdriver_pools()
@@ -0,0 +1,309 @@
+"""Batch Lookups
+
+Runs many address lookups in one process over a bounded thread pool, with a cap
+on how many lookups hit the same council at once, and streams the results back
+as JSON lines.
+
+Usage:
+    uk_bin_collection batch lookups.csv -o results.jsonl
+"""
+
+import argparse
+import csv
+import json
+import logging
+import sys
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from uk_bin_collection.uk_bin_collection.cache import (
+    DEFAULT_CACHE_TTL,
+    open_result_cache,
+)
+from uk_bin_collection.uk_bin_collection.collect_data import (
+    collect_bin_data,
+    import_council_module,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PER_COUNCIL_LIMIT = 2
+
+LOOKUP_FIELDS = (
+    "council",
+    "url",
+    "postcode",
+    "paon",
+    "uprn",
+    "usrn",
+    "web_driver",
+    "skip_get_url",
+    "headless",
+    "local_browser",
+)
+BOOLEAN_FIELDS = ("skip_get_url", "headless", "local_browser")
+FIELD_ALIASES = {"module": "council", "house_number": "paon", "number": "paon"}
+
+
+def _to_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+
+def normalise_lookup(row: dict) -> dict:
+    """Map a raw CSV/JSONL row onto the lookup fields understood by councils.
+
+    Keyword arguments:
+    row -- a dict read from the batch input
+    """
+    lookup = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        key = FIELD_ALIASES.get(key.strip(), key.strip())
+        if key not in LOOKUP_FIELDS or value in (None, ""):
+            continue
+        lookup[key] = _to_bool(value) if key in BOOLEAN_FIELDS else value
+    if not lookup.get("council"):
+        raise ValueError(f"Lookup is missing a council: {row}")
+    lookup.setdefault("url", "")
+    return lookup
+
+
+def read_lookups(stream, input_format: str = "jsonl"):
+    """Yield normalised lookups from a CSV or JSONL stream.
+
+    Keyword arguments:
+    stream -- an open text stream
+    input_format -- "csv" or "jsonl"
+    """
+    if input_format == "csv":
+        rows = csv.DictReader(stream)
+    elif input_format == "jsonl":
+        rows = (json.loads(line) for line in stream if line.strip())
+    else:
+        raise ValueError(f"Unsupported batch input format: {input_format}")
+    for row in rows:
+        yield normalise_lookup(row)
+
+
+def lookup_result(index: int, lookup: dict) -> dict:
+    """Return the start of a lookup's result: its index and address fields.
+
+    Keyword arguments:
+    index -- the position of the lookup in the batch
+    lookup -- the normalised lookup
+    """
+    result = {"index": index}
+    for key in ("council", "url", "uprn", "postcode", "paon", "usrn"):
+        if key in lookup:
+            result[key] = lookup[key]
+    return result
+
+
+def run_batch(
+    lookups,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    per_council_limit: int = DEFAULT_PER_COUNCIL_LIMIT,
+    defaults: dict = None,
+    lookup_func=collect_bin_data,
+):
+    """Run lookups concurrently and yield one result dict per lookup as it completes.
+
+    Lookups are queued per council and dispatched round-robin, so a slow council
+    never holds more than per_council_limit workers and cannot starve the rest.
+
+    Keyword arguments:
+    lookups -- an iterable of lookup dicts (see normalise_lookup)
+    max_workers -- the number of lookups to run at once
+    per_council_limit -- the number of lookups to run at once against one council
+    defaults -- values applied to every lookup that does not set them itself
+    lookup_func -- the callable that performs one lookup
+    """
+    if max_workers < 1 or per_council_limit < 1:
+        raise ValueError("max_workers and per_council_limit must be at least 1")
+
+    queues = OrderedDict()
+    total = 0
+    for index, lookup in enumerate(lookups):
+        queues.setdefault(lookup["council"], deque()).append((index, lookup))
+        total += 1
+    _LOGGER.info(f"Running {total} lookups across {len(queues)} councils")
+
+    # Import every council up front so worker threads only ever hit sys.modules
+    failed_imports = {}
+    for council in queues:
+        try:
+            import_council_module(council)
+        except Exception as err:
+            failed_imports[council] = err
+
+    running = {council: 0 for council in queues}
+    in_flight = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while queues or in_flight:
+            for council in list(queues):
+                queue = queues[council]
+                while (
+                    queue
+                    and len(in_flight) < max_workers
+                    and running[council] < per_council_limit
+                ):
+                    index, lookup = queue.popleft()
+                    if council in failed_imports:
+                        yield {
+                            **lookup_result(index, lookup),
+                            "status": "error",
+                            "error": str(failed_imports[council]),
+                        }
+                        continue
+                    kwargs = {**(defaults or {}), **lookup}
+                    kwargs.pop("council")
+                    url = kwargs.pop("url")
+                    future = executor.submit(lookup_func, council, url, **kwargs)
+                    in_flight[future] = (index, lookup)
+                    running[council] += 1
+                if not queue:
+                    del queues[council]
+
+            if not in_flight:
+                continue
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, lookup = in_flight.pop(future)
+                running[lookup["council"]] -= 1
+                result = lookup_result(index, lookup)
+                try:
+                    result["status"] = "ok"
+                    result["data"] = future.result()
+                except Exception as err:
+                    _LOGGER.error(f"Lookup {index} for {lookup['council']} failed: {err}")
+                    result["status"] = "error"
+                    result["error"] = str(err)
+                yield result
+
+
+def write_jsonl(results, stream) -> int:
+    """Write results to a stream as JSON lines, flushing after each one.
+
+    Keyword arguments:
+    results -- an iterable of result dicts
+    stream -- an open text stream
+    """
+    failures = 0
+    for result in results:
+        if result.get("status") != "ok":
+            failures += 1
+        stream.write(json.dumps(result, default=str) + "\n")
+        stream.flush()
+    return failures
+
+
+def setup_arg_parser() -> argparse.ArgumentParser:
+    """Set up the argument parser for the batch subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="uk_bin_collection batch",
+        description="Run many UK Bin Collection lookups in one process",
+    )
+    parser.add_argument(
+        "input", type=str, help="CSV or JSONL file of lookups, or - for stdin"
+    )
+    parser.add_argument(
+        "-o", "--output", type=str, default="-", help="JSONL file to write to"
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=("csv", "jsonl"),
+        help="Input format. Defaults to the input file extension, or jsonl",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="Number of lookups to run at once",
+    )
+    parser.add_argument(
+        "--per-council",
+        type=int,
+        default=DEFAULT_PER_COUNCIL_LIMIT,
+        help="Number of lookups to run at once against the same council",
+    )
+    parser.add_argument(
+        "-w",
+        "--web_driver",
+        type=str,
+        help="URL for remote Selenium web driver, used when a row does not set one",
+    )
+    parser.add_argument(
+        "--not-headless",
+        dest="headless",
+        action="store_false",
+        help="Run Selenium with a visible browser",
+    )
+    parser.add_argument(
+        "--local_browser",
+        action="store_true",
+        help="Run Selenium locally rather than on a remote server",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="cache",
+        action="store_false",
+        help="Do not read or write the on-disk result cache",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached results and fetch fresh data",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        dest="cache_ttl",
+        type=float,
+        default=DEFAULT_CACHE_TTL / 3600,
+        help="Hours a cached result stays fresh. Defaults to 168 (one week)",
+    )
+    parser.add_argument(
+        "--cache-path", type=str, help="SQLite file for the result cache"
+    )
+    return parser
+
+
+def main(argv) -> int:
+    """Run the batch subcommand and return the process exit code."""
+    args = setup_arg_parser().parse_args(argv)
+    input_format = args.format or ("csv" if args.input.endswith(".csv") else "jsonl")
+    defaults = {"headless": args.headless, "local_browser": args.local_browser}
+    if args.web_driver:
+        defaults["web_driver"] = args.web_driver
+    result_cache = None
+    if args.cache:
+        result_cache = open_result_cache(args.cache_path, ttl=args.cache_ttl * 3600)
+    if result_cache is not None:
+        defaults["result_cache"] = result_cache
+        defaults["refresh"] = args.refresh
+
+    input_stream = (
+        sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    )
+    output_stream = (
+        sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    )
+    try:
+        results = run_batch(
+            read_lookups(input_stream, input_format),
+            max_workers=args.workers,
+            per_council_limit=args.per_council,
+            defaults=defaults,
+        )
+        failures = write_jsonl(results, output_stream)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    return 1 if failures else 0
@@ -1,22 +1,47 @@
 import argparse
-import importlib
 import os
 import sys
 import logging
+from uk_bin_collection.uk_bin_collection.cache import (
+    DEFAULT_CACHE_TTL,
+    open_result_cache,
+)
 from uk_bin_collection.uk_bin_collection.get_bin_data import (
     setup_logging,
     LOGGING_CONFIG,
 )
+from uk_bin_collection.uk_bin_collection.registry import (
+    CouncilRegistry,
+    get_registry,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
 def import_council_module(module_name, src_path="councils"):
-    """Dynamically import the council processor module."""
+    """Import (once) the council processor module through the council registry."""
+    if src_path == "councils":
+        return get_registry().get_module(module_name)
     module_path = os.path.realpath(os.path.join(os.path.dirname(__file__), src_path))
-    if module_path not in sys.path:
-        sys.path.append(module_path)
-    return importlib.import_module(module_name)
+    return CouncilRegistry(module_path, index_path=None).get_module(module_name)
+
+
+def collect_bin_data(module_name, address_url, **kwargs) -> dict:
+    """Look up a single address without going through argparse.
+
+    Keyword arguments:
+    module_name -- the name of the council module to use
+    address_url -- the URL to get the data from
+    kwargs -- the lookup parameters passed to the council (postcode, paon, uprn...)
+              plus an optional result_cache and refresh flag
+    """
+    council_module = import_council_module(module_name)
+    kwargs.setdefault("council_module_str", module_name)
+    if not kwargs.get("local_browser"):
+        kwargs.setdefault("web_driver", None)
+    return council_module.CouncilClass().get_and_parse_data_cached(
+        address_url, **kwargs
+    )
 
 
 class UKBinCollectionApp:
@@ -89,18 +114,43 @@ class UKBinCollectionApp:
             help="Enables development mode - creates/updates entries in the input.json file for the council on each run",
             required=False,
         )
+        self.parser.add_argument(
+            "--no-cache",
+            dest="cache",
+            action="store_false",
+            help="Do not read or write the on-disk result cache",
+        )
+        self.parser.add_argument(
+            "--refresh",
+            action="store_true",
+            help="Ignore any cached result and fetch fresh data (the new result is still cached)",
+            required=False,
+        )
+        self.parser.add_argument(
+            "--cache-ttl",
+            dest="cache_ttl",
+            type=float,
+            default=DEFAULT_CACHE_TTL / 3600,
+            help="Hours a cached result stays fresh. Defaults to 168 (one week)",
+            required=False,
+        )
+        self.parser.add_argument(
+            "--cache-path",
+            dest="cache_path",
+            type=str,
+            help="SQLite file for the result cache. Defaults to ~/.cache/uk_bin_collection/results.sqlite3",
+            required=False,
+        )
+        self.parser.set_defaults(cache=True)
         self.parsed_args = None
 
     def set_args(self, args):
         """Parse the arguments from the command line."""
         self.parsed_args = self.parser.parse_args(args)
 
-    def run(self):
-        """Run the application with the provided arguments."""
-        council_module = import_council_module(self.parsed_args.module)
-        return self.client_code(
-            council_module.CouncilClass(),
-            self.parsed_args.URL,
+    def council_kwargs(self) -> dict:
+        """Return the keyword arguments passed to the council for the parsed args."""
+        return dict(
             postcode=self.parsed_args.postcode,
             paon=self.parsed_args.number,
             uprn=self.parsed_args.uprn,
@@ -110,6 +160,52 @@ class UKBinCollectionApp:
             local_browser=self.parsed_args.local_browser,
             dev_mode=self.parsed_args.dev_mode,
             council_module_str=self.parsed_args.module,
+            result_cache=self.get_result_cache(),
+            refresh=self.parsed_args.refresh,
+        )
+
+    def get_result_cache(self):
+        """Return the result cache for the parsed args, or None if caching is off
+        or the cache file cannot be created."""
+        if not self.parsed_args.cache or self.parsed_args.dev_mode:
+            return None
+        if not hasattr(self, "_result_cache"):
+            self._result_cache = open_result_cache(
+                self.parsed_args.cache_path, ttl=self.parsed_args.cache_ttl * 3600
+            )
+        return self._result_cache
+
+    def get_council_module(self):
+        """Import (once) and return the council module for the parsed args."""
+        if getattr(self, "_council_module_name", None) != self.parsed_args.module:
+            self._council_module = import_council_module(self.parsed_args.module)
+            self._council_module_name = self.parsed_args.module
+        return self._council_module
+
+    @property
+    def supports_async(self) -> bool:
+        """Whether the selected council can run natively on an event loop."""
+        return self.get_council_module().CouncilClass.supports_async()
+
+    def run(self):
+        """Run the application with the provided arguments."""
+        council_module = self.get_council_module()
+        return self.client_code(
+            council_module.CouncilClass(),
+            self.parsed_args.URL,
+            **self.council_kwargs(),
+        )
+
+    async def async_run(self, **kwargs):
+        """Run the application on the event loop. Only councils whose supports_async()
+        is True avoid blocking a thread.
+
+        Keyword arguments:
+        kwargs -- extra arguments for the council, such as http_session
+        """
+        council_module = self.get_council_module()
+        return await council_module.CouncilClass().async_template_method(
+            self.parsed_args.URL, **self.council_kwargs(), **kwargs
         )
 
     def client_code(self, get_bin_data_class, address_url, **kwargs):
@@ -125,6 +221,14 @@ def run():
     """Set up logging and run the application."""
     global _LOGGER
     _LOGGER = setup_logging(LOGGING_CONFIG, None)
+    if sys.argv[1:2] == ["batch"]:
+        from uk_bin_collection.uk_bin_collection.batch import main as batch_main
+
+        sys.exit(batch_main(sys.argv[2:]))
+    if sys.argv[1:2] == ["record"]:
+        from uk_bin_collection.uk_bin_collection.recipes import main as record_main
+
+        sys.exit(record_main(sys.argv[2:]))
     app = UKBinCollectionApp()
     app.set_args(sys.argv[1:])
     print(app.run())
@@ -1,5 +1,11 @@
 from bs4 import BeautifulSoup
 from uk_bin_collection.uk_bin_collection.common import *
+
+# The star import above does not include pd, parse, holidays, webdriver,
+# ChromeService or ChromeDriverManager. Import any of them you use explicitly, e.g.
+# import pandas as pd
+# from dateutil.parser import parse
+# from selenium import webdriver
 from uk_bin_collection.uk_bin_collection.get_bin_data import AbstractGetBinDataClass
 
 
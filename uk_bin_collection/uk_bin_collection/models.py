@@ -0,0 +1,272 @@
+"""Bin Collection Models
+
+Typed results for council parsers. A BinCollection is one collection of one bin
+type, and a BinSchedule holds a household's collections sorted by date. Dates
+stay datetime.date objects until a schedule is written out as the legacy
+{"bins": [{"type": ..., "collectionDate": "dd/mm/YYYY"}]} JSON. A
+BinScheduleIndex is a read-only view of a schedule for answering date queries.
+
+Keyword arguments:
+None
+"""
+
+import logging
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+
+from uk_bin_collection.uk_bin_collection.common import (
+    format_collection_date,
+    parse_collection_date,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BinCollection:
+    """One collection of one bin type.
+
+    Keyword arguments:
+    type -- the bin type, as the council names it
+    date -- the collection date, a date or datetime
+    """
+
+    __slots__ = ("type", "date")
+
+    def __init__(self, type: str, date: date):
+        if isinstance(date, datetime):
+            date = date.date()
+        self.type = type
+        self.date = date
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BinCollection):
+            return NotImplemented
+        return self.date == other.date and self.type == other.type
+
+    def __lt__(self, other) -> bool:
+        if not isinstance(other, BinCollection):
+            return NotImplemented
+        return (self.date, self.type) < (other.date, other.type)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"BinCollection({self.type!r}, {self.date!r})"
+
+    def to_dict(self) -> dict:
+        """Return the collection in the legacy JSON shape."""
+        return {"type": self.type, "collectionDate": format_collection_date(self.date)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BinCollection":
+        """Build a collection from the legacy JSON shape.
+
+        Keyword arguments:
+        data -- a dict with "type" and a dd/mm/YYYY "collectionDate"
+        """
+        bin_type = data.get("type")
+        collection_date = data.get("collectionDate")
+        if not bin_type or not collection_date:
+            raise ValueError(f"Missing 'type' or 'collectionDate' in bin data: {data}")
+        return cls(bin_type, parse_collection_date(collection_date))
+
+
+class BinSchedule:
+    """A household's bin collections, kept sorted by date and then bin type.
+
+    Council parse_data methods may return a BinSchedule instead of a dict; the
+    framework converts it with to_dict where the legacy JSON is needed.
+
+    Keyword arguments:
+    collections -- an optional iterable of BinCollection
+    """
+
+    __slots__ = ("_collections",)
+
+    def __init__(self, collections=()):
+        self._collections = sorted(collections)
+
+    def add(self, bin_type: str, collection_date: date) -> BinCollection:
+        """Add a collection, keeping the schedule sorted.
+
+        Keyword arguments:
+        bin_type -- the bin type
+        collection_date -- the collection date, a date or datetime
+        """
+        collection = BinCollection(bin_type, collection_date)
+        insort(self._collections, collection)
+        return collection
+
+    def __iter__(self):
+        return iter(self._collections)
+
+    def __len__(self) -> int:
+        return len(self._collections)
+
+    def __getitem__(self, index):
+        return self._collections[index]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BinSchedule):
+            return NotImplemented
+        return self._collections == other._collections
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"BinSchedule({self._collections!r})"
+
+    def types(self) -> list:
+        """Return the bin types in the schedule, sorted."""
+        return sorted({collection.type for collection in self._collections})
+
+    def next_collections(self, after: date) -> dict:
+        """Return the first collection date of each bin type on or after a date,
+        in date order.
+
+        Keyword arguments:
+        after -- the first date to consider
+        """
+        next_dates = {}
+        for collection in self._collections:
+            if collection.date >= after and collection.type not in next_dates:
+                next_dates[collection.type] = collection.date
+        return next_dates
+
+    def to_dict(self) -> dict:
+        """Return the schedule in the legacy {"bins": [...]} JSON shape."""
+        return {"bins": [collection.to_dict() for collection in self._collections]}
+
+    @classmethod
+    def from_dict(cls, data: dict, skip_invalid: bool = False) -> "BinSchedule":
+        """Build a schedule from the legacy {"bins": [...]} JSON shape.
+
+        Keyword arguments:
+        data -- the dict returned by a council
+        skip_invalid -- log and drop entries with a missing or malformed type or
+                        date instead of raising ValueError
+        """
+        collections = []
+        for bin_data in data.get("bins", []):
+            try:
+                collections.append(BinCollection.from_dict(bin_data))
+            except (ValueError, TypeError) as err:
+                if not skip_invalid:
+                    raise
+                _LOGGER.warning(f"Skipping invalid bin data {bin_data}: {err}")
+        return cls(collections)
+
+
+class BinScheduleIndex:
+    """A schedule indexed by bin type for date queries.
+
+    Each bin type's collection dates are held as a sorted array of date
+    ordinals, so next, range and after queries are a bisect rather than a scan
+    of the whole schedule. Duplicate dates for a bin type are dropped.
+
+    Keyword arguments:
+    collections -- an optional iterable of BinCollection, such as a BinSchedule
+    """
+
+    __slots__ = ("_ordinals",)
+
+    def __init__(self, collections=()):
+        ordinals = {}
+        for collection in collections:
+            ordinals.setdefault(collection.type, set()).add(
+                collection.date.toordinal()
+            )
+        self._ordinals = {
+            bin_type: array("l", sorted(values))
+            for bin_type, values in ordinals.items()
+        }
+
+    def __len__(self) -> int:
+        return sum(len(values) for values in self._ordinals.values())
+
+    def __contains__(self, bin_type) -> bool:
+        return bin_type in self._ordinals
+
+    def __repr__(self) -> str:
+        return f"BinScheduleIndex({self.types()!r}, {len(self)} collections)"
+
+    def types(self) -> list:
+        """Return the bin types in the index, sorted."""
+        return sorted(self._ordinals)
+
+    def dates(self, bin_type: str) -> list:
+        """Return every collection date of a bin type, in date order.
+
+        Keyword arguments:
+        bin_type -- the bin type
+        """
+        return [date.fromordinal(value) for value in self._ordinals.get(bin_type, ())]
+
+    def next(self, bin_type: str, after: date):
+        """Return the first collection date of a bin type on or after a date, or
+        None if there is none.
+
+        Keyword arguments:
+        bin_type -- the bin type
+        after -- the first date to consider
+        """
+        values = self._ordinals.get(bin_type, ())
+        index = bisect_left(values, after.toordinal())
+        if index == len(values):
+            return None
+        return date.fromordinal(values[index])
+
+    def between(self, bin_type: str, start: date, end: date) -> list:
+        """Return the collection dates of a bin type from start to end
+        inclusive, in date order.
+
+        Keyword arguments:
+        bin_type -- the bin type
+        start -- the first date of the range
+        end -- the last date of the range
+        """
+        values = self._ordinals.get(bin_type, ())
+        first = bisect_left(values, start.toordinal())
+        last = bisect_right(values, end.toordinal())
+        return [date.fromordinal(value) for value in values[first:last]]
+
+    def after(self, bin_type: str, after: date, limit: int = None) -> list:
+        """Return the collection dates of a bin type after a date, in date
+        order.
+
+        Keyword arguments:
+        bin_type -- the bin type
+        after -- the date to start after; collections on it are excluded
+        limit -- the most dates to return, or None for all of them
+        """
+        values = self._ordinals.get(bin_type, ())
+        first = bisect_right(values, after.toordinal())
+        last = len(values) if limit is None else first + limit
+        return [date.fromordinal(value) for value in values[first:last]]
+
+    def next_collections(self, after: date) -> dict:
+        """Return the first collection date of each bin type on or after a date,
+        in date order, like BinSchedule.next_collections.
+
+        Keyword arguments:
+        after -- the first date to consider
+        """
+        next_dates = []
+        for bin_type in self._ordinals:
+            next_date = self.next(bin_type, after)
+            if next_date is not None:
+                next_dates.append((next_date, bin_type))
+        return {bin_type: next_date for next_date, bin_type in sorted(next_dates)}
+
+
+def as_bin_data_dict(result) -> dict:
+    """Return a council's result in the legacy {"bins": [...]} shape, whether it
+    returned a BinSchedule or a dict.
+
+    Keyword arguments:
+    result -- the value returned by parse_data
+    """
+    if isinstance(result, BinSchedule):
+        return result.to_dict()
+    return result
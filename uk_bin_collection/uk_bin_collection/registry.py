@@ -0,0 +1,245 @@
+"""Council Registry
+
+Builds one index of the council modules that ship with the package, merged with
+what input.json says about each of them, and hands out their classes without
+adding the councils directory to sys.path or scanning it on every lookup.
+
+Keyword arguments:
+None
+"""
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import re
+import sys
+import threading
+
+from uk_bin_collection.uk_bin_collection.cache import get_cache_dir
+
+_LOGGER = logging.getLogger(__name__)
+
+INDEX_VERSION = 2
+COUNCILS_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "councils")
+INPUT_JSON_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "tests", "input.json"
+)
+# input.json field -> council keyword argument
+ADDRESS_FIELDS = {
+    "uprn": "uprn",
+    "usrn": "usrn",
+    "postcode": "postcode",
+    "house_number": "paon",
+    "paon": "paon",
+}
+ASYNC_PATTERN = re.compile(r"async\s+def\s+async_(?:parse_data|get_and_parse_data)\b")
+
+
+def default_index_path() -> str:
+    """Return the council index path, overridable with UKBC_COUNCIL_INDEX_PATH."""
+    return os.environ.get("UKBC_COUNCIL_INDEX_PATH") or os.path.join(
+        get_cache_dir(), "council_index.json"
+    )
+
+
+def _council_entry(name: str, path: str, council_input: dict) -> dict:
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    required_args = []
+    for field, kwarg in ADDRESS_FIELDS.items():
+        if field in council_input and kwarg not in required_args:
+            required_args.append(kwarg)
+    return {
+        "module": name,
+        "path": path,
+        "name": council_input.get("wiki_name", name),
+        "url": council_input.get("url"),
+        "required_args": required_args,
+        "skip_get_url": bool(council_input.get("skip_get_url", False)),
+        "selenium": "web_driver" in council_input,
+        "browser_profile": council_input.get("browser_profile", "default"),
+        "supports_async": bool(ASYNC_PATTERN.search(source)),
+    }
+
+
+class CouncilRegistry:
+    """An index of council modules with a cache of their imported classes.
+
+    The index is built once per process from the councils directory and
+    input.json, and saved to disk so later processes only need to check that
+    neither has changed. Council classes are imported on first use and kept.
+
+    Keyword arguments:
+    councils_dir -- the directory holding the council modules
+    input_json_path -- the input.json to take each council's details from
+    index_path -- the JSON file to save the index to, or None to not save it
+    """
+
+    def __init__(
+        self,
+        councils_dir: str = COUNCILS_DIR,
+        input_json_path: str = INPUT_JSON_PATH,
+        index_path: str = "",
+    ):
+        self.councils_dir = councils_dir
+        self.input_json_path = input_json_path
+        if index_path == "":
+            try:
+                index_path = default_index_path()
+            except OSError as err:
+                _LOGGER.warning(f"Council index will not be saved: {err}")
+                index_path = None
+        self.index_path = index_path
+        self._index = None
+        self._classes = {}
+        self._lock = threading.RLock()
+
+    @property
+    def index(self) -> dict:
+        """The council index, keyed by module name."""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._load_index()
+        return self._index
+
+    def names(self) -> list:
+        """Return the sorted names of every indexed council module."""
+        return sorted(self.index)
+
+    def get_info(self, module_name: str) -> dict:
+        """Return the index entry for a council module.
+
+        Keyword arguments:
+        module_name -- the name of the council module
+        """
+        try:
+            return self.index[module_name]
+        except KeyError:
+            raise ModuleNotFoundError(
+                f"No council module named {module_name!r}", name=module_name
+            ) from None
+
+    def get_module(self, module_name: str):
+        """Import (once) and return a council module.
+
+        Keyword arguments:
+        module_name -- the name of the council module
+        """
+        council_class = self._classes.get(module_name)
+        if council_class is not None:
+            return sys.modules[council_class.__module__]
+        info = self.get_info(module_name)
+        with self._lock:
+            module = sys.modules.get(module_name)
+            if module is None:
+                spec = importlib.util.spec_from_file_location(module_name, info["path"])
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[module_name] = module
+                try:
+                    spec.loader.exec_module(module)
+                except BaseException:
+                    del sys.modules[module_name]
+                    raise
+            self._classes[module_name] = module.CouncilClass
+        return module
+
+    def get_class(self, module_name: str):
+        """Return the CouncilClass of a council module, importing it on first use.
+
+        Keyword arguments:
+        module_name -- the name of the council module
+        """
+        council_class = self._classes.get(module_name)
+        if council_class is None:
+            council_class = self.get_module(module_name).CouncilClass
+        return council_class
+
+    def refresh(self):
+        """Rebuild the index from the councils directory and input.json."""
+        with self._lock:
+            self._index = self._load_index(use_saved=False)
+
+    def __contains__(self, module_name: str) -> bool:
+        return module_name in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _fingerprint(self) -> str:
+        digest = hashlib.sha1(str(INDEX_VERSION).encode())
+        paths = [self.input_json_path]
+        with os.scandir(self.councils_dir) as entries:
+            paths.extend(
+                sorted(entry.path for entry in entries if entry.name.endswith(".py"))
+            )
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+        return digest.hexdigest()
+
+    def _load_index(self, use_saved: bool = True) -> dict:
+        fingerprint = self._fingerprint()
+        if use_saved and self.index_path:
+            try:
+                with open(self.index_path, encoding="utf-8") as f:
+                    saved = json.load(f)
+                if saved.get("fingerprint") == fingerprint:
+                    return saved["councils"]
+            except (OSError, ValueError, KeyError):
+                pass
+        councils = self._build_index()
+        if self.index_path:
+            self._save_index(fingerprint, councils)
+        return councils
+
+    def _build_index(self) -> dict:
+        try:
+            with open(self.input_json_path, encoding="utf-8") as f:
+                input_data = json.load(f)
+        except (OSError, ValueError):
+            _LOGGER.warning(f"Could not read council details from {self.input_json_path}")
+            input_data = {}
+        councils = {}
+        with os.scandir(self.councils_dir) as entries:
+            for entry in entries:
+                name, ext = os.path.splitext(entry.name)
+                if ext != ".py" or name.startswith("_"):
+                    continue
+                councils[name] = _council_entry(
+                    name, entry.path, input_data.get(name, {})
+                )
+        _LOGGER.debug(f"Indexed {len(councils)} council modules")
+        return councils
+
+    def _save_index(self, fingerprint: str, councils: dict):
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"fingerprint": fingerprint, "councils": councils},
+                    f,
+                    separators=(",", ":"),
+                )
+            os.replace(tmp_path, self.index_path)
+        except OSError as err:
+            _LOGGER.debug(f"Could not save council index to {self.index_path}: {err}")
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> CouncilRegistry:
+    """Return the process-wide CouncilRegistry for the bundled councils."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = CouncilRegistry()
+    return _registry
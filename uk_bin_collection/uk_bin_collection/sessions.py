@@ -0,0 +1,288 @@
+"""Shared HTTP Sessions
+
+Pooled, keep-alive HTTP sessions that the framework and council classes borrow
+from instead of building a new connection (DNS, TCP and TLS) for every lookup.
+
+Keyword arguments:
+None
+"""
+
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_POOL_CONNECTIONS = 32
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_RETRY_STATUSES = (429, 500, 502, 503, 504)
+# ASP.NET's default session timeout
+DEFAULT_FORM_TOKEN_TTL = 20 * 60
+# Statuses with which form frameworks reject stale anti-forgery tokens or sessions
+DEFAULT_REJECTED_STATUSES = (400, 403, 419, 440)
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/108.0.0.0 Safari/537.36"
+)
+
+
+class SharedPoolSession(requests.Session):
+    """A requests Session whose transport adapters are owned by a SessionManager.
+
+    Closing the session drops its cookies but leaves the shared connection pools
+    open for the other sessions mounted on them.
+    """
+
+    def close(self):
+        self.cookies.clear()
+
+
+class SessionManager:
+    """Hands out requests Sessions that share per-host connection pools.
+
+    Every session is mounted on the same HTTPAdapter, whose urllib3 PoolManager
+    keeps one keep-alive pool per host, so lookups against the same council
+    reuse open connections.
+
+    Keyword arguments:
+    pool_connections -- the number of per-host pools to keep open
+    pool_maxsize -- the number of connections to keep open per host
+    max_retries -- the number of retries for connection errors and retryable statuses;
+                   read timeouts are not retried, so a stalled council fails after
+                   one request timeout
+    backoff_factor -- the exponential backoff factor between retries
+    retry_statuses -- the HTTP statuses that trigger a retry
+    pool_block -- whether to block when a host's pool has no free connections
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        retry_statuses: tuple = DEFAULT_RETRY_STATUSES,
+        pool_block: bool = False,
+    ):
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=0,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=retry_statuses,
+            raise_on_status=False,
+        )
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+            pool_block=pool_block,
+        )
+        self._local = threading.local()
+
+    def new_session(self) -> requests.Session:
+        """Return a session with its own cookie jar that uses the shared pools.
+
+        Use this for flows that rely on cookies, such as form tokens, so that
+        concurrent lookups cannot see each other's state.
+        """
+        session = SharedPoolSession()
+        session.mount("https://", self.adapter)
+        session.mount("http://", self.adapter)
+        session.headers.update(
+            {"User-Agent": DEFAULT_USER_AGENT, "Connection": "keep-alive"}
+        )
+        return session
+
+    def get_session(self) -> requests.Session:
+        """Return the calling thread's shared session, creating it on first use.
+
+        The session's cookies are cleared each time it is handed out, so cookies
+        set while looking up one address are never sent with the next lookup.
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self.new_session()
+            self._local.session = session
+        else:
+            session.cookies.clear()
+        return session
+
+    def close(self):
+        """Close every pooled connection held by the manager."""
+        self.adapter.close()
+
+
+_session_manager = None
+_session_manager_lock = threading.Lock()
+
+
+def configure_session_manager(**kwargs) -> SessionManager:
+    """Replace the process-wide SessionManager with one built from kwargs.
+
+    Keyword arguments:
+    kwargs -- passed through to SessionManager
+    """
+    global _session_manager
+    with _session_manager_lock:
+        previous = _session_manager
+        _session_manager = SessionManager(**kwargs)
+    if previous is not None:
+        previous.close()
+    _LOGGER.debug(f"Configured HTTP session manager: {kwargs}")
+    return _session_manager
+
+
+def get_session_manager() -> SessionManager:
+    """Return the process-wide SessionManager, creating it with defaults."""
+    global _session_manager
+    if _session_manager is None:
+        with _session_manager_lock:
+            if _session_manager is None:
+                _session_manager = SessionManager()
+    return _session_manager
+
+
+def get_session() -> requests.Session:
+    """Return the calling thread's pooled session, with its cookies cleared."""
+    return get_session_manager().get_session()
+
+
+def new_session() -> requests.Session:
+    """Return a pooled session with an isolated cookie jar."""
+    return get_session_manager().new_session()
+
+
+class FormSession:
+    """The anti-forgery tokens and cookies of a form page (ASP.NET, renderform and
+    the like), fetched once and shared by every lookup that posts the form until
+    they expire or the server rejects them.
+
+    Each post runs on its own session seeded with the cached cookies, so cookies
+    set by one lookup's response never leak into another's.
+
+    Keyword arguments:
+    form_url -- the page that renders the form
+    token_names -- the hidden inputs to read from the form page
+    ttl -- the number of seconds the tokens are reused for
+    rejected_statuses -- the response statuses that mean the tokens were refused
+    session_factory -- the callable that returns a new session, defaults to new_session
+    """
+
+    def __init__(
+        self,
+        form_url: str,
+        token_names: tuple = ("__RequestVerificationToken",),
+        ttl: float = DEFAULT_FORM_TOKEN_TTL,
+        rejected_statuses: tuple = DEFAULT_REJECTED_STATUSES,
+        session_factory=None,
+    ):
+        self.form_url = form_url
+        self.token_names = tuple(token_names)
+        self.ttl = ttl
+        self.rejected_statuses = rejected_statuses
+        self.session_factory = session_factory or new_session
+        self._tokens = None
+        self._cookies = None
+        self._expires_at = 0
+        self._lock = threading.Lock()
+
+    def get_tokens(self, refresh: bool = False) -> tuple:
+        """Return the cached tokens and cookies, fetching the form page when they
+        have expired.
+
+        Keyword arguments:
+        refresh -- fetch the form page even if the cached tokens are still fresh
+        """
+        with self._lock:
+            if refresh or self._tokens is None or time.monotonic() >= self._expires_at:
+                self._fetch()
+            return dict(self._tokens), self._cookies.copy()
+
+    def invalidate(self):
+        """Drop the cached tokens so that the next lookup fetches the form page."""
+        with self._lock:
+            self._tokens = None
+
+    def request(self, method: str, url: str, data: dict = None, **kwargs):
+        """Send the form with the cached tokens added to data, fetching fresh tokens
+        and sending it once more if the server rejects them.
+
+        Keyword arguments:
+        method -- the HTTP method, usually POST
+        url -- the URL the form is sent to
+        data -- the form fields, without the tokens
+        kwargs -- passed through to requests, e.g. headers
+        """
+        kwargs.setdefault("timeout", 60)
+        for retry in (False, True):
+            tokens, cookies = self.get_tokens(refresh=retry)
+            session = self.session_factory()
+            session.cookies.update(cookies)
+            response = session.request(
+                method, url, data={**tokens, **(data or {})}, **kwargs
+            )
+            if retry or response.status_code not in self.rejected_statuses:
+                return response
+            _LOGGER.info(
+                f"{url} rejected the cached form tokens with HTTP "
+                f"{response.status_code}, fetching new ones"
+            )
+
+    def post(self, url: str, data: dict = None, **kwargs):
+        """Send the form with POST. See request."""
+        return self.request("POST", url, data=data, **kwargs)
+
+    def _fetch(self):
+        from uk_bin_collection.uk_bin_collection.common import get_input_values
+
+        session = self.session_factory()
+        response = session.get(self.form_url, timeout=60)
+        response.raise_for_status()
+        tokens = get_input_values(response.content, *self.token_names)
+        missing = [name for name, value in tokens.items() if value is None]
+        if missing:
+            raise ValueError(f"{self.form_url} has no {', '.join(missing)} input")
+        self._tokens = tokens
+        self._cookies = session.cookies.copy()
+        self._expires_at = time.monotonic() + self.ttl
+        _LOGGER.debug(f"Fetched form tokens from {self.form_url}")
+
+
+_form_sessions = {}
+_form_sessions_lock = threading.Lock()
+
+
+def get_form_session(
+    form_url: str, token_names: tuple = ("__RequestVerificationToken",), **kwargs
+) -> FormSession:
+    """Return the process-wide FormSession for a form page, creating it on first use.
+
+    Keyword arguments:
+    form_url -- the page that renders the form
+    token_names -- the hidden inputs to read from the form page
+    kwargs -- passed through to FormSession when it is created
+    """
+    key = (form_url, tuple(token_names))
+    form_session = _form_sessions.get(key)
+    if form_session is None:
+        with _form_sessions_lock:
+            form_session = _form_sessions.get(key)
+            if form_session is None:
+                form_session = _form_sessions[key] = FormSession(
+                    form_url, token_names, **kwargs
+                )
+    return form_session
+
+
+def clear_form_sessions():
+    """Forget the tokens of every form page."""
+    with _form_sessions_lock:
+        _form_sessions.clear()
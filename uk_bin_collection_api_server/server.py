@@ -1,9 +1,449 @@
 # server.py
+#
+# Lookups run on a long-lived worker pool instead of building a fresh
+# UKBinCollectionApp (and argparse parser) per request. Configure it with:
+#   UKBC_API_WORKER_MODE -- "thread" (default) or "process"
+#   UKBC_API_WORKERS     -- the number of lookups to run at once (default 8)
+#   UKBC_API_NO_CACHE    -- set to disable the on-disk and in-memory result caches
+# Identical concurrent requests share one in-flight lookup rather than each
+# scraping the council. Responses carry an ETag over the sorted bins and a
+# Cache-Control max-age that runs out the day after the next collection, are
+# kept in memory until then, and If-None-Match is answered with 304.
+#
+# For hundreds of concurrent slow lookups per node, run the ASGI variant with
+# `uvicorn --factory server:create_asgi_app`. Its handler awaits lookups
+# instead of holding a server thread, and is tuned with:
+#   UKBC_API_MAX_PENDING -- lookups admitted at once before answering 429 (default 256)
+#   UKBC_API_TIMEOUT     -- seconds before a lookup is answered with 504 (default 120)
+#
+# POST /api/bin_collection/batch runs an array of lookups across councils with a
+# per-council limit and streams the results back as NDJSON (or, with
+# ?format=json, one JSON array). UKBC_API_MAX_BATCH caps its size (default 10000).
+# A batch's lookups run on the shared worker pool, and UKBC_API_PER_COUNCIL
+# (default 2) caps the lookups every batch request together runs against one
+# council. On the ASGI app they also count towards UKBC_API_MAX_PENDING and each
+# one is given UKBC_API_TIMEOUT.
 
+import asyncio
 import connexion
-from uk_bin_collection.uk_bin_collection.collect_data import UKBinCollectionApp
+import contextlib
+import hashlib
+import json
 import logging
+import os
+import threading
+import time
 import traceback
+from collections import OrderedDict, deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+from connexion.resolver import Resolver
+from connexion.utils import get_function_from_name
+
+from uk_bin_collection.uk_bin_collection.batch import (
+    DEFAULT_PER_COUNCIL_LIMIT,
+    lookup_result,
+    normalise_lookup,
+)
+from uk_bin_collection.uk_bin_collection.cache import (
+    DEFAULT_CACHE_TTL,
+    make_cache_key,
+    next_refresh_time,
+    open_result_cache,
+)
+from uk_bin_collection.uk_bin_collection.registry import get_registry
+from uk_bin_collection.uk_bin_collection.sessions import (
+    DEFAULT_POOL_MAXSIZE,
+    configure_session_manager,
+)
+
+DEFAULT_WORKERS = 8
+DEFAULT_MAX_PENDING = 256
+DEFAULT_TIMEOUT = 120
+DEFAULT_MAX_BATCH = 10000
+MAX_CACHED_RESPONSES = 4096
+WORKER_MODES = ("thread", "process")
+# operationId in swagger.yaml -> handler used by the ASGI app
+ASYNC_OPERATIONS = {
+    "server.council_data": "server.async_council_data",
+    "server.batch_data": "server.async_batch_data",
+}
+
+_executor = None
+_workers = DEFAULT_WORKERS
+_executor_lock = threading.RLock()
+_councils = threading.local()
+_result_cache = None
+_result_cache_opened = False
+_result_cache_lock = threading.Lock()
+_pending = 0
+_http_session = None
+# Lookups in flight, keyed by lookup_key, that identical requests wait on
+_inflight = {}
+_inflight_lock = threading.Lock()
+_async_inflight = {}
+# Per-council limits shared by every ASGI batch request, keyed by (loop, council)
+_council_limits = {}
+# Batch lookups running against each council across all WSGI requests
+_council_running = {}
+_council_condition = threading.Condition()
+# Recent responses, keyed by lookup_key: (etag, body, expires_at)
+_responses = OrderedDict()
+_responses_lock = threading.Lock()
+
+
+def init_worker(workers):
+    """Size the shared HTTP connection pools for the number of workers."""
+    configure_session_manager(pool_maxsize=max(DEFAULT_POOL_MAXSIZE, workers))
+
+
+def get_result_cache():
+    """Return the process's result cache, or None if UKBC_API_NO_CACHE is set or
+    the cache file cannot be created."""
+    global _result_cache, _result_cache_opened
+    if os.environ.get("UKBC_API_NO_CACHE"):
+        return None
+    if not _result_cache_opened:
+        with _result_cache_lock:
+            if not _result_cache_opened:
+                _result_cache = open_result_cache()
+                _result_cache_opened = True
+    return _result_cache
+
+
+def get_council(council):
+    """Return this worker's instance of a council class, creating it on first use."""
+    instances = getattr(_councils, "instances", None)
+    if instances is None:
+        instances = _councils.instances = {}
+    council_obj = instances.get(council)
+    if council_obj is None:
+        council_obj = instances[council] = get_registry().get_class(council)()
+    return council_obj
+
+
+def lookup(council, url, **kwargs):
+    """Run one lookup in a worker and return the council's JSON output."""
+    return get_council(council).template_method(
+        url,
+        council_module_str=council,
+        headless=True,
+        local_browser=False,
+        dev_mode=False,
+        result_cache=get_result_cache(),
+        refresh=False,
+        **kwargs,
+    )
+
+
+def lookup_key(council, url, **kwargs):
+    """Return the key that identical concurrent lookups share."""
+    return (
+        make_cache_key(council, url, **kwargs),
+        bool(kwargs.get("skip_get_url")),
+        kwargs.get("web_driver"),
+    )
+
+
+def submit_lookup(council, url, **kwargs):
+    """Submit a lookup to the worker pool, or join the identical one already in
+    flight so that a burst of the same request only scrapes the council once."""
+    key = lookup_key(council, url, **kwargs)
+    with _inflight_lock:
+        future = _inflight.get(key)
+        # A finished future may still be here until its done callback runs; a
+        # failed lookup must not be handed to the next request
+        if future is not None and not future.done():
+            logging.debug(f"Joining in-flight lookup for {council}")
+            return future
+        future = _inflight[key] = get_executor().submit(lookup, council, url, **kwargs)
+
+    def forget(finished):
+        with _inflight_lock:
+            if _inflight.get(key) is finished:
+                del _inflight[key]
+
+    future.add_done_callback(forget)
+    return future
+
+
+def bin_data_etag(bin_data):
+    """Return a strong ETag that only changes when the collections do."""
+    bins = sorted(
+        bin_data.get("bins", []),
+        key=lambda item: json.dumps(item, sort_keys=True, default=str),
+    )
+    payload = json.dumps(bins, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha1(payload.encode()).hexdigest() + '"'
+
+
+def get_cached_response(key):
+    """Return the in-memory (etag, body, expires_at) for a lookup if still fresh."""
+    if os.environ.get("UKBC_API_NO_CACHE"):
+        return None
+    with _responses_lock:
+        entry = _responses.get(key)
+        if entry is None:
+            return None
+        if entry[2] <= time.time():
+            del _responses[key]
+            return None
+        _responses.move_to_end(key)
+    return entry
+
+
+def store_response(key, json_output):
+    """Work out the ETag and expiry of a lookup's output and keep it in memory."""
+    bin_data = json.loads(json_output)
+    now = time.time()
+    expires_at = now + DEFAULT_CACHE_TTL
+    refresh_at = next_refresh_time(bin_data, jitter=0)
+    if refresh_at is not None:
+        expires_at = min(expires_at, refresh_at.timestamp())
+    elif not bin_data.get("bins"):
+        expires_at = now
+    entry = (bin_data_etag(bin_data), bin_data, expires_at)
+    if expires_at > now and not os.environ.get("UKBC_API_NO_CACHE"):
+        with _responses_lock:
+            _responses[key] = entry
+            _responses.move_to_end(key)
+            while len(_responses) > MAX_CACHED_RESPONSES:
+                _responses.popitem(last=False)
+    return entry
+
+
+def cached_response(entry):
+    """Build the response for a cached entry, answering 304 if the client's
+    If-None-Match already has it."""
+    etag, body, expires_at = entry
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"max-age={max(0, int(expires_at - time.time()))}",
+    }
+    if_none_match = connexion.request.headers.get("If-None-Match", "")
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    if etag in tags or "*" in tags:
+        return None, 304, headers
+    return body, 200, headers
+
+
+def configure_workers(worker_mode=None, workers=None):
+    """Replace the worker pool used for lookups.
+
+    Keyword arguments:
+    worker_mode -- "thread" or "process", defaults to UKBC_API_WORKER_MODE
+    workers -- the number of lookups to run at once, defaults to UKBC_API_WORKERS
+    """
+    global _executor, _workers
+    worker_mode = worker_mode or os.environ.get("UKBC_API_WORKER_MODE", "thread")
+    workers = int(workers or os.environ.get("UKBC_API_WORKERS", DEFAULT_WORKERS))
+    if worker_mode not in WORKER_MODES:
+        raise ValueError(f"Unsupported worker mode: {worker_mode}")
+    # Load the council index before any worker processes are forked
+    get_registry().index
+    if worker_mode == "process":
+        executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        init_worker(workers)
+        executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="ukbc-lookup"
+        )
+    with _executor_lock:
+        previous, _executor = _executor, executor
+        _workers = workers
+    if previous is not None:
+        previous.shutdown(wait=False)
+    logging.info(f"Running lookups on {workers} {worker_mode} workers")
+    return executor
+
+
+def get_executor():
+    """Return the worker pool, creating it from the environment on first use."""
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                configure_workers()
+    return _executor
+
+
+def get_response_entry(council, url, **kwargs):
+    """Return the (etag, body, expires_at) for a lookup, from memory if fresh."""
+    key = lookup_key(council, url, **kwargs)
+    entry = get_cached_response(key)
+    if entry is None:
+        json_output = submit_lookup(council, url, **kwargs).result()
+        entry = get_cached_response(key) or store_response(key, json_output)
+    return entry
+
+
+def validate_batch(lookups):
+    """Return (normalised lookups, None) for a batch request, or (None, error
+    response)."""
+    max_batch = int(os.environ.get("UKBC_API_MAX_BATCH", DEFAULT_MAX_BATCH))
+    if len(lookups) > max_batch:
+        return None, error_response(
+            413, f"A batch can hold at most {max_batch} lookups"
+        )
+    try:
+        return [normalise_lookup(lookup) for lookup in lookups], None
+    except (AttributeError, ValueError) as err:
+        return None, error_response(400, str(err))
+
+
+def batch_lookup_kwargs(lookup):
+    """Return the council, url and keyword arguments of a normalised batch lookup,
+    keeping only the fields batch_lookup passes on."""
+    return (
+        lookup["council"],
+        lookup.get("url", ""),
+        dict(
+            postcode=lookup.get("postcode"),
+            paon=lookup.get("paon"),
+            uprn=lookup.get("uprn"),
+            usrn=lookup.get("usrn"),
+            skip_get_url=lookup.get("skip_get_url") is True,
+            web_driver=lookup.get("web_driver"),
+        ),
+    )
+
+
+def get_per_council_limit():
+    """Return the number of lookups all batch requests together run against one
+    council at once, from UKBC_API_PER_COUNCIL."""
+    return int(os.environ.get("UKBC_API_PER_COUNCIL", DEFAULT_PER_COUNCIL_LIMIT))
+
+
+def acquire_council_slot(council):
+    """Count a batch lookup against council if it is below UKBC_API_PER_COUNCIL,
+    and return whether it was."""
+    with _council_condition:
+        if _council_running.get(council, 0) >= get_per_council_limit():
+            return False
+        _council_running[council] = _council_running.get(council, 0) + 1
+        return True
+
+
+def release_council_slot(council):
+    with _council_condition:
+        _council_running[council] -= 1
+        _council_condition.notify_all()
+
+
+def wait_for_council_slot(councils, timeout=1):
+    """Wait until one of councils is below UKBC_API_PER_COUNCIL."""
+    limit = get_per_council_limit()
+    with _council_condition:
+        _council_condition.wait_for(
+            lambda: any(_council_running.get(c, 0) < limit for c in councils),
+            timeout,
+        )
+
+
+def run_lookups(lookups, per_council=None):
+    """Run a batch's lookups on the shared worker pool and yield one result dict
+    per lookup as it completes.
+
+    The request thread only dispatches lookups and collects their futures, so
+    a batch holds no threads of its own. At most as many lookups as there are
+    workers run at once for one request, and each council is limited both across
+    requests (UKBC_API_PER_COUNCIL) and, when per_council is given, within this
+    one. A lookup that fails is reported as an error rather than failing the
+    batch.
+
+    Keyword arguments:
+    lookups -- the normalised lookups
+    per_council -- the number of lookups to run at once against one council
+    """
+    queues = OrderedDict()
+    for index, lookup in enumerate(lookups):
+        queues.setdefault(lookup["council"], deque()).append((index, lookup))
+    running = {council: 0 for council in queues}
+    in_flight = {}
+
+    def finish(index, lookup, entry=None, error=None):
+        result = lookup_result(index, lookup)
+        if error is None:
+            result["status"] = "ok"
+            result["data"] = entry[1]
+        else:
+            logging.error(f"Lookup {index} for {lookup['council']} failed: {error}")
+            result["status"] = "error"
+            result["error"] = str(error)
+        return result
+
+    while queues or in_flight:
+        for council in list(queues):
+            queue = queues[council]
+            while (
+                queue
+                and len(in_flight) < _workers
+                and not (per_council and running[council] >= per_council)
+            ):
+                index, lookup = queue[0]
+                council, url, kwargs = batch_lookup_kwargs(lookup)
+                key = lookup_key(council, url, **kwargs)
+                entry = get_cached_response(key)
+                if entry is None and not acquire_council_slot(council):
+                    break
+                queue.popleft()
+                if entry is not None:
+                    yield finish(index, lookup, entry)
+                    continue
+                try:
+                    future = submit_lookup(council, url, **kwargs)
+                except Exception as err:
+                    release_council_slot(council)
+                    yield finish(index, lookup, error=err)
+                    continue
+                future.add_done_callback(
+                    lambda _, council=council: release_council_slot(council)
+                )
+                in_flight[future] = (index, lookup, key)
+                running[council] += 1
+            if not queue:
+                del queues[council]
+
+        if in_flight:
+            # Wake up now and then to start lookups for councils that other
+            # requests have stopped using
+            done, _ = wait(in_flight, timeout=1, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, lookup, key = in_flight.pop(future)
+                running[lookup["council"]] -= 1
+                try:
+                    entry = get_cached_response(key) or store_response(
+                        key, future.result()
+                    )
+                except Exception as err:
+                    yield finish(index, lookup, error=err)
+                else:
+                    yield finish(index, lookup, entry)
+        elif queues:
+            # Every council left is at its limit because of other requests
+            wait_for_council_slot(list(queues))
+
+
+def ndjson_lines(results):
+    for result in results:
+        yield json.dumps(result, default=str) + "\n"
+
+
+def batch_data(lookups, format="ndjson", per_council=None):
+    lookups, error = validate_batch(lookups)
+    if error:
+        return error
+    results = run_lookups(lookups, per_council)
+    if format == "json":
+        results = sorted(results, key=lambda result: result["index"])
+        return results, 200, {"Content-Type": "application/json"}
+    from flask import Response
+
+    return Response(ndjson_lines(results), mimetype="application/x-ndjson")
 
 
 def council_data(
@@ -16,33 +456,268 @@ def council_data(
     skip_get_url=False,
     web_driver=None,
 ):
-    args = [council, url]
-
-    if uprn:
-        args.append(f"-u={uprn}")
-    if postcode:
-        args.append(f"-p={postcode}")
-    if house_number:
-        args.append(f"-n={house_number}")
-    if usrn:
-        args.append(f"-us={usrn}")
-
-    if web_driver:
-        args.append(f"-w={web_driver}")
-    if skip_get_url is True:
-        args.append(f"-s")
+    try:
+        get_registry().get_info(council)
+        kwargs = dict(
+            postcode=postcode,
+            paon=house_number,
+            uprn=uprn,
+            usrn=usrn,
+            skip_get_url=skip_get_url is True,
+            web_driver=web_driver,
+        )
+        return cached_response(get_response_entry(council, url, **kwargs))
+    except Exception as err:
+        logging.error(traceback.format_exc())
+        logging.info(f"Schema: {err}")
+        raise err
+
+
+def error_response(status, message, headers=None):
+    """Return a connexion response tuple in the swagger Error format."""
+    headers = {"Content-Type": "application/json", **(headers or {})}
+    return {"code": status, "message": message}, status, headers
+
+
+def get_http_session():
+    """Return the aiohttp session shared by native-async councils."""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        import aiohttp
+
+        _http_session = aiohttp.ClientSession()
+    return _http_session
+
+
+async def async_lookup(council, url, **kwargs):
+    """Run one lookup without holding the event loop, natively where the council
+    supports it and on the worker pool otherwise."""
+    council_class = get_registry().get_class(council)
+    if council_class.supports_async():
+        return await council_class().async_template_method(
+            url,
+            council_module_str=council,
+            headless=True,
+            local_browser=False,
+            dev_mode=False,
+            result_cache=get_result_cache(),
+            refresh=False,
+            http_session=get_http_session(),
+            **kwargs,
+        )
+    return await asyncio.wrap_future(submit_lookup(council, url, **kwargs))
+
+
+class TooManyLookups(Exception):
+    """Raised when UKBC_API_MAX_PENDING lookups are already in progress."""
+
 
+def get_max_pending():
+    """Return the number of lookups admitted at once, from UKBC_API_MAX_PENDING."""
+    return int(os.environ.get("UKBC_API_MAX_PENDING", DEFAULT_MAX_PENDING))
+
+
+def get_lookup_timeout():
+    """Return the seconds an ASGI request waits for a lookup, from UKBC_API_TIMEOUT."""
+    return float(os.environ.get("UKBC_API_TIMEOUT", DEFAULT_TIMEOUT))
+
+
+def start_async_lookup(response_key, council, url, **kwargs):
+    """Return the task for a lookup on this event loop, joining an identical one
+    still in flight. A new lookup counts towards UKBC_API_MAX_PENDING until it
+    really finishes, even if the request gives up waiting for it."""
+    global _pending
+    key = (asyncio.get_running_loop(), response_key)
+    task = _async_inflight.get(key)
+    if task is not None and not task.done():
+        logging.debug(f"Joining in-flight lookup for {council}")
+        return task
+    if _pending >= get_max_pending():
+        raise TooManyLookups("Too many lookups in progress, try again later")
+
+    _pending += 1
+    task = _async_inflight[key] = asyncio.ensure_future(
+        async_lookup(council, url, **kwargs)
+    )
+
+    def release(finished):
+        global _pending
+        _pending -= 1
+        if _async_inflight.get(key) is finished:
+            del _async_inflight[key]
+        if not finished.cancelled() and finished.exception() is not None:
+            logging.error(f"Lookup for {council} failed: {finished.exception()}")
+
+    task.add_done_callback(release)
+    return task
+
+
+async def async_get_response_entry(council, url, timeout, **kwargs):
+    """Return the (etag, body, expires_at) for a lookup, from memory if fresh.
+    Raises TooManyLookups, or asyncio.TimeoutError after timeout seconds."""
+    response_key = lookup_key(council, url, **kwargs)
+    entry = get_cached_response(response_key)
+    if entry is None:
+        task = start_async_lookup(response_key, council, url, **kwargs)
+        json_output = await asyncio.wait_for(asyncio.shield(task), timeout)
+        entry = get_cached_response(response_key) or store_response(
+            response_key, json_output
+        )
+    return entry
+
+
+def too_many_lookups_response():
+    return error_response(
+        429, "Too many lookups in progress, try again later", {"Retry-After": "5"}
+    )
+
+
+async def async_council_data(
+    council,
+    url,
+    postcode=None,
+    uprn=None,
+    house_number=None,
+    usrn=None,
+    skip_get_url=False,
+    web_driver=None,
+):
+    timeout = get_lookup_timeout()
+    try:
+        get_registry().get_info(council)
+    except ModuleNotFoundError as err:
+        return error_response(404, str(err))
+    kwargs = dict(
+        postcode=postcode,
+        paon=house_number,
+        uprn=uprn,
+        usrn=usrn,
+        skip_get_url=skip_get_url is True,
+        web_driver=web_driver,
+    )
     try:
-        CollectData = UKBinCollectionApp()
-        CollectData.set_args(args)
-        return CollectData.run()
+        entry = await async_get_response_entry(council, url, timeout, **kwargs)
+        return cached_response(entry)
+    except TooManyLookups:
+        return too_many_lookups_response()
+    except asyncio.TimeoutError:
+        logging.warning(f"Lookup for {council} timed out after {timeout}s")
+        return error_response(504, f"Lookup timed out after {timeout} seconds")
     except Exception as err:
         logging.error(traceback.format_exc())
         logging.info(f"Schema: {err}")
         raise err
 
 
-def create_app():
+def get_council_limit(council):
+    """Return the semaphore that caps the lookups all ASGI batch requests run
+    against one council at once."""
+    key = (asyncio.get_running_loop(), council)
+    limit = _council_limits.get(key)
+    if limit is None:
+        limit = _council_limits[key] = asyncio.Semaphore(get_per_council_limit())
+    return limit
+
+
+async def async_run_batch(lookups, per_council=None):
+    """Run a batch's lookups on the event loop and yield one result dict per
+    lookup as it completes.
+
+    At most as many lookups as there are workers run at once for one request,
+    and each council is limited both across requests (UKBC_API_PER_COUNCIL) and,
+    when per_council is given, within this one. A lookup that times out or finds
+    the server full is reported as an error rather than failing the batch.
+
+    Keyword arguments:
+    lookups -- the normalised lookups
+    per_council -- the number of lookups to run at once against one council
+    """
+    timeout = get_lookup_timeout()
+    slots = asyncio.Semaphore(_workers)
+    request_limits = {}
+
+    async def run(index, lookup):
+        council, url, kwargs = batch_lookup_kwargs(lookup)
+        result = lookup_result(index, lookup)
+        if per_council:
+            request_limit = request_limits.setdefault(
+                council, asyncio.Semaphore(per_council)
+            )
+        else:
+            request_limit = contextlib.nullcontext()
+        try:
+            async with request_limit, get_council_limit(council), slots:
+                entry = await async_get_response_entry(council, url, timeout, **kwargs)
+            result["status"] = "ok"
+            result["data"] = entry[1]
+        except asyncio.TimeoutError:
+            result["status"] = "error"
+            result["error"] = f"Lookup timed out after {timeout} seconds"
+        except Exception as err:
+            logging.error(f"Lookup {index} for {council} failed: {err}")
+            result["status"] = "error"
+            result["error"] = str(err)
+        return result
+
+    tasks = [
+        asyncio.ensure_future(run(index, lookup))
+        for index, lookup in enumerate(lookups)
+    ]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def async_ndjson_lines(results):
+    async for result in results:
+        yield json.dumps(result, default=str) + "\n"
+
+
+async def async_batch_data(lookups, format="ndjson", per_council=None):
+    lookups, error = validate_batch(lookups)
+    if error:
+        return error
+    if _pending >= get_max_pending():
+        return too_many_lookups_response()
+    results = async_run_batch(lookups, per_council)
+    if format == "json":
+        results = sorted(
+            [result async for result in results], key=lambda result: result["index"]
+        )
+        return results, 200, {"Content-Type": "application/json"}
+    from starlette.responses import StreamingResponse
+
+    return StreamingResponse(
+        async_ndjson_lines(results), media_type="application/x-ndjson"
+    )
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    yield
+    if _http_session is not None:
+        await _http_session.close()
+
+
+def create_asgi_app(worker_mode=None, workers=None):
+    configure_workers(worker_mode, workers)
+    app = connexion.AsyncApp(__name__, specification_dir="./", lifespan=lifespan)
+    app.add_api(
+        "swagger.yaml",
+        resolver=Resolver(
+            lambda operation_id: get_function_from_name(
+                ASYNC_OPERATIONS.get(operation_id, operation_id)
+            )
+        ),
+    )
+    return app
+
+
+def create_app(worker_mode=None, workers=None):
+    configure_workers(worker_mode, workers)
     app = connexion.App(__name__, specification_dir="./")
     app.add_api("swagger.yaml")
     return app
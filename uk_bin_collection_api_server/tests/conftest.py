@@ -0,0 +1,5 @@
+import os
+import sys
+
+# server.py is run from its own directory (see the Dockerfile), not as a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,691 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
+
+import pytest
+from uk_bin_collection.uk_bin_collection.sessions import get_session_manager
+
+pytest.importorskip("connexion")
+import server  # noqa: E402
+
+BIN_DATA = '{"bins": [{"type": "Refuse", "collectionDate": "01/01/2099"}]}'
+SERVER_ENV = (
+    "UKBC_API_WORKER_MODE",
+    "UKBC_API_WORKERS",
+    "UKBC_API_NO_CACHE",
+    "UKBC_API_MAX_PENDING",
+    "UKBC_API_TIMEOUT",
+    "UKBC_API_MAX_BATCH",
+    "UKBC_API_PER_COUNCIL",
+)
+
+
+@pytest.fixture(autouse=True)
+def server_state(monkeypatch):
+    """Give each test fresh module state and no on-disk result cache."""
+    for name in SERVER_ENV:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(server, "_executor", None)
+    monkeypatch.setattr(server, "_pending", 0)
+    monkeypatch.setattr(server, "_inflight", {})
+    monkeypatch.setattr(server, "_async_inflight", {})
+    monkeypatch.setattr(server, "_council_limits", {})
+    monkeypatch.setattr(server, "_council_running", {})
+    monkeypatch.setattr(server, "_workers", server.DEFAULT_WORKERS)
+    monkeypatch.setattr(server, "_responses", server.OrderedDict())
+    monkeypatch.setattr(server, "_result_cache", None)
+    monkeypatch.setattr(server, "_result_cache_opened", True)
+    monkeypatch.setattr(server, "_http_session", None)
+    monkeypatch.setattr(server.connexion, "request", MagicMock(headers={}))
+    yield
+    if server._executor is not None:
+        server._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@pytest.fixture
+def registry():
+    """A council registry that knows ExampleCouncil, a sync council."""
+
+    def get_info(name):
+        if name != "ExampleCouncil":
+            raise ModuleNotFoundError(f"No council module named {name!r}")
+        return {"module": name}
+
+    registry = MagicMock()
+    registry.get_info.side_effect = get_info
+    registry.get_class.return_value.supports_async.return_value = False
+    with patch.object(server, "get_registry", return_value=registry):
+        yield registry
+
+
+def test_configure_workers_thread_mode(registry):
+    executor = server.configure_workers("thread", 12)
+
+    assert isinstance(executor, ThreadPoolExecutor)
+    assert executor._max_workers == 12
+    assert server.get_executor() is executor
+    assert server._workers == 12
+    assert get_session_manager().adapter._pool_maxsize == 12
+
+
+def test_configure_workers_process_mode(registry):
+    index = type(registry).index = PropertyMock(return_value={})
+
+    executor = server.configure_workers("process", 2)
+
+    assert isinstance(executor, ProcessPoolExecutor)
+    assert executor._max_workers == 2
+    assert server._workers == 2
+    # The council index is loaded before any worker processes are forked
+    index.assert_called_once()
+
+
+def test_configure_workers_from_env(registry, monkeypatch):
+    monkeypatch.setenv("UKBC_API_WORKER_MODE", "process")
+    monkeypatch.setenv("UKBC_API_WORKERS", "3")
+
+    executor = server.get_executor()
+
+    assert isinstance(executor, ProcessPoolExecutor)
+    assert executor._max_workers == 3
+
+
+def test_configure_workers_defaults(registry):
+    executor = server.configure_workers()
+
+    assert isinstance(executor, ThreadPoolExecutor)
+    assert executor._max_workers == server.DEFAULT_WORKERS
+
+
+@pytest.mark.parametrize(
+    "name, value", [("UKBC_API_WORKER_MODE", "fork"), ("UKBC_API_WORKERS", "many")]
+)
+def test_configure_workers_invalid_env(registry, monkeypatch, name, value):
+    monkeypatch.setenv(name, value)
+
+    with pytest.raises(ValueError):
+        server.configure_workers()
+    assert server._executor is None
+
+
+def test_configure_workers_replaces_pool(registry):
+    first = server.configure_workers("thread", 1)
+    second = server.configure_workers("thread", 1)
+
+    assert second is not first
+    assert first._shutdown
+
+
+def test_get_council_is_per_thread(registry):
+    registry.get_class.return_value.side_effect = lambda: object()
+    main_council = server.get_council("ExampleCouncil")
+    assert server.get_council("ExampleCouncil") is main_council
+
+    other = []
+    thread = threading.Thread(
+        target=lambda: other.append(server.get_council("ExampleCouncil"))
+    )
+    thread.start()
+    thread.join()
+    assert other[0] is not main_council
+
+
+@patch.object(server, "lookup", return_value=BIN_DATA)
+def test_council_data_passes_usrn(mock_lookup, registry):
+    client = server.create_app("thread", 1).test_client()
+
+    response = client.get(
+        "/api/bin_collection/ExampleCouncil",
+        params={"url": "https://example.com", "uprn": "1", "usrn": "200"},
+    )
+
+    assert response.status_code == 200
+    args, kwargs = mock_lookup.call_args
+    assert args == ("ExampleCouncil", "https://example.com")
+    assert kwargs["uprn"] == "1"
+    assert kwargs["usrn"] == "200"
+
+
+class BlockedLookup:
+    """An async_lookup stand-in that waits until released, then returns or raises."""
+
+    def __init__(self, result=BIN_DATA):
+        self.result = result
+        self.released = asyncio.Event()
+        self.calls = []
+
+    async def __call__(self, council, url, **kwargs):
+        self.calls.append(kwargs)
+        await self.released.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_async_council_data(registry):
+    with patch.object(server, "async_lookup", AsyncMock(return_value=BIN_DATA)):
+        body, status, headers = await server.async_council_data(
+            "ExampleCouncil", "https://example.com", uprn="1"
+        )
+
+    assert status == 200
+    assert body["bins"][0]["type"] == "Refuse"
+    assert server._pending == 0
+
+
+async def test_async_council_data_unknown_council(registry):
+    body, status, headers = await server.async_council_data("Nowhere", "url")
+
+    assert status == 404
+    assert "Nowhere" in body["message"]
+
+
+async def test_async_council_data_too_many_pending(registry, monkeypatch):
+    monkeypatch.setenv("UKBC_API_MAX_PENDING", "1")
+    blocked = BlockedLookup()
+
+    with patch.object(server, "async_lookup", blocked):
+        first = asyncio.ensure_future(
+            server.async_council_data("ExampleCouncil", "url", uprn="1")
+        )
+        await settle()
+        assert server._pending == 1
+
+        body, status, headers = await server.async_council_data(
+            "ExampleCouncil", "url", uprn="2"
+        )
+        assert status == 429
+        assert headers["Retry-After"] == "5"
+
+        blocked.released.set()
+        assert (await first)[1] == 200
+
+    assert server._pending == 0
+    assert len(blocked.calls) == 1
+
+
+async def test_async_council_data_timeout(registry, monkeypatch):
+    monkeypatch.setenv("UKBC_API_TIMEOUT", "0.01")
+    blocked = BlockedLookup()
+
+    with patch.object(server, "async_lookup", blocked):
+        body, status, headers = await server.async_council_data(
+            "ExampleCouncil", "url", uprn="1"
+        )
+        assert status == 504
+        # The lookup keeps its slot until it really finishes
+        assert server._pending == 1
+
+        blocked.released.set()
+        await settle()
+
+    assert server._pending == 0
+    assert server._async_inflight == {}
+
+
+async def test_async_council_data_error_releases_pending(registry):
+    failing = BlockedLookup(RuntimeError("council site down"))
+    failing.released.set()
+
+    with patch.object(server, "async_lookup", failing):
+        with pytest.raises(RuntimeError):
+            await server.async_council_data("ExampleCouncil", "url", uprn="1")
+
+    assert server._pending == 0
+    assert server._async_inflight == {}
+
+
+async def test_lifespan_closes_http_session():
+    session = server._http_session = MagicMock(close=AsyncMock())
+
+    async with server.lifespan(None):
+        session.close.assert_not_awaited()
+
+    session.close.assert_awaited_once()
+
+
+@patch.object(server, "lookup", return_value=BIN_DATA)
+def test_asgi_app(mock_lookup, registry):
+    client = server.create_asgi_app("thread", 1).test_client()
+
+    response = client.get(
+        "/api/bin_collection/ExampleCouncil", params={"url": "https://example.com"}
+    )
+    missing = client.get("/api/bin_collection/Nowhere", params={"url": "x"})
+
+    assert response.status_code == 200
+    assert response.json()["bins"][0]["type"] == "Refuse"
+    assert missing.status_code == 404
+
+
+def test_submit_lookup_shares_identical_lookups(registry):
+    started = threading.Event()
+    release = threading.Event()
+
+    def template_method(url, **kwargs):
+        started.set()
+        release.wait(5)
+        return BIN_DATA
+
+    council = registry.get_class.return_value.return_value
+    council.template_method.side_effect = template_method
+    server.configure_workers("thread", 2)
+
+    first = server.submit_lookup("ExampleCouncil", "url", uprn="1")
+    assert started.wait(5)
+    second = server.submit_lookup("ExampleCouncil", "url", uprn="1")
+    other = server.submit_lookup("ExampleCouncil", "url", uprn="2")
+    release.set()
+
+    assert second is first
+    assert other is not first
+    assert first.result(5) == BIN_DATA
+    other.result(5)
+    assert council.template_method.call_count == 2
+
+
+def test_submit_lookup_retries_after_failure(registry):
+    council = registry.get_class.return_value.return_value
+    council.template_method.side_effect = [RuntimeError("council site down"), BIN_DATA]
+    server.configure_workers("thread", 1)
+
+    failed = server.submit_lookup("ExampleCouncil", "url", uprn="1")
+    with pytest.raises(RuntimeError):
+        failed.result(5)
+    retried = server.submit_lookup("ExampleCouncil", "url", uprn="1")
+
+    assert retried is not failed
+    assert retried.result(5) == BIN_DATA
+    assert council.template_method.call_count == 2
+
+
+async def test_async_council_data_shares_identical_lookups(registry):
+    blocked = BlockedLookup()
+
+    with patch.object(server, "async_lookup", blocked):
+        requests = [
+            asyncio.ensure_future(
+                server.async_council_data("ExampleCouncil", "url", uprn="1")
+            )
+            for _ in range(3)
+        ]
+        await settle()
+        assert server._pending == 1
+        blocked.released.set()
+        responses = await asyncio.gather(*requests)
+
+    assert [status for body, status, headers in responses] == [200, 200, 200]
+    assert len(blocked.calls) == 1
+
+
+async def test_async_council_data_retries_after_failure(registry):
+    failing = BlockedLookup(RuntimeError("council site down"))
+    failing.released.set()
+
+    with patch.object(server, "async_lookup", failing):
+        with pytest.raises(RuntimeError):
+            await server.async_council_data("ExampleCouncil", "url", uprn="1")
+        failing.result = BIN_DATA
+        body, status, headers = await server.async_council_data(
+            "ExampleCouncil", "url", uprn="1"
+        )
+
+    assert status == 200
+    assert len(failing.calls) == 2
+
+
+def test_bin_data_etag():
+    bins = [
+        {"type": "Refuse", "collectionDate": "01/01/2099"},
+        {"type": "Recycling", "collectionDate": "08/01/2099"},
+    ]
+    etag = server.bin_data_etag({"bins": bins})
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert server.bin_data_etag({"bins": bins[::-1]}) == etag
+    moved = [bins[0], {"type": "Recycling", "collectionDate": "09/01/2099"}]
+    assert server.bin_data_etag({"bins": moved}) != etag
+
+
+def test_cached_response(monkeypatch):
+    etag, body, expires_at = entry = server.store_response("key", BIN_DATA)
+
+    assert body == {"bins": [{"type": "Refuse", "collectionDate": "01/01/2099"}]}
+    response_body, status, headers = server.cached_response(entry)
+    assert (response_body, status) == (body, 200)
+    assert headers["ETag"] == etag
+    assert headers["Cache-Control"].startswith("max-age=")
+    assert int(headers["Cache-Control"].removeprefix("max-age=")) > 0
+
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        request = MagicMock(headers={"If-None-Match": if_none_match})
+        monkeypatch.setattr(server.connexion, "request", request)
+        assert server.cached_response(entry)[:2] == (None, 304)
+
+    monkeypatch.setattr(
+        server.connexion, "request", MagicMock(headers={"If-None-Match": '"other"'})
+    )
+    assert server.cached_response(entry)[1] == 200
+
+
+def test_store_response_skips_empty_results():
+    server.store_response("key", '{"bins": []}')
+
+    assert server.get_cached_response("key") is None
+
+
+def test_store_response_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(server, "MAX_CACHED_RESPONSES", 2)
+    server.store_response("first", BIN_DATA)
+    server.store_response("second", BIN_DATA)
+    assert server.get_cached_response("first") is not None
+
+    server.store_response("third", BIN_DATA)
+
+    assert list(server._responses) == ["first", "third"]
+    assert server.get_cached_response("second") is None
+
+
+async def test_async_council_data_not_modified(registry, monkeypatch):
+    mock_lookup = AsyncMock(return_value=BIN_DATA)
+
+    with patch.object(server, "async_lookup", mock_lookup):
+        body, status, headers = await server.async_council_data(
+            "ExampleCouncil", "url", uprn="1"
+        )
+        monkeypatch.setattr(
+            server.connexion,
+            "request",
+            MagicMock(headers={"If-None-Match": headers["ETag"]}),
+        )
+        not_modified = await server.async_council_data(
+            "ExampleCouncil", "url", uprn="1"
+        )
+
+    assert status == 200
+    assert not_modified[:2] == (None, 304)
+    assert not_modified[2]["ETag"] == headers["ETag"]
+    mock_lookup.assert_awaited_once()
+
+
+async def test_async_council_data_new_etag_when_bins_change(registry):
+    changed = BIN_DATA.replace("01/01/2099", "02/01/2099")
+
+    with patch.object(server, "async_lookup", AsyncMock(return_value=BIN_DATA)):
+        first = await server.async_council_data("ExampleCouncil", "url", uprn="1")
+    server._responses.clear()
+    with patch.object(server, "async_lookup", AsyncMock(return_value=changed)):
+        second = await server.async_council_data("ExampleCouncil", "url", uprn="1")
+
+    assert second[0]["bins"][0]["collectionDate"] == "02/01/2099"
+    assert second[2]["ETag"] != first[2]["ETag"]
+
+
+class CountingLookup:
+    """An async_lookup stand-in that records how many lookups overlap."""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def __call__(self, council, url, **kwargs):
+        self.calls += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if council == "BrokenCouncil":
+                raise RuntimeError("council site down")
+            return BIN_DATA
+        finally:
+            self.running -= 1
+
+
+async def test_async_batch_data_json(registry):
+    lookups = [
+        {"council": "ExampleCouncil", "url": "url", "uprn": "1"},
+        {"council": "BrokenCouncil", "uprn": "2"},
+        {"council": "ExampleCouncil", "url": "url", "house_number": "3"},
+    ]
+
+    with patch.object(server, "async_lookup", CountingLookup()):
+        results, status, headers = await server.async_batch_data(lookups, "json")
+
+    assert status == 200
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert [result["status"] for result in results] == ["ok", "error", "ok"]
+    assert results[0]["data"]["bins"][0]["type"] == "Refuse"
+    assert results[1]["error"] == "council site down"
+    assert results[2]["paon"] == "3"
+    assert server._pending == 0
+
+
+async def test_async_batch_data_rejects_invalid_batches(registry, monkeypatch):
+    monkeypatch.setenv("UKBC_API_MAX_BATCH", "1")
+
+    too_big = await server.async_batch_data([{"council": "A"}, {"council": "B"}])
+    invalid = await server.async_batch_data([{"url": "missing council"}])
+
+    assert too_big[1] == 413
+    assert invalid[1] == 400
+
+
+async def test_async_batch_data_too_many_pending(registry, monkeypatch):
+    monkeypatch.setenv("UKBC_API_MAX_PENDING", "1")
+    blocked = BlockedLookup()
+
+    with patch.object(server, "async_lookup", blocked):
+        batch = asyncio.ensure_future(
+            server.async_batch_data(
+                [{"council": "ExampleCouncil", "uprn": "1"}], "json"
+            )
+        )
+        await settle()
+        # The batch's lookup holds the only slot for single and batch requests
+        assert server._pending == 1
+        single = await server.async_council_data("ExampleCouncil", "url", uprn="2")
+        rejected = await server.async_batch_data(
+            [{"council": "ExampleCouncil", "uprn": "3"}]
+        )
+        blocked.released.set()
+        results, status, headers = await batch
+
+    assert single[1] == 429
+    assert rejected[1] == 429
+    assert results[0]["status"] == "ok"
+    assert server._pending == 0
+
+
+async def test_async_batch_data_times_out_each_lookup(registry, monkeypatch):
+    monkeypatch.setenv("UKBC_API_TIMEOUT", "0.01")
+    blocked = BlockedLookup()
+
+    with patch.object(server, "async_lookup", blocked):
+        results, status, headers = await server.async_batch_data(
+            [{"council": "ExampleCouncil", "uprn": "1"}], "json"
+        )
+        blocked.released.set()
+        await settle()
+
+    assert results[0]["status"] == "error"
+    assert "timed out" in results[0]["error"]
+    assert server._pending == 0
+
+
+async def test_async_batch_data_limits_councils_across_requests(
+    registry, monkeypatch
+):
+    monkeypatch.setenv("UKBC_API_PER_COUNCIL", "1")
+    counting = CountingLookup()
+
+    with patch.object(server, "async_lookup", counting):
+        batches = await asyncio.gather(
+            *(
+                server.async_batch_data(
+                    [
+                        {"council": "ExampleCouncil", "uprn": f"{batch}-{n}"}
+                        for n in range(3)
+                    ],
+                    "json",
+                    per_council=3,
+                )
+                for batch in range(2)
+            )
+        )
+
+    assert counting.calls == 6
+    assert counting.peak == 1
+    for results, status, headers in batches:
+        assert [result["status"] for result in results] == ["ok", "ok", "ok"]
+
+
+async def test_async_batch_data_per_council_within_request(registry, monkeypatch):
+    monkeypatch.setenv("UKBC_API_PER_COUNCIL", "10")
+    counting = CountingLookup()
+
+    with patch.object(server, "async_lookup", counting):
+        await server.async_batch_data(
+            [{"council": "ExampleCouncil", "uprn": str(n)} for n in range(4)],
+            "json",
+            per_council=2,
+        )
+
+    assert counting.calls == 4
+    assert counting.peak == 2
+
+
+@patch.object(server, "lookup", return_value=BIN_DATA)
+def test_asgi_batch_streams_ndjson(mock_lookup, registry):
+    client = server.create_asgi_app("thread", 2).test_client()
+
+    response = client.post(
+        "/api/bin_collection/batch",
+        json=[
+            {"council": "ExampleCouncil", "url": "url", "uprn": "1"},
+            {"council": "ExampleCouncil", "url": "url", "uprn": "2"},
+        ],
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(result["index"] for result in results) == [0, 1]
+    assert all(result["status"] == "ok" for result in results)
+    assert mock_lookup.call_count == 2
+
+
+@patch.object(server, "lookup", return_value=BIN_DATA)
+def test_wsgi_batch_json(mock_lookup, registry):
+    client = server.create_app("thread", 2).test_client()
+
+    response = client.post(
+        "/api/bin_collection/batch?format=json",
+        json=[{"council": "ExampleCouncil", "url": "url", "uprn": "1"}],
+    )
+
+    assert response.status_code == 200
+    assert response.json()[0]["data"]["bins"][0]["type"] == "Refuse"
+
+
+class SyncCountingLookup:
+    """A lookup stand-in for the worker pool that records how many lookups overlap
+    and which threads ran them."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+        self.calls = 0
+        self.threads = set()
+
+    def __call__(self, council, url, **kwargs):
+        with self.lock:
+            self.calls += 1
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.threads.add(threading.current_thread().name)
+        try:
+            time.sleep(self.delay)
+            if council == "BrokenCouncil":
+                raise RuntimeError("council site down")
+            return BIN_DATA
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+def test_run_lookups_uses_shared_pool(registry):
+    server.configure_workers("thread", 2)
+    counting = SyncCountingLookup()
+    lookups = [
+        {"council": "ExampleCouncil", "uprn": "1"},
+        {"council": "BrokenCouncil", "uprn": "2"},
+    ]
+
+    with patch.object(server, "lookup", counting):
+        results = sorted(server.run_lookups(lookups), key=lambda r: r["index"])
+
+    assert [result["status"] for result in results] == ["ok", "error"]
+    assert results[0]["data"]["bins"][0]["type"] == "Refuse"
+    assert results[1]["error"] == "council site down"
+    assert all(name.startswith("ukbc-lookup") for name in counting.threads)
+    # Council slots are released by done callbacks, just after the results
+    with server._council_condition:
+        assert server._council_condition.wait_for(
+            lambda: not any(server._council_running.values()), 5
+        )
+
+
+def test_run_lookups_limits_councils_across_requests(registry, monkeypatch):
+    monkeypatch.setenv("UKBC_API_PER_COUNCIL", "1")
+    server.configure_workers("thread", 8)
+    counting = SyncCountingLookup()
+    results = []
+
+    def run_batch_request(batch):
+        lookups = [
+            {"council": "ExampleCouncil", "uprn": f"{batch}-{n}"} for n in range(3)
+        ]
+        results.extend(server.run_lookups(lookups, per_council=3))
+
+    with patch.object(server, "lookup", counting):
+        requests = [
+            threading.Thread(target=run_batch_request, args=(batch,))
+            for batch in range(2)
+        ]
+        for request in requests:
+            request.start()
+        for request in requests:
+            request.join(timeout=10)
+
+    assert counting.calls == 6
+    assert counting.peak == 1
+    assert [result["status"] for result in results] == ["ok"] * 6
+
+
+def test_run_lookups_per_council_within_request(registry, monkeypatch):
+    monkeypatch.setenv("UKBC_API_PER_COUNCIL", "10")
+    server.configure_workers("thread", 8)
+    counting = SyncCountingLookup()
+
+    with patch.object(server, "lookup", counting):
+        list(
+            server.run_lookups(
+                [{"council": "ExampleCouncil", "uprn": str(n)} for n in range(4)],
+                per_council=2,
+            )
+        )
+
+    assert counting.calls == 4
+    assert counting.peak == 2